@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: Chaos Software EOOD
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Tests for the Python exporter. Modules which don't depend on Blender are loaded directly from
+# the add-on sources with loadExporterModule(). Tests that need bpy are skipped unless pytest is
+# run from Blender's Python, e.g.:
+#   blender -b --python-expr "import pytest; pytest.main(['tests/python'])"
+
+import importlib.util
+import pathlib
+
+EXPORTER_DIR = pathlib.Path(__file__).parents[2] / "vray_for_blender_python_exporter"
+
+
+def loadExporterModule(relPath: str):
+    """ Load a single module of the add-on without importing the vray_blender package. """
+    path = EXPORTER_DIR / relPath
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: Chaos Software EOOD
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+
+from conftest import loadExporterModule
+
+animation_pipeline = loadExporterModule("engine/animation_pipeline.py")
+
+
+class RendererRecorder:
+    """ Records the calls made by renderPipelined() and tracks the state of the renderer. """
+
+    def __init__(self):
+        self.calls = []
+        self.renderFrame = None     # The frame last set with setRenderFrame
+        self.renderingFrame = None  # The frame V-Ray is rendering
+        self.pendingExports = []    # Exported frames which V-Ray has not started rendering yet
+
+    def exportFrame(self, frame):
+        self.calls.append(("export", frame))
+        self.renderFrame = frame
+        self.pendingExports.append(frame)
+
+    def startRenderSequence(self):
+        self.calls.append(("start",))
+        self._proceed()
+
+    def continueRenderSequence(self):
+        self.calls.append(("continue",))
+        self._proceed()
+
+    def waitFrameRenderEnd(self, frame):
+        assert frame == self.renderingFrame
+        self.calls.append(("wait", frame))
+
+    def clearFrameData(self, frame):
+        self.calls.append(("clear", frame))
+
+    def setRenderFrame(self, frame):
+        self.calls.append(("setFrame", frame))
+        self.renderFrame = frame
+
+    def _proceed(self):
+        self.renderingFrame = self.pendingExports.pop(0)
+        # V-Ray renders the frame which is current at the time it proceeds to it.
+        assert self.renderFrame == self.renderingFrame
+
+    def run(self, frames, lookAhead):
+        return animation_pipeline.renderPipelined(frames, lookAhead,
+                                                  exportFrame = self.exportFrame,
+                                                  startRenderSequence = self.startRenderSequence,
+                                                  waitFrameRenderEnd = self.waitFrameRenderEnd,
+                                                  clearFrameData = self.clearFrameData,
+                                                  setRenderFrame = self.setRenderFrame,
+                                                  continueRenderSequence = self.continueRenderSequence)
+
+
+@pytest.mark.parametrize("lookAhead", [1, 2, 3])
+def test_rendered_frame_is_current_when_vray_proceeds(lookAhead):
+    frames = list(range(1, 8))
+    recorder = RendererRecorder()
+
+    assert recorder.run(frames, lookAhead)
+
+    waited = [c[1] for c in recorder.calls if c[0] == "wait"]
+    assert waited == frames
+
+
+@pytest.mark.parametrize("lookAhead", [1, 2, 3])
+def test_exports_ahead_of_rendered_frame(lookAhead):
+    frames = list(range(1, 8))
+    recorder = RendererRecorder()
+    recorder.run(frames, lookAhead)
+
+    calls = recorder.calls
+    # The first frame is waited for only after lookAhead more frames have been exported
+    firstWait = calls.index(("wait", 1))
+    exportedBefore = [c[1] for c in calls[:firstWait] if c[0] == "export"]
+    assert exportedBefore == frames[:lookAhead + 1]
+
+    # The frame to be rendered is re-sent right before each continue
+    for i, call in enumerate(calls):
+        if call == ("continue",):
+            assert calls[i - 1][0] == "setFrame"
+            assert calls[i - 2] == ("clear", calls[i - 1][1])
+
+
+def test_no_frames():
+    recorder = RendererRecorder()
+
+    assert not recorder.run([], 2)
+    assert recorder.calls == []
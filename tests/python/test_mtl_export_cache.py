@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: Chaos Software EOOD
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Runs in Blender with the V-Ray add-on enabled, see conftest.py.
+
+import pytest
+
+bpy = pytest.importorskip("bpy")
+pytest.importorskip("vray_blender")
+
+from vray_blender.exporting import mtl_export
+from vray_blender.exporting.plugin_tracker import getObjTrackId
+from vray_blender.exporting.update_tracker import UpdateTracker
+from vray_blender.lib.defs import AttrPlugin, ExporterContext
+
+
+@pytest.fixture
+def rampMaterial():
+    """ A material of a scene object with a V-Ray color ramp node, whose ramp is kept in a texture """
+    mtl = bpy.data.materials.new("TestRampMtl")
+    mtl.use_nodes = True
+    rampNode = mtl.node_tree.nodes.new('VRayNodeColorRamp')
+
+    mesh = bpy.data.meshes.new("TestRampMesh")
+    mesh.materials.append(mtl)
+    obj = bpy.data.objects.new("TestRampObj", mesh)
+    bpy.context.scene.collection.objects.link(obj)
+
+    yield mtl, rampNode.texture, obj
+
+    texture = rampNode.texture
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(mesh)
+    bpy.data.materials.remove(mtl)
+    bpy.data.textures.remove(texture)
+
+
+def _syncOnUpdate(exporterCtx: ExporterContext):
+    """ Update the view layer and run syncMtlExportCache() on the resulting depsgraph updates.
+        The updates are only accessible from within a depsgraph_update_post handler.
+    """
+    synced = []
+
+    def onUpdate(scene, depsgraph):
+        exporterCtx.dg = depsgraph
+        exporterCtx._classifyDepsgraphUpdates()
+        mtl_export.syncMtlExportCache(exporterCtx)
+        synced.append(True)
+
+    bpy.app.handlers.depsgraph_update_post.append(onUpdate)
+    try:
+        bpy.context.view_layer.update()
+    finally:
+        bpy.app.handlers.depsgraph_update_post.remove(onUpdate)
+
+    assert synced, "The view layer update did not produce a depsgraph update"
+
+
+def _indexedExporterContext():
+    exporterCtx = ExporterContext()
+    exporterCtx.ctx = bpy.context
+    exporterCtx.fullExport = False
+    exporterCtx.dgUpdates = {'geometry': set(), 'transform': set(), 'shading': set(), 'all': set()}
+
+    UpdateTracker.clear()
+    exporterCtx.persistedState.crossDependencies.sync(exporterCtx)
+    return exporterCtx
+
+
+@pytest.mark.parametrize("renameTexture", [False, True])
+def test_texture_update_invalidates_material(rampMaterial, renameTexture):
+    mtl, texture, _ = rampMaterial
+    bpy.context.view_layer.update()
+
+    exporterCtx = _indexedExporterContext()
+    mtlId = getObjTrackId(mtl)
+    exporterCtx.exportedMtls[mtlId] = AttrPlugin("TestRampMtl")
+
+    if renameTexture:
+        # The materials using the texture are indexed before the rename
+        texture.name = "TestRampTextureRenamed"
+        _syncOnUpdate(exporterCtx)
+        exporterCtx.exportedMtls[mtlId] = AttrPlugin("TestRampMtl")
+
+    texture.color_ramp.elements[0].color = (1.0, 0.0, 0.0, 1.0)
+    texture.update_tag()
+    _syncOnUpdate(exporterCtx)
+
+    assert mtlId not in exporterCtx.exportedMtls
+
+
+def test_unrelated_update_keeps_material(rampMaterial):
+    mtl, _, obj = rampMaterial
+    bpy.context.view_layer.update()
+
+    exporterCtx = _indexedExporterContext()
+    mtlId = getObjTrackId(mtl)
+    exporterCtx.exportedMtls[mtlId] = AttrPlugin("TestRampMtl")
+
+    obj.location.x += 1.0
+    _syncOnUpdate(exporterCtx)
+
+    assert mtlId in exporterCtx.exportedMtls
@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: Chaos Software EOOD
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Runs in Blender with the V-Ray add-on enabled, see conftest.py.
+
+import pytest
+
+pytest.importorskip("vray_blender")
+
+from vray_blender.vray_tools import vrscene_parser
+
+
+SCENE = """
+// A comment
+BRDFVRayMtl brdf1 {
+  diffuse=Color(0.5, 0.5, 0.5)*2;
+  reflect=AColor(1, 0, 0, 1);
+  refl_glossiness=0.8;
+  option_use_roughness=1;
+  bump_map=TexBitmap@1::out_color;
+  ids_list=List(1, 2, 5);
+  mixed=List(tex1, 2, 1.5, -4, AColor(1, 0, 0, 1));
+  ints=ListInt(1, 2, 3);
+  floats=ListFloat(1, 2.5);
+  faces=ListIntHex("01000000");
+  uvw_transform=TransformHex("0000803F");
+  frames=1-10;
+}
+MtlSingleBRDF mtl1 {
+  brdf=brdf1;
+}
+"""
+
+
+@pytest.fixture
+def sceneFile(tmp_path):
+    path = tmp_path / "scene.vrscene"
+    path.write_text(SCENE)
+    return str(path)
+
+
+def test_values_match_pyparsing_grammar(sceneFile):
+    with open(sceneFile, "r") as f:
+        expected = list(vrscene_parser.sceneDesc.parseString(f.read()))
+
+    parsed = vrscene_parser.parseVrscene(sceneFile)
+
+    assert parsed[-1]['ID'] == 'ImportSettings'
+    assert len(parsed) == len(expected) + 1
+
+    for plugin, expectedPlugin in zip(parsed, expected):
+        assert plugin['ID'] == expectedPlugin['ID']
+        assert plugin['Name'] == expectedPlugin['Name']
+
+        for name, value in expectedPlugin['Attributes'].items():
+            assert repr(plugin['Attributes'][name]) == repr(value), name
+
+
+def test_decode_hex(sceneFile):
+    plugin = next(vrscene_parser.iterVrscene(sceneFile, decodeHex=True))
+
+    assert plugin['Attributes']['faces'].tolist() == [1]
+
+
+def test_material_names(sceneFile):
+    assert vrscene_parser.getMaterialNamesFromVRScene(sceneFile) == ['mtl1']
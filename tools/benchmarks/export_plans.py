@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: Chaos Software EOOD
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+""" Benchmark export_utils.exportPluginParams() with precompiled export plans against the per-export
+    filtering of plugin parameters done before the plans were introduced.
+
+    Every plugin type with a description is exported in the production, viewport and preview modes.
+    The values come from the plugin's property group on scene.vray, if there is one, and from the
+    defaults otherwise. The queued attribute updates are discarded instead of being sent, so no renderer
+    is needed. Sending them costs the same for both variants. Requires the V-Ray add-on to be enabled:
+
+        blender -b scene.blend --python tools/benchmarks/export_plans.py
+"""
+
+import os
+import time
+
+import bpy
+
+from vray_blender.lib import attribute_types, attribute_utils, export_utils, path_utils, plugin_utils
+from vray_blender.lib.defs import AttrPlugin, ExporterContext, PluginDesc, RendererMode
+from vray_blender.nodes.utils import getNonExportablePluginProperties
+from vray_blender.plugins import findPluginModule, getPluginModule
+
+
+def exportPluginParamsLegacy(ctx: ExporterContext, pluginDesc: PluginDesc):
+    """ exportPluginParams() as it was before export plans, with the attribute updates sent in one batch """
+    overriddenParams = export_utils._getOverridesFor(export_utils._getExportMode(ctx), pluginDesc.type)
+    pluginModule = getPluginModule(pluginDesc.type)
+
+    nonExportableParams = getNonExportablePluginProperties(pluginModule)
+    pluginAnimatable = pluginModule.Options.get("animatable", True)
+
+    for attrDesc in pluginModule.Parameters:
+        attrName = attrDesc['attr']
+        attrType = attrDesc['type']
+
+        if attrName in nonExportableParams:
+            continue
+
+        options = attrDesc.get('options', {})
+
+        if options.get('derived', False):
+            continue
+
+        if attrType in attribute_types.NodeOutputTypes:
+            continue
+
+        isExplicit = attrName in pluginDesc.attrs
+
+        if attrType in attribute_types.SkippedTypes and not isExplicit:
+            continue
+
+        if attrType in attribute_types.AllNodeInputTypes \
+                and options.get('linked_only', False) \
+                and (not isExplicit):
+            continue
+
+        value = None
+
+        if attrName in overriddenParams:
+            value = overriddenParams[attrName]
+        elif isExplicit:
+            value = pluginDesc.getAttribute(attrName)
+            if value is None:
+                continue
+        else:
+            value = getattr(pluginDesc.vrayPropGroup, attrName, None)
+
+        if value is None:
+            if pluginDesc.type in export_utils.NON_DEFAULT_EXPORTABLE_TYPES:
+                continue
+            else:
+                value = attrDesc['default']
+
+        if value is None:
+            value = AttrPlugin()
+
+        match attrType:
+            case 'ENUM':
+                value = export_utils._convertEnumValue(value)
+
+            case 'STRING':
+                subtype = attrDesc.get('subtype')
+
+                if subtype in ('FILE_PATH', 'VRAY_FILE_PATH'):
+                    value = path_utils.formatResourcePath(value, allowRelative=ctx.exportOnly)
+                elif subtype == 'DIR_PATH':
+                    value = os.path.normpath(value) + os.sep
+
+            case "COLOR_TEXTURE":
+                attrName = attrDesc['tex_prop'] if type(value) == AttrPlugin else attrDesc['color_prop']
+
+                if attrName == attrDesc['color_prop']:
+                    pluginDesc.queueUpdate(attrDesc['tex_prop'], AttrPlugin())
+
+        paramAnimatable = (pluginAnimatable and options.get("animatable", pluginAnimatable))
+        pluginDesc.queueUpdate(attrName, attribute_utils.convertUIValueToVRay(attrDesc, value), animatable=paramAnimatable)
+
+    plugin_utils.flushAttrUpdates(ctx.renderer, pluginDesc)
+
+    return AttrPlugin(pluginDesc.name, pluginType=pluginDesc.type)
+
+
+def benchmarkExportPlans(iterations: int = 20):
+    scene = bpy.context.scene
+    pluginTypes = [t for t in plugin_utils.PLUGINS_DESC if findPluginModule(t) and hasattr(getPluginModule(t), 'Parameters')]
+    modes = (RendererMode.Production, RendererMode.Viewport, RendererMode.Preview)
+
+    contexts = []
+    for mode in modes:
+        ctx = ExporterContext()
+        ctx.ctx = bpy.context
+        ctx.rendererMode = mode
+        contexts.append(ctx)
+
+    def makePluginDesc(pluginType):
+        pluginDesc = PluginDesc(f"benchmark_{pluginType}", pluginType)
+        pluginDesc.vrayPropGroup = getattr(scene.vray, pluginType, None)
+        return pluginDesc
+
+    def discardUpdates(renderer, pluginDesc: PluginDesc):
+        pluginDesc.pendingUpdates = []
+
+    flushAttrUpdates = plugin_utils.flushAttrUpdates
+    plugin_utils.flushAttrUpdates = discardUpdates
+
+    try:
+        export_utils.clearExportPlans()
+        start = time.perf_counter()
+        for ctx in contexts:
+            for pluginType in pluginTypes:
+                export_utils._getExportPlan(pluginType, export_utils._getExportMode(ctx))
+        compileTime = time.perf_counter() - start
+
+        results = {}
+        for name, fn in (("legacy", exportPluginParamsLegacy), ("plan", export_utils.exportPluginParams)):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                for ctx in contexts:
+                    for pluginType in pluginTypes:
+                        fn(ctx, makePluginDesc(pluginType))
+            results[name] = time.perf_counter() - start
+    finally:
+        plugin_utils.flushAttrUpdates = flushAttrUpdates
+
+    exports = iterations * len(contexts) * len(pluginTypes)
+    print(f"Export plans: {len(pluginTypes)} plugin types, {exports} exports")
+    print(f"  compile: {compileTime * 1000:10.2f} ms")
+    print(f"  legacy:  {results['legacy'] * 1000:10.2f} ms ({results['legacy'] * 1e6 / exports:.2f} us/export)")
+    print(f"  plan:    {results['plan'] * 1000:10.2f} ms ({results['plan'] * 1e6 / exports:.2f} us/export)")
+
+    return { "compile": compileTime, **results }
+
+
+if __name__ == "__main__":
+    benchmarkExportPlans()
@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: Chaos Software EOOD
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+""" Benchmark the sampling of emitter UVs and colors for particle hair.
+
+    Sweeps the hair count by changing the number of rendered children per parent of the first
+    particle system on an object and compares sampling each strand separately to the batched
+    sampling done by hair_export.sampleEmitter(). The particle settings are restored afterwards.
+    Requires the V-Ray add-on to be enabled:
+
+        blender -b scene.blend --python tools/benchmarks/hair_emitter_sampling.py -- <object name>
+"""
+
+import sys
+import time
+
+import bpy
+import numpy as np
+
+from vray_blender.exporting.hair_export import HairExporter, sampleEmitter
+
+
+def sampleEmitterPerStrand(pmod: bpy.types.ParticleSystemModifier, firstExported: int, totalParticles: int, uvIndex: int, colorIndex: int):
+    """ Sample the emitter UVs and colors by calling uv_on_emitter/mcol_on_emitter once per exported strand,
+        the way particle hair was sampled before sampleEmitter() was added.
+    """
+    psys = pmod.particle_system
+    parents = len(psys.particles)
+
+    uvs = np.empty(2*(totalParticles - firstExported), dtype=np.float32) if uvIndex != -1 else np.empty(0)
+    colors = np.empty(3*(totalParticles - firstExported), dtype=np.float32) if colorIndex != -1 else np.empty(0)
+
+    i = 0
+    for pindex in range(firstExported, totalParticles):
+        particle = psys.particles[(pindex - parents) % parents]
+
+        if uvIndex != -1:
+            uv = psys.uv_on_emitter(pmod, particle=particle, particle_no=pindex, uv_no=uvIndex)
+            uvs[i*2+0] = uv[0]
+            uvs[i*2+1] = uv[1]
+        if colorIndex != -1:
+            color = psys.mcol_on_emitter(pmod, particle=particle, particle_no=pindex, vcol_no=colorIndex)
+            colors[i*3+0] = color[0]
+            colors[i*3+1] = color[1]
+            colors[i*3+2] = color[2]
+        i += 1
+
+    return uvs, colors
+
+
+def benchmarkEmitterSampling(obj: bpy.types.Object, childCounts = (1, 10, 50, 100), repeat: int = 3):
+    pmods = [m for m in obj.modifiers if m.type == 'PARTICLE_SYSTEM']
+    if not pmods:
+        print(f"Object {obj.name} has no particle systems")
+        return {}
+
+    pset = pmods[0].particle_system.settings
+    savedSettings = (pset.child_type, pset.child_percent, pset.rendered_child_count)
+    results = {}
+
+    try:
+        for childType in ('SIMPLE', 'INTERPOLATED'):
+            for childCount in childCounts:
+                pset.child_type = childType
+                pset.child_percent = childCount
+                pset.rendered_child_count = childCount
+
+                dg = bpy.context.evaluated_depsgraph_get()
+                dg.update()
+                evalObj = obj.evaluated_get(dg)
+                pmod = evalObj.modifiers[pmods[0].name]
+                psys = pmod.particle_system
+
+                mesh = evalObj.to_mesh(preserve_all_data_layers=True, depsgraph=dg)
+                uvIndex = mesh.uv_layers.find(uv.name) if (uv := HairExporter.findActiveUV(mesh.uv_layers)) else -1
+                colorLayer = next((l for l in mesh.vertex_colors if l.active_render), None)
+                colorIndex = mesh.vertex_colors.find(colorLayer.name) if colorLayer else -1
+
+                parents = len(psys.particles)
+                totalParticles = parents + len(psys.child_particles)
+                firstExported = parents if totalParticles > parents else 0
+
+                timings = {}
+                sampled = {}
+                for name, fn in (("per-strand", sampleEmitterPerStrand), ("batched", sampleEmitter)):
+                    start = time.perf_counter()
+                    for _ in range(repeat):
+                        sampled[name] = fn(pmod, firstExported, totalParticles, uvIndex, colorIndex)
+                    timings[name] = (time.perf_counter() - start) / repeat
+
+                evalObj.to_mesh_clear()
+
+                matches = all(np.allclose(a, b) for a, b in zip(sampled["per-strand"], sampled["batched"]))
+                strands = totalParticles - firstExported
+                results[(childType, strands)] = timings
+
+                print(f"{childType:<12} {strands:>9} strands: "
+                      f"per-strand {timings['per-strand'] * 1000:9.2f} ms, "
+                      f"batched {timings['batched'] * 1000:9.2f} ms, "
+                      f"{'results match' if matches else 'RESULTS DIFFER'}")
+    finally:
+        pset.child_type, pset.child_percent, pset.rendered_child_count = savedSettings
+
+    return results
+
+
+if __name__ == "__main__":
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    obj = bpy.data.objects[args[0]] if args else bpy.context.object
+    benchmarkEmitterSampling(obj)
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: Chaos Software EOOD
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+""" Benchmark the asynchronous export of many small meshes through vray.exportGeometry(), which runs
+    SceneExporter::exportMesh(), while the main thread keeps running Python code as it does when it
+    iterates the scene.
+
+    The export tasks hand the Python data of the finished meshes to the main thread instead of acquiring
+    the GIL to release it. Run the benchmark on builds with and without this change to compare them.
+    Requires the V-Ray add-on to be enabled and the V-Ray server to be running:
+
+        blender -b --python tools/benchmarks/mesh_export_release.py -- [mesh count] [thread count]
+"""
+
+import sys
+import time
+
+import bpy
+
+from vray_blender.bin import VRayBlenderLib as vray
+from vray_blender.exporting.obj_export import MeshData
+from vray_blender.lib.defs import DataArray, ExporterType
+
+
+def createCubeMesh():
+    mesh = bpy.data.meshes.new("BenchmarkCube")
+    verts = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+    faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    mesh.from_pydata(verts, [], faces)
+    mesh.calc_loop_triangles()
+    return mesh
+
+
+def makeMeshData(mesh: bpy.types.Mesh, name: str):
+    """ Fill MeshData the way GeometryExporter._fillMeshData() does for a mesh without UVs and colors """
+    meshData = MeshData(name)
+    meshData.vertices       = DataArray(mesh.vertices[0].as_pointer(), len(mesh.vertices))
+    meshData.loops          = DataArray(mesh.loops[0].as_pointer(), len(mesh.loops))
+    meshData.loopTris       = DataArray(mesh.loop_triangles[0].as_pointer(), len(mesh.loop_triangles))
+    meshData.loopTriPolys   = DataArray(mesh.loop_triangle_polygons[0].as_pointer(), len(mesh.loop_triangle_polygons))
+    meshData.polyMtlIndices = DataArray.fromAttribute(mesh, 'material_index')
+    meshData.normals        = DataArray(mesh.polygon_normals[0].as_pointer(), len(mesh.polygon_normals))
+    meshData.normalsDomain  = MeshData.NORMALS_FACE
+    meshData.options.exportEdgeVisibility = True
+    return meshData
+
+
+def benchmarkMeshExport(meshCount: int = 100_000, threadCount: int = 8, workIterations: int = 500):
+    settings = vray.ExporterSettings()
+    settings.exporterType = ExporterType.PROD
+
+    if not (renderer := vray.getMainRenderer(settings)):
+        print("The V-Ray server is not running")
+        return None
+
+    mesh = createCubeMesh()
+
+    def work():
+        # Stands in for the per-object work of the exporter
+        for _ in range(workIterations):
+            pass
+
+    try:
+        vray.clearScene(renderer)
+        vray.startExport(renderer, threadCount)
+
+        start = time.perf_counter()
+        for i in range(meshCount):
+            name = f"BenchmarkMesh{i}"
+            vray.pluginCreate(renderer, name, "GeomStaticMesh")
+            vray.exportGeometry(renderer, makeMeshData(mesh, name), True)
+            work()
+        exportTime = time.perf_counter() - start
+
+        vray.finishExport(renderer, False)
+        totalTime = time.perf_counter() - start
+    finally:
+        vray.clearScene(renderer)
+        bpy.data.meshes.remove(mesh)
+
+    print(f"Mesh export: {meshCount} meshes, {threadCount} threads")
+    print(f"  export calls:   {exportTime * 1000:10.2f} ms")
+    print(f"  until finished: {totalTime * 1000:10.2f} ms ({totalTime * 1e6 / meshCount:.2f} us/mesh)")
+
+    return { "export": exportTime, "total": totalTime }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[sys.argv.index("--") + 1:]] if "--" in sys.argv else []
+    benchmarkMeshExport(*args)
@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: Chaos Software EOOD
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+""" Benchmark ObjTracker with a large number of plugins.
+
+    Every object gets pluginsPerObject own plugins and every sharedEvery-th object also references
+    a plugin shared with its neighbour. Then a scene sync in which removedFraction of the objects
+    are missing is run, followed by the pruning of the removed objects, as done by
+    GeometryExporter.prunePlugins(). Requires the V-Ray add-on to be enabled:
+
+        blender -b --python tools/benchmarks/obj_tracker.py
+"""
+
+import time
+import tracemalloc
+
+from vray_blender.exporting.plugin_tracker import ObjTracker, PLUGIN_TYPE_NODE
+
+
+def benchmarkObjTracker(pluginCount: int = 1_000_000, pluginsPerObject: int = 4, sharedEvery: int = 10, removedFraction: float = 0.01):
+    objCount = pluginCount // pluginsPerObject
+    removedStep = max(1, int(1 / removedFraction)) if removedFraction > 0 else objCount + 1
+    timings = {}
+
+    def run(measureMemory: bool):
+        if measureMemory:
+            tracemalloc.start()
+
+        tracker = ObjTracker("BENCHMARK")
+
+        start = time.perf_counter()
+        for i in range(objCount):
+            for j in range(pluginsPerObject):
+                tracker.trackPlugin(i, f"node@obj{i}|{j}", pluginType=PLUGIN_TYPE_NODE)
+            if i % sharedEvery == 0:
+                tracker.trackPlugin(i, f"shared@{i // (2 * sharedEvery)}")
+        trackTime = time.perf_counter() - start
+
+        if measureMemory:
+            memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return memory
+
+        start = time.perf_counter()
+        tracker.beginSync()
+        for i in range(objCount):
+            if i % removedStep != 0:
+                tracker.markPresent(i)
+        syncTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        removed = tracker.getRemoved()
+        diffTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        removedPlugins = 0
+        for objTrackId in removed:
+            removedPlugins += len(tracker.getOwnedPlugins(objTrackId))
+            tracker.forget(objTrackId)
+        pruneTime = time.perf_counter() - start
+
+        timings.update(track=trackTime, sync=syncTime, diff=diffTime, prune=pruneTime)
+        return len(removed), removedPlugins, tracker.getPluginsCount()
+
+    removedObjects, removedPlugins, remainingPlugins = run(measureMemory=False)
+    memory = run(measureMemory=True)
+
+    print(f"ObjTracker benchmark: {objCount} objects, {pluginCount + objCount // sharedEvery} tracked plugins")
+    print(f"  track:  {timings['track'] * 1000:10.2f} ms")
+    print(f"  sync:   {timings['sync'] * 1000:10.2f} ms")
+    print(f"  diff:   {timings['diff'] * 1000:10.2f} ms ({removedObjects} removed objects)")
+    print(f"  prune:  {timings['prune'] * 1000:10.2f} ms ({removedPlugins} owned plugins, {remainingPlugins} remaining)")
+    print(f"  memory: {memory / (1024 * 1024):10.2f} MB")
+
+    return { **timings, "memory": memory }
+
+
+if __name__ == "__main__":
+    benchmarkObjTracker()
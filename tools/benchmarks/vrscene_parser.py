@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: Chaos Software EOOD
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+""" Benchmark the streaming .vrscene parser against the pyparsing grammar it replaced.
+
+    Parses the file with the grammar, with iterVrscene() and with iterVrscene(headersOnly=True),
+    the way getMaterialNamesFromVRScene() reads it, and prints the best time of each.
+    Requires the V-Ray add-on to be enabled:
+
+        blender -b --python tools/benchmarks/vrscene_parser.py -- scene.vrscene
+"""
+
+import os
+import sys
+import time
+
+from vray_blender.vray_tools.vrscene_parser import iterVrscene, sceneDesc
+
+
+def parseVrscenePyparsing(filePath: str):
+    """ Parse a .vrscene file with the pyparsing grammar, the way parseVrscene() did before iterVrscene() was added """
+    with open(filePath, "r") as f:
+        return list(sceneDesc.parseString(f.read()))
+
+
+def benchmarkParsers(filePath: str, repeat: int = 3):
+    def measure(fn):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+        return best, result
+
+    results = {
+        'pyparsing' : measure(lambda: parseVrscenePyparsing(filePath)),
+        'streaming' : measure(lambda: list(iterVrscene(filePath))),
+        'headers'   : measure(lambda: list(iterVrscene(filePath, headersOnly=True))),
+    }
+
+    fileSize = os.path.getsize(filePath) / (1024 * 1024)
+    print(f"{filePath} ({fileSize:.2f} MB), best of {repeat}:")
+    for name, (tm, plugins) in results.items():
+        print(f"  {name:<10} {tm * 1000:>10.2f} ms  {len(plugins)} plugins")
+
+    return { name: tm for name, (tm, _) in results.items() }
+
+
+if __name__ == "__main__":
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    benchmarkParsers(args[0])
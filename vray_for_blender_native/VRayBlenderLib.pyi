@@ -44,6 +44,7 @@ class ExporterSettings:
     drRenderOnlyOnHosts: bool
     drUse: bool
     exporterType: int
+    exportMemoryLimit: int
     previewDir: str
     remoteDispatcher: str
     renderThreads: int
@@ -135,13 +136,16 @@ def exportJobIsRunning(renderer: int) -> None: ...
 def exportPointCloud(renderer: int, pointCloudData: PointCloudData, asyncExport: bool) -> None: ...
 def exportSmoke(renderer: int, smokeData: SmokeData) -> None: ...
 def finishExport(renderer: int, interactive: bool) -> None: ...
+def getChildParticleParents(psys: int, firstChild: int, count: int) -> object: ...
 def getEngineUpdateMessage(renderer: int) -> str: ...
+def getExportMemoryStats(renderer: int) -> tuple[int, int]: ...
 def getImage(renderer: int) -> object: ...
 def getReceivedImagesCount(renderer: int) -> int: ...
 def getLastRenderedFrame(renderer: int) -> int: ...
 def getOslScriptParameters(script: str) -> list: ...
 def getRenderPassImage(renderer: int, passName: str) -> object: ...
 def getRenderProgress(renderer: int) -> float: ...
+def hashMeshData(meshData: MeshData) -> tuple[int, int]: ...
 def hasLicense() -> bool: ...
 def isCommunityEdition() -> bool: ...
 def imageWasUpdated(renderer: int) -> bool: ...
@@ -159,6 +163,7 @@ def pluginRemove(renderer: int, name: str) -> None: ...
 def pluginResetValue(renderer: int, name: str, attrName: str) -> None: ...
 def pluginReCreateAttr(renderer: int, name: str, attrName: str, animatable: bool) -> None: ...
 def pluginUpdateAColor(renderer: int, pluginName: str, attrName: str, r: float, g: float, b: float, a: float, animatable: bool) -> None: ...
+def pluginUpdateBatch(renderer: int, pluginName: str, updates: list[tuple[str, tuple[str, object], bool]]) -> None: ...
 def pluginUpdateColor(renderer: int, pluginName: str, attrName: str, r: float, g: float, b: float, animatable: bool) -> None: ...
 def pluginUpdateFloat(renderer: int, pluginName: str, attrName: str, val: float, animatable: bool) -> None: ...
 def pluginUpdateFloatList(*renderer: int, pluginName: str, attrName: str, floatList: list[float], animatable: bool) -> None: ...
@@ -173,6 +178,8 @@ def pluginUpdateString(renderer: int, pluginName: str, attrName: str, val: str,
 def pluginUpdateStringList(renderer: int, pluginName: str, attrName: str, strList: list[str]) -> None: ...
 def pluginUpdateTransform(renderer: int, pluginName: str, attrName: str, transform: object, animatable: bool) -> None: ...
 def pluginUpdateVector(renderer: int, pluginName: str, attrName: str, x: float, y: float, z: float, animatable: bool) -> None: ...
+def pluginUpdateVisibility(renderer: int, attrName: str, pluginNames: list[str], flags: list[int]) -> None: ...
+def popCompletedMeshes(renderer: int) -> list[str]: ...
 def renderEnd(renderer: int) -> None: ...
 def renderFrame(renderer: int) -> None: ...
 def renderJobIsRunning(renderer: int) -> bool: ...
@@ -187,6 +194,7 @@ def setComputeDevices(deviceIds: list[int], deviceType: int) -> None: ...
 def setCosmosDownloadAssets(callback: object) -> None: ...
 def setCosmosDownloadSize(callback: object) -> None: ...
 def setCosmosImportCallback(callback: object) -> None: ...
+def setImageUpdatedCallback(renderer: int, imageUpdatedCallback: object) -> None: ...
 def setLogLevel(level: int, enableQtLogs: bool) -> None: ...
 def setRenderFrame(renderer: int, frame: float) -> None: ...
 def setRenderSizes(renderer: int, sizeData: RenderSizes) -> None: ...
@@ -209,4 +217,6 @@ def startStatsCollection(renderer: int) -> None: ...
 def stop() -> None: ...
 def syncViewSettings(renderer: int, viewSettings: ViewSettings) -> None: ...
 def updateCosmosSceneName(sceneName: str) -> None: ...
+def updateImageBuffer(renderer: int, buffer: object, version: int) -> tuple[int, int, int, int, int, int, int] | None: ...
+def waitRenderEvent(renderer: int, timeout: float) -> bool: ...
 def writeVrscene(renderer: int, settings: ExportSceneSettings) -> int: ...
\ No newline at end of file
@@ -80,12 +80,18 @@ PointCloudData::PointCloudData(nb::object obj) :
 
 
 InstancerData::InstancerData(nb::object obj) :
-	name		(nb::cast<std::string>(obj.attr("name"))),
-	frame		(nb::cast<int>(obj.attr("frame"))),
-	itemCount	(nb::cast<int>(obj.attr("count"))),
-	data		(fromDataArray<char>(obj.attr("arr"))),
-	ref			(obj)
-{}
+	name			(nb::cast<std::string>(obj.attr("name"))),
+	frame			(nb::cast<int>(obj.attr("frame"))),
+	persistentIds	(fromNdArray<int[8]>(obj.attr("persistentIds"))),
+	transforms		(fromNdArray<float[16]>(obj.attr("transforms"))),
+	nodeIndices		(fromNdArray<int>(obj.attr("nodeIndices"))),
+	nodeNames		(toVector<std::string>(obj.attr("nodeNames"))),
+	ref				(obj)
+{
+	if ((transforms.size() != persistentIds.size()) || (nodeIndices.size() != persistentIds.size())) {
+		throw std::runtime_error("InstancerData: instance arrays have different lengths");
+	}
+}
 
 
 SmokeData::SmokeData(const nb::object& obj) :
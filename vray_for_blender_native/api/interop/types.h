@@ -37,6 +37,7 @@ struct ExporterSettings
 	PROPERTY_NO_DEFAULT(StrList, drHosts)           // Distributed rendering
 	PROPERTY(bool, separateFiles          , false)  // Export to separate files
 	PROPERTY(std::string, previewDir      , "")		// Folder for .exr material preview files
+	PROPERTY(int,  exportMemoryLimit      , 0)		// Max MB of geometry data in flight during export, 0 for no limit
 	void setDRHosts(nb::object hosts);
 };
 
@@ -218,11 +219,13 @@ struct InstancerData
 {
 	explicit InstancerData(nb::object obj);
 
-	std::string           name;
-	int                   frame     = 0;
-	int                   itemCount = 0;
-	std::span<const char> data;
-	nb::object ref;
+	std::string                name;
+	int                        frame = 0;
+	std::span<const int[8]>    persistentIds; // Blender's persistent_id, int[8] per instance
+	std::span<const float[16]> transforms;    // Column-major 4x4 matrix per instance
+	std::span<const int>       nodeIndices;   // Index into nodeNames per instance
+	std::vector<std::string>   nodeNames;     // Names of the instanced Node plugins
+	nb::object ref;                           // Lifetime ref
 };
 
 using InstancerDataPtr = std::shared_ptr<InstancerData>;
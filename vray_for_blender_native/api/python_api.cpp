@@ -22,6 +22,8 @@
 #include "export/scene_exporter.h"
 #include "export/scene_exporter_pro.h"
 #include "export/scene_exporter_rt.h"
+#include "export/assets/mesh_exporter.h"
+#include "export/assets/hair_exporter.h"
 #include "utils/logger.hpp"
 #include "vassert.h"
 
@@ -474,6 +476,142 @@ void pluginUpdatePluginDesc(const nb::object& renderer, const std::string& name,
 	exporter->getPluginExporter()->pluginUpdate(name, attrName, valuePlugin, animatable, forceUpdate);
 }
 
+/// Convert a typed value from a pluginUpdateBatch() item to an AttrValue.
+/// @param typeCode - a single-character type code, see pluginUpdateBatch()
+/// @param payload - the value in the form expected for the type code
+/// @param update - the update to fill in
+static void batchValueToAttrUpdate(const std::string& typeCode, const nb::object& payload, ZmqExporter::AttrUpdate& update)
+{
+	if (typeCode.size() != 1) {
+		throw std::runtime_error("Invalid batch value type code: '" + typeCode + "'");
+	}
+
+	switch (typeCode[0]) {
+		case 'i':
+			update.value = vray::AttrValue(nb::cast<int>(payload));
+			break;
+		case 'f':
+			update.value = vray::AttrValue(nb::cast<float>(payload));
+			break;
+		case 's':
+			update.value = vray::AttrValue(nb::cast<std::string>(payload));
+			break;
+		case 'c': {
+			const auto c = toVector<float>(payload);
+			update.value = vray::AttrColor(c.at(0), c.at(1), c.at(2));
+			break;
+		}
+		case 'a': {
+			const auto c = toVector<float>(payload);
+			update.value = vray::AttrAColor(vray::AttrColor(c.at(0), c.at(1), c.at(2)), c.at(3));
+			break;
+		}
+		case 'v': {
+			const auto v = toVector<float>(payload);
+			update.value = vray::AttrVector{v.at(0), v.at(1), v.at(2)};
+			break;
+		}
+		case 'm': {
+			const auto& vec = fromMat<3>(payload);
+			typedef float Matrix3[3][3];
+			update.value = vray::AttrMatrix(*reinterpret_cast<const Matrix3*>(vec.data()));
+			break;
+		}
+		case 't': {
+			const auto& vec = fromMat<4>(payload);
+			typedef float Matrix4[4][4];
+			update.value = vray::AttrTransform(*reinterpret_cast<const Matrix4*>(vec.data()));
+			break;
+		}
+		case 'p': {
+			// Payload is (AttrPlugin, forceUpdate)
+			const auto item = nb::cast<nb::tuple>(payload);
+			update.value = nb::cast<vray::AttrPlugin>(item[0]);
+			update.forceUpdate = nb::cast<bool>(item[1]);
+			break;
+		}
+		case 'S':
+			update.value = vray::AttrList<std::string>(toVector<std::string>(payload));
+			// Same as pluginUpdateStringList()
+			update.animatable = false;
+			break;
+		case 'I':
+			update.value = vray::AttrList<int>(toVector<int>(payload));
+			break;
+		case 'F':
+			update.value = vray::AttrList<float>(toVector<float>(payload));
+			break;
+		case 'P': {
+			vray::AttrListPlugin pluginList;
+			for (const nb::handle& item : payload) {
+				pluginList.append(nb::cast<vray::AttrPlugin>(item));
+			}
+			update.value = pluginList;
+			break;
+		}
+		case 'l': {
+			// Payload is (list, listElemTypes)
+			const auto item = nb::cast<nb::tuple>(payload);
+			auto listElemTypes = nb::cast<std::string>(item[1]);
+			auto listElemTypesIt = listElemTypes.begin();
+
+			vray::AttrListValue attrList;
+			pyListToAttrList(attrList, listElemTypesIt, nb::cast<nb::list>(item[0]));
+			update.value = attrList;
+			break;
+		}
+		case 'r':
+			// Same as pluginResetValue()
+			update.value = vray::AttrPlugin();
+			update.animatable = true;
+			break;
+		default:
+			throw std::runtime_error("Invalid batch value type code: '" + typeCode + "'");
+	}
+}
+
+
+/// Update multiple attributes of a plugin with a single call.
+/// @param updates - a list of (attrName, (typeCode, payload), animatable) tuples. The type codes are:
+///		'i' - int, 'f' - float, 's' - string, 'c' - color(r, g, b), 'a' - acolor(r, g, b, a),
+///		'v' - vector(x, y, z), 'm' - matrix 3x3, 't' - transform 4x4, 'p' - (AttrPlugin, forceUpdate),
+///		'S', 'I', 'F', 'P' - list of strings, ints, floats or AttrPlugins,
+///		'l' - (list, listElemTypes) as in pluginUpdateList(), 'r' - reset the value.
+void pluginUpdateBatch(const nb::object& renderer, const std::string& name, const nb::list& updates)
+{
+	auto* exporter = getExporter(renderer);
+
+	ZmqExporter::AttrUpdates attrUpdates;
+	attrUpdates.reserve(updates.size());
+
+	for (const nb::handle& item : updates) {
+		const auto update = nb::cast<nb::tuple>(item);
+		const auto typedValue = nb::cast<nb::tuple>(update[1]);
+
+		ZmqExporter::AttrUpdate& attrUpdate = attrUpdates.emplace_back();
+		attrUpdate.attrName = nb::cast<std::string>(update[0]);
+		attrUpdate.animatable = nb::cast<bool>(update[2]);
+
+		batchValueToAttrUpdate(nb::cast<std::string>(typedValue[0]), nb::borrow(typedValue[1]), attrUpdate);
+	}
+
+	exporter->getPluginExporter()->pluginUpdateBatch(name, attrUpdates);
+}
+
+/// Set a boolean attribute ( 'visible', 'enabled' ) on a list of plugins with a single call.
+/// @param pluginNames - the names of the plugins to update
+/// @param flags - the attribute values, one per plugin
+void pluginUpdateVisibility(const nb::object& renderer, const std::string& attrName, const std::vector<std::string>& pluginNames, const std::vector<int>& flags)
+{
+	if (pluginNames.size() != flags.size()) {
+		Logger::error("pluginUpdateVisibility: %1% plugin names and %2% flags", pluginNames.size(), flags.size());
+		return;
+	}
+
+	auto* exporter = getExporter(renderer);
+	exporter->getPluginExporter()->pluginUpdateVisibility(attrName, pluginNames, flags);
+}
+
 void pluginReCreateAttr(const nb::object& renderer, const std::string& name, const std::string& attrName, bool animatable=true)
 {
 	auto* exporter = getExporter(renderer);
@@ -493,6 +631,17 @@ void exportGeometry(const nb::object& renderer, const nb::object& meshData, bool
 }
 
 
+/// Compute a content hash of the mesh buffers which can be used to detect unchanged geometry.
+/// Returns a tuple of (fingerprint, number of hashed bytes)
+std::pair<uint64_t, uint64_t> hashMeshData(const nb::object& meshData)
+{
+	MeshData mesh(meshData);
+
+	nb::gil_scoped_release noGIL;
+	return Assets::hashMeshData(mesh);
+}
+
+
 void exportSmoke(const nb::object& renderer, const nb::object& smokeData)
 {
 	auto *exporter = getExporter(renderer);
@@ -511,6 +660,32 @@ void exportHair(const nb::object& renderer, const nb::object& hairData)
 }
 
 
+/// Read the parent indices of a range of child particles directly from the particle system.
+/// This allows the emitter UVs and colors of 'Simple' children to be sampled once per parent
+/// instead of once per child.
+nb::object getChildParticleParents(size_t psys, int firstChild, int count)
+{
+	if (count <= 0) {
+		return nb::none();
+	}
+
+	int* parents = new int[count];
+	const int filled = Assets::getChildParticleParents(reinterpret_cast<const ParticleSystem*>(psys), firstChild, count, parents);
+
+	if (filled != count) {
+		delete[] parents;
+		return nb::none();
+	}
+
+	const size_t shape[1] = { (size_t)count };
+	nb::capsule owner(parents, [](void* p) noexcept {
+		delete[] static_cast<int*>(p);
+	});
+
+	return nb::ndarray<nb::numpy, const int, nb::c_contig>(parents, 1, shape, owner).cast();
+}
+
+
 void exportPointCloud(const nb::object& renderer, const nb::object& pcData, bool asyncExport)
 {
 	auto* exporter = getExporter(renderer);
@@ -551,6 +726,22 @@ void startExport(const nb::object& renderer, int threadCount)
 
 }
 
+/// Return the names of the meshes exported since the last call whose source data is no longer
+/// referenced by the exporter. The temporary Blender meshes they were created from can be freed.
+std::vector<std::string> popCompletedMeshes(const nb::object& renderer)
+{
+	auto* exporter = getExporter(renderer);
+	return exporter->popCompletedMeshes();
+}
+
+/// Return a tuple of (peak bytes in flight since the start of the export, memory limit in bytes).
+/// The bytes in flight are the data of the pending export tasks plus the messages waiting to be sent.
+std::pair<uint64_t, uint64_t> getExportMemoryStats(const nb::object& renderer)
+{
+	auto* exporter = getExporter(renderer);
+	return exporter->getMemoryStats();
+}
+
 // Start collection of timing stats for export tasks
 void startStatsCollection(const nb::object& renderer)
 {
@@ -668,6 +859,37 @@ nb::object getRenderPassImage(const nb::object& renderer, const std::string& pas
 }
 
 
+// Copy the part of the composite image updated since 'version' to a persistent float32 RGBA buffer
+// of shape (height, width, 4). Returns None if there is no newer image, otherwise a tuple
+// (version, width, height, x, y, w, h) where (x, y, w, h) is the copied region. If the image size
+// does not match the buffer size, nothing is copied and the region is empty.
+nb::object updateImageBuffer(const nb::object& renderer, nb::ndarray<float, nb::ndim<3>, nb::c_contig, nb::device::cpu> buffer, uint64_t version)
+{
+	if (buffer.shape(2) != 4) {
+		throw std::runtime_error("Image buffer should have 4 channels");
+	}
+
+	auto* exporter = getExporter(renderer);
+
+	ImageRegion region(0, 0, 0, 0);
+	ImageSize size{0, 0, 0};
+	ImageCopyResult result = ImageCopyResult::NoImage;
+	{
+		nb::gil_scoped_release noGIL;
+		result = exporter->copyImageRegion(buffer.data(), static_cast<int>(buffer.shape(1)), static_cast<int>(buffer.shape(0)), version, region, size);
+	}
+
+	switch (result) {
+	case ImageCopyResult::Copied:
+		return nb::make_tuple(version, size.w, size.h, region.x, region.y, region.w, region.h);
+	case ImageCopyResult::SizeMismatch:
+		return nb::make_tuple(version, size.w, size.h, 0, 0, 0, 0);
+	default:
+		return nb::none();
+	}
+}
+
+
 // Gets current status update message from the rendering engine
 std::string getEngineUpdateMessage(const nb::object& renderer)
 {
@@ -743,6 +965,15 @@ void setRenderStoppedCallback(const nb::object& renderer, nb::callable renderSto
 	return exporter->setRenderStoppedCallback(std::move(renderStoppedCallback));
 }
 
+/// Sets callback executed when a new viewport image arrives after the previous one has been
+/// reported by imageWasUpdated(). Pass None to remove the callback.
+void setImageUpdatedCallback(const nb::object& renderer, nb::callable imageUpdatedCallback)
+{
+	auto *exporter = getExporter(renderer);
+
+	exporter->setImageUpdatedCallback(imageUpdatedCallback.is_none() ? nb::callable() : std::move(imageUpdatedCallback));
+}
+
 /// Sets callback executed when rendering is started
 void setRenderStartCallback(nb::callable renderStartCallback)
 {
@@ -843,6 +1074,13 @@ bool exportJobIsRunning(const nb::object& renderer)
 	return getExporter(renderer)->vrsceneExportRunning();
 }
 
+// Blocks until the renderer reports a change of its state (frame rendered, progress, job finished, etc.)
+// or the timeout expires. Returns True if an event has been received.
+bool waitRenderEvent(const nb::object& renderer, float timeout)
+{
+	return getExporter(renderer)->waitForRenderEvent(timeout);
+}
+
 // Returns the number of the last rendered frame
 int getLastRenderedFrame(const nb::object& renderer)
 {
@@ -943,6 +1181,7 @@ NB_MODULE(VRayBlenderLib, m)
 
 	m.def(FUN(setVfbOnTopWithRenderer),      nb::arg("renderer"), nb::arg("alwaysOnTop"));
 	m.def(FUN(setRenderStoppedCallback),     nb::arg("renderer"), nb::arg("renderStoppedCallback"));
+	m.def(FUN(setImageUpdatedCallback),      nb::arg("renderer"), nb::arg("imageUpdatedCallback").none());
 	m.def(FUN(setRenderStartCallback),       nb::arg("startRenderCallback"));
 	m.def(FUN(setZmqServerAbortCallback),    nb::arg("zmqServerAbortCallback"));
 	m.def(FUN(getRenderProgress),            nb::arg("renderer"));
@@ -971,11 +1210,15 @@ NB_MODULE(VRayBlenderLib, m)
 	m.def(FUN(pluginUpdateTransform));
 	m.def(FUN(pluginUpdatePluginDesc), nb::arg("renderer"), nb::arg("pluginName"), nb::arg("attrName"), nb::arg("pluginValue"), nb::arg("animatable") = true, nb::arg("forceUpdate") = false);
 	m.def(FUN(pluginUpdateList),       nb::arg("renderer"), nb::arg("name"), nb::arg("attrName"), nb::arg("list"), nb::arg("elemTypes"), nb::arg("animatable") = true);
+	m.def(FUN(pluginUpdateBatch),      nb::arg("renderer"), nb::arg("pluginName"), nb::arg("updates"));
+	m.def(FUN(pluginUpdateVisibility), nb::arg("renderer"), nb::arg("attrName"), nb::arg("pluginNames"), nb::arg("flags"));
 	m.def(FUN(pluginReCreateAttr),     nb::arg("renderer"), nb::arg("name"), nb::arg("attrName"), nb::arg("animatable") = true);
 	m.def(FUN(pluginResetValue),       nb::arg("renderer"), nb::arg("name"), nb::arg("attrName"));
 
 	m.def(FUN(exportGeometry),         nb::arg("renderer"), nb::arg("meshData"), nb::arg("asyncExport"));
+	m.def(FUN(hashMeshData),           nb::arg("meshData"));
 	m.def(FUN(exportHair),             nb::arg("renderer"), nb::arg("hairData"));
+	m.def(FUN(getChildParticleParents), nb::arg("psys"), nb::arg("firstChild"), nb::arg("count"));
 	m.def(FUN(exportPointCloud),       nb::arg("renderer"), nb::arg("pcData"), nb::arg("asyncExport"));
 	m.def(FUN(exportSmoke),            nb::arg("renderer"), nb::arg("smokeData"));
 	m.def(FUN(exportInstancer),        nb::arg("renderer"), nb::arg("instancerData"));
@@ -984,6 +1227,8 @@ NB_MODULE(VRayBlenderLib, m)
 
 	m.def(FUN(startExport),            nb::arg("renderer"), nb::arg("threadCount"));
 	m.def(FUN(finishExport),           nb::arg("renderer"), nb::arg("interactive"));
+	m.def(FUN(popCompletedMeshes),     nb::arg("renderer"));
+	m.def(FUN(getExportMemoryStats),   nb::arg("renderer"));
 	m.def(FUN(writeVrscene),           nb::arg("renderer"), nb::arg("exportSettings"));
 	m.def(FUN(startStatsCollection),   nb::arg("renderer"));
 	m.def(FUN(endStatsCollection),     nb::arg("renderer"), nb::arg("printStats"), nb::arg("title"));
@@ -995,6 +1240,7 @@ NB_MODULE(VRayBlenderLib, m)
 
 	m.def(FUN(getImage),               nb::arg("renderer"));
 	m.def(FUN(getRenderPassImage),     nb::arg("renderer"), nb::arg("passName"));
+	m.def(FUN(updateImageBuffer),      nb::arg("renderer"), nb::arg("buffer"), nb::arg("version"));
 	m.def(FUN(getEngineUpdateMessage), nb::arg("renderer"));
 	m.def(FUN(isRenderReady),          nb::arg("renderer"));
 	m.def(FUN(imageWasUpdated),        nb::arg("renderer"));
@@ -1007,6 +1253,7 @@ NB_MODULE(VRayBlenderLib, m)
 	m.def(FUN(renderJobIsRunning),     nb::arg("renderer"));
 	m.def(FUN(exportJobIsRunning),     nb::arg("renderer"));
 	m.def(FUN(getLastRenderedFrame),   nb::arg("renderer"));
+	m.def(FUN(waitRenderEvent),        nb::arg("renderer"), nb::arg("timeout"));
 
 #ifdef WITH_PROFILING
 	m.def(FUN(getReceivedImagesCount), nb::arg("renderer"));
@@ -1038,6 +1285,7 @@ NB_MODULE(VRayBlenderLib, m)
 		.ADD_RW_PROPERTY(ExporterSettings, separateFiles)
 		.ADD_RW_PROPERTY(ExporterSettings, previewDir)
 		.ADD_RW_PROPERTY(ExporterSettings, drHosts)
+		.ADD_RW_PROPERTY(ExporterSettings, exportMemoryLimit)
 		.ADD_RW_PROPERTY(ExporterSettings, renderThreads);
 
 
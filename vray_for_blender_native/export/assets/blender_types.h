@@ -144,6 +144,21 @@ typedef struct ParticleCacheKey {
   int segments;
 } ParticleCacheKey;
 
+// Copied verbatim from blender/source/blender/makesdna/DNA_particle_types.h
+// Note: The structure is accessed as an array, so it must NOT be truncated.
+typedef struct ChildParticle {
+	/** Num is face index on the final derived mesh. */
+	int num;
+	int parent;
+	/** Nearest particles to the child, used for the interpolation. */
+	int pa[4];
+	/** Interpolation weights for the above particles. */
+	float w[4];
+	/** Face vertex weights and offset. */
+	float fuv[4], foffset;
+	char _pad0[4];
+} ChildParticle;
+
 struct ListBase {
 	void *first, *last;
 };
@@ -157,7 +172,7 @@ struct ParticleSystem {
 	/** (parent) particles. */
 	void *particles;
 	/** Child particles. */
-	void *child;
+	ChildParticle *child;
 
 	/** Particle editmode (runtime). */
 	struct PTCacheEdit *edit;
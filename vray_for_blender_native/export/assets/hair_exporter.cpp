@@ -222,6 +222,28 @@ AttrValue exportParticleHair(const HairData& hair, ZmqExporter& exporter) {
 }
 
 
+/// @brief Get the indices of the parent particles of a range of child particles.
+/// @param psys - the particle system
+/// @param firstChild - index of the first child ( in the child particles array )
+/// @param count - number of children to process
+/// @param [out] parents - array of at least 'count' elements, receives the parent indices
+/// @return the number of children processed. It is less than 'count' if the range is out of bounds.
+int getChildParticleParents(const ParticleSystem* psys, int firstChild, int count, int* parents) {
+	if (!psys || !psys->child || firstChild < 0) {
+		return 0;
+	}
+
+	const int available = std::max(0, std::min(count, psys->totchild - firstChild));
+	const ChildParticle* cpa = psys->child + firstChild;
+
+	for (int i = 0; i < available; ++i, ++cpa) {
+		parents[i] = cpa->parent;
+	}
+
+	return available;
+}
+
+
 /// Export hair geometry.
 /// The incoming data is in the same format for both Particle and Curves hair
 AttrValue exportGeomHair(const HairData& hair, ZmqExporter& exporter) {
@@ -6,6 +6,7 @@
 
 #include <base_types.h>
 
+struct ParticleSystem;
 
 
 namespace VRayForBlender {
@@ -20,6 +21,7 @@ namespace VRayForBlender {
 	namespace Assets
 	{
 		VRayBaseTypes::AttrValue exportGeomHair(const Interop::HairData& hair, ZmqExporter& exporter);
+		int getChildParticleParents(const ParticleSystem* psys, int firstChild, int count, int* parents);
 	}
 
 
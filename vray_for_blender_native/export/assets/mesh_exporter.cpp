@@ -4,7 +4,10 @@
 
 #include "mesh_exporter.h"
 
+#include <algorithm>
 #include <array>
+#include <span>
+#include <string>
 #include <unordered_set>
 #include <unordered_map>
 #include <base_types.h>
@@ -545,4 +548,105 @@ void fillChannelsData(const MeshData& mesh, PluginDesc &pluginDesc) {
 	}
 }
 
+
+/// Accumulates MurmurHash3 digests of a sequence of buffers into a single 64-bit value
+class BufferHasher
+{
+public:
+	template <typename T>
+	void add(std::span<T> data) {
+		add(data.data(), data.size_bytes());
+	}
+
+	void add(const std::string& str) {
+		add(str.data(), str.size());
+	}
+
+	template <typename T>
+	void addValue(const T& value) {
+		add(&value, sizeof(value));
+	}
+
+	void add(const void* data, size_t size) {
+		// MurmurHash3 takes an int length, so hash very large buffers in chunks
+		static const size_t MAX_CHUNK_SIZE = size_t(1) << 30;
+
+		const char* bytes = static_cast<const char*>(data);
+		size_t remaining = size;
+
+		do {
+			const size_t chunkSize = std::min(remaining, MAX_CHUNK_SIZE);
+
+			uint64_t digest[2] = {0, 0};
+			MurmurHash3_x64_128(bytes, static_cast<int>(chunkSize), static_cast<uint32_t>(chunkSize), digest);
+			combine(digest[0]);
+			combine(digest[1]);
+
+			bytes     += chunkSize;
+			remaining -= chunkSize;
+		} while (remaining > 0);
+
+		m_size += size;
+	}
+
+	uint64_t hash() const { return m_hash; }
+	uint64_t size() const { return m_size; }
+
+private:
+	void combine(uint64_t value) {
+		m_hash ^= value + 0x9e3779b97f4a7c15ULL + (m_hash << 6) + (m_hash >> 2);
+	}
+
+	uint64_t m_hash = 0;
+	uint64_t m_size = 0;
+};
+
+
+std::pair<uint64_t, uint64_t> hashMeshData(const MeshData& mesh)
+{
+	BufferHasher hasher;
+
+	// Every buffer is prefixed by its size so that the same bytes split differently between
+	// the buffers would not produce the same hash.
+	auto addBuffer = [&hasher](auto span) {
+		hasher.addValue(span.size());
+		hasher.add(span);
+	};
+
+	addBuffer(mesh.vertices);
+	addBuffer(mesh.loops);
+	addBuffer(mesh.loopTris);
+	addBuffer(mesh.loopTriPolys);
+	addBuffer(mesh.polyMtlIndices);
+	addBuffer(mesh.normals);
+	hasher.addValue(mesh.normalsDomain);
+
+	for (const auto& uvLayer : mesh.uvLayers) {
+		hasher.add(uvLayer.name);
+		addBuffer(uvLayer.data);
+	}
+
+	for (const auto& colorLayer : mesh.colorLayers) {
+		const size_t elementSize = (colorLayer.dataType == Interop::AttrLayer::DataType::Byte) ? sizeof(MLoopCol) : sizeof(MPropCol);
+
+		hasher.add(colorLayer.name);
+		hasher.addValue(colorLayer.dataType);
+		hasher.addValue(colorLayer.domain);
+		hasher.addValue(colorLayer.elementCount);
+		hasher.add(colorLayer.data, colorLayer.elementCount * elementSize);
+	}
+
+	// The options change the contents of the exported plugin, so they are a part of the hash
+	hasher.addValue(mesh.subdiv.enabled);
+	hasher.addValue(mesh.subdiv.level);
+	hasher.addValue(mesh.subdiv.type);
+	hasher.addValue(mesh.subdiv.useCreases);
+	hasher.addValue(mesh.options.mergeChannelVerts);
+	hasher.addValue(mesh.options.forceDynamicGeometry);
+	hasher.addValue(mesh.options.useSubsurfToOSD);
+	hasher.addValue(mesh.options.exportEdgeVisibility);
+
+	return {hasher.hash(), hasher.size()};
+}
+
 } // end namespace VRayForBlender::Assets
@@ -4,6 +4,9 @@
 
 #pragma once
 
+#include <cstdint>
+#include <utility>
+
 #include "export/plugin_desc.hpp"
 
 namespace VRayForBlender {
@@ -17,6 +20,9 @@ namespace VRayForBlender {
 		void fillMeshData(const Interop::MeshData& meshData, PluginDesc &pluginDesc);
 		void fillGeometry(const Interop::MeshData& meshData, PluginDesc& pluginDesc);
 		void fillChannelsData(const Interop::MeshData& meshData, PluginDesc &pluginDesc);
+
+		/// Content hash of all mesh buffers and export options. Returns a pair of {fingerprint, hashed bytes}.
+		std::pair<uint64_t, uint64_t> hashMeshData(const Interop::MeshData& meshData);
 	}
 
 } // namespace VRayForBlender
@@ -111,39 +111,35 @@ AttrValue exportPointCloud(const PointCloudData& pc, ZmqExporter& exporter)
 
 AttrValue exportInstancer(const InstancerData& inst, ZmqExporter& exporter)
 {
+	const size_t itemCount = inst.persistentIds.size();
+
 	AttrInstancer instancer;
 	instancer.frameNumber = exporter.getCurrentFrame();
-	instancer.data.resize(inst.itemCount);
+	instancer.data.resize(static_cast<int>(itemCount));
 
 	using Matrix = float[4][4];
 
-	// Unpack data from buffer.
-	const char* ptr = &inst.data[0];
+	// Instances reference their Node plugins by index into the name table, so each
+	// plugin name is constructed only once regardless of the number of instances.
+	std::vector<AttrPlugin> nodes;
+	nodes.reserve(inst.nodeNames.size());
+	for (const auto& nodeName : inst.nodeNames) {
+		nodes.emplace_back(nodeName);
+	}
 
-	for (int i = 0; i < inst.itemCount; ++i){
+	for (size_t i = 0; i < itemCount; ++i) {
 		AttrInstancer::Item& item = (*instancer.data)[i];
 
-		// Read persistentId and hash it. We assume it is always 8 ints long.
-		const int persistentIdSize = 8 * sizeof(int);
-
 		uint32_t hash = 0;
-		MurmurHash3_x86_32(ptr, persistentIdSize, 0, &hash);
+		MurmurHash3_x86_32(inst.persistentIds[i], sizeof(inst.persistentIds[i]), 0, &hash);
 		item.index = static_cast<int>(hash);
 
-		ptr += persistentIdSize;
-
-		// Read transformation
-		item.tm = AttrTransform(*reinterpret_cast<const Matrix*>(ptr));
-		ptr += sizeof(Matrix);
-
+		item.tm  = AttrTransform(*reinterpret_cast<const Matrix*>(inst.transforms[i]));
 		item.vel = AttrTransform::zero();
 
-		// Read node name
-		const int nameLen = *reinterpret_cast<const int*>(ptr);
-		ptr += sizeof(int);
-
-		item.node = AttrPlugin(std::string(ptr, nameLen));
-		ptr += nameLen;
+		const int nodeIndex = inst.nodeIndices[i];
+		vassert((0 <= nodeIndex) && (nodeIndex < static_cast<int>(nodes.size())));
+		item.node = nodes[nodeIndex];
 	}
 
 	PluginDesc instancerDesc(inst.name, "Instancer2");
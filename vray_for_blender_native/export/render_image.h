@@ -53,6 +53,15 @@ void updateImageRegion(
 );
 
 
+/// Outcome of copying the updated part of an image to a buffer owned by the caller
+enum class ImageCopyResult {
+	NoImage,      ///< No image has been received yet
+	Unchanged,    ///< The caller already holds the latest image
+	SizeMismatch, ///< The destination buffer size does not match the image size, nothing was copied
+	Copied        ///< The updated region has been copied
+};
+
+
 struct RenderImage {
 	RenderImage()
 		: pixels(nullptr)
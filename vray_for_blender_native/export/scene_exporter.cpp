@@ -4,7 +4,9 @@
 
 #include "scene_exporter.h"
 
+#include <algorithm>
 #include <functional>
+#include <utility>
 
 #include <base_types.h>
 #include <zmq_message.hpp>
@@ -23,6 +25,69 @@ using namespace VrayZmqWrapper;
 using namespace VRayBaseTypes;
 
 
+namespace {
+
+const size_t MB = 1024 * 1024;
+
+/// Interval at which producers blocked by the memory limit re-check the size of the ZMQ queue.
+/// The queue is drained by the ZMQ agent's thread which does not notify the exporter.
+const auto MEMORY_POLL_INTERVAL = std::chrono::milliseconds(10);
+
+/// Stop waiting for memory to be released if the data in flight has not decreased for this
+/// long, e.g. because the server does not read its socket. The limit is not enforced for
+/// the rest of the export after that.
+const auto MEMORY_STALL_TIMEOUT = std::chrono::seconds(10);
+
+
+template <typename T>
+size_t spanBytes(std::span<T> data)
+{
+	return data.size_bytes();
+}
+
+/// Approximate the memory an export task will hold until its data is serialized. The
+/// source data is used as an estimate of the size of the plugin data produced from it.
+size_t estimateTaskMemory(const MeshData& mesh)
+{
+	size_t bytes = spanBytes(mesh.vertices) + spanBytes(mesh.loops) + spanBytes(mesh.loopTris) +
+				   spanBytes(mesh.loopTriPolys) + spanBytes(mesh.polyMtlIndices) + spanBytes(mesh.normals);
+
+	for (const auto& layer : mesh.uvLayers) {
+		bytes += spanBytes(layer.data);
+	}
+
+	for (const auto& layer : mesh.colorLayers) {
+		bytes += layer.elementCount * sizeof(AttrVector);
+	}
+
+	return bytes;
+}
+
+size_t estimateTaskMemory(const HairData& hair)
+{
+	if (hair.psys) {
+		// Particle hair is read directly from the particle system
+		const size_t points = static_cast<size_t>(std::max(hair.totalParticles - hair.firstToExport, 0)) * std::max(hair.maxSteps, 0);
+		return points * (sizeof(AttrVector) + sizeof(float));
+	}
+
+	return spanBytes(hair.points) + spanBytes(hair.pointRadii) + spanBytes(hair.strandSegments) +
+		   spanBytes(hair.uvs) + spanBytes(hair.vertColors);
+}
+
+size_t estimateTaskMemory(const PointCloudData& pc)
+{
+	return spanBytes(pc.points) + spanBytes(pc.uvs) + spanBytes(pc.radii) + spanBytes(pc.colors);
+}
+
+size_t estimateTaskMemory(const InstancerData& inst)
+{
+	return spanBytes(inst.persistentIds) + spanBytes(inst.transforms) + spanBytes(inst.nodeIndices);
+}
+
+}
+
+
 SceneExporter::SceneExporter() :
 		m_wg(std::make_unique<CondWaitGroup>(0)),
 		m_threadManager(ThreadManager::make(2))
@@ -37,8 +102,18 @@ SceneExporter::~SceneExporter()
 
 
 void SceneExporter::init(ExporterBase* policy, const ExporterSettings& settings) {
+	// The tasks of a previous export use the current exporter, stop them before it is replaced
+	stopTasks();
+
 	m_settings = settings;
 
+	{
+		std::scoped_lock lock(m_memoryMtx);
+		m_memoryLimit = static_cast<size_t>(std::max(settings.exportMemoryLimit, 0)) * MB;
+		m_peakInFlightBytes = 0;
+		m_memoryStalled = false;
+	}
+
 	if (!m_exporter || m_exporter->isStopped()) {
 		const auto exporterType = static_cast<VrayZmqWrapper::ExporterType>(settings.exporterType);
 		m_exporter.reset(new ZmqExporter(exporterType));
@@ -71,8 +146,6 @@ void SceneExporter::init(ExporterBase* policy, const ExporterSettings& settings)
 
 	// Set up any callbacks specific to the derived classes
 	setupCallbacks();
-
-	m_threadManager->stop();
 }
 
 
@@ -100,6 +173,14 @@ bool SceneExporter::vrsceneExportRunning()
 	return m_vrsceneExportInProgress;
 }
 
+bool SceneExporter::waitForRenderEvent(float timeout)
+{
+	nb::gil_scoped_release noGIL;
+
+	const auto timeoutMs = std::chrono::milliseconds(static_cast<int64_t>(timeout * 1000));
+	return m_exporter->waitForRenderEvent(timeoutMs);
+}
+
 void SceneExporter::setRenderStoppedCallback(nb::callable&& cbRenderStopped)
 {
 	m_exporter->set_callback_on_render_stopped([renderStoppedCallback = std::move(cbRenderStopped)](bool isAborted) {
@@ -110,16 +191,33 @@ void SceneExporter::setRenderStoppedCallback(nb::callable&& cbRenderStopped)
 
 void SceneExporter::free()
 {
+	{
+		// The export tasks use the exporter. Python data of discarded tasks may only be released with the GIL held.
+		nb::gil_scoped_acquire gil;
+		stopTasks();
+	}
+
 	// Stop all activity on ZmqExportet before deleting it or the policy which uses it
 	m_exporter->stop();
 	m_exporter->detach();
 
 	m_policy.reset();
 	m_exporter.reset();
+}
 
+
+/// Stop the export threads. The tasks which have not been started yet are discarded, which
+/// releases their memory reservations and the Python data they reference. Must be called
+/// with the GIL held.
+void SceneExporter::stopTasks()
+{
 	if (m_threadManager) {
 		m_threadManager->stop();
 	}
+	releaseDeferred();
+
+	vassert((m_wg->remaining() == 0) && "Export tasks outlived ThreadManager::stop()");
+	vassert((m_taskBytes == 0) && "Export task memory not released");
 }
 
 
@@ -171,6 +269,12 @@ RenderImage SceneExporter::getImage()
 }
 
 
+ImageCopyResult SceneExporter::copyImageRegion(float* dest, int destW, int destH, uint64_t& version, ImageRegion& region, ImageSize& size)
+{
+	return m_exporter->copyImageRegion(dest, destW, destH, version, region, size);
+}
+
+
 RenderImage SceneExporter::getRenderPassImage(const std::string& passName)
 {
 	return m_exporter->getPass(passName);
@@ -185,11 +289,15 @@ float SceneExporter::getRenderProgress() const
 
 void SceneExporter::exportMesh(MeshDataPtr mesh, bool asyncExport)
 {
+	releaseDeferred();
+
+	auto memory = std::make_shared<TaskMemory>(*this, estimateTaskMemory(*mesh));
+
 	if (asyncExport) {
 		m_wg->add(1);
-		m_threadManager->addTask([this, mesh](int, const volatile bool &)mutable{
-			NotifyTaskDone<CondWaitGroup> doneTask(*m_wg);
+		auto doneTask = std::make_shared<NotifyTaskDone<CondWaitGroup>>(*m_wg);
 
+		m_threadManager->addTask([this, mesh, memory, doneTask](int, const volatile bool &)mutable{
 			PluginDesc pluginDesc(mesh->name, "GeomStaticMesh");
 
 			{
@@ -200,35 +308,41 @@ void SceneExporter::exportMesh(MeshDataPtr mesh, bool asyncExport)
 
 			m_exporter->exportPlugin(pluginDesc);
 
-			{
-				nb::gil_scoped_acquire gil;
-				mesh.reset();
-			}
+			const std::string meshName = mesh->name;
+			m_releaseQueue.push(std::move(mesh));
+
+			meshCompleted(meshName);
 		}, ThreadManager::Priority::LOW);
 	} else {
 		PluginDesc pluginDesc(mesh->name, "GeomStaticMesh");
 		ScopeTimer tm("fillMeshData sync");
 		Assets::fillMeshData(*mesh, pluginDesc);
 		m_exporter->exportPlugin(pluginDesc);
-		nb::gil_scoped_acquire gil;
-		mesh.reset();
+
+		const std::string meshName = mesh->name;
+		{
+			nb::gil_scoped_acquire gil;
+			mesh.reset();
+		}
+		meshCompleted(meshName);
 	}
 }
 
 
 void SceneExporter::exportHair(HairDataPtr hair)
 {
+	releaseDeferred();
+
+	auto memory = std::make_shared<TaskMemory>(*this, estimateTaskMemory(*hair));
+
 	m_wg->add(1);
-	m_threadManager->addTask([this, hair](int, const volatile bool &) mutable {
-		NotifyTaskDone<CondWaitGroup> doneTask(*m_wg);
+	auto doneTask = std::make_shared<NotifyTaskDone<CondWaitGroup>>(*m_wg);
 
+	m_threadManager->addTask([this, hair, memory, doneTask](int, const volatile bool &) mutable {
 		ScopeTimer tm("exportHair");
 		Assets::exportGeomHair(*hair, *m_exporter);
 
-		{
-			nb::gil_scoped_acquire gil;
-			hair.reset();
-		}
+		m_releaseQueue.push(std::move(hair));
 
 	}, ThreadManager::Priority::LOW);
 }
@@ -236,20 +350,19 @@ void SceneExporter::exportHair(HairDataPtr hair)
 
 void SceneExporter::exportSmoke(SmokeDataPtr smoke)
 {
+	releaseDeferred();
+
 	m_wg->add(1);
-	m_threadManager->addTask([this, smoke](int, const volatile bool &) mutable {
-		NotifyTaskDone<CondWaitGroup> doneTask(*m_wg);
+	auto doneTask = std::make_shared<NotifyTaskDone<CondWaitGroup>>(*m_wg);
 
+	m_threadManager->addTask([this, smoke, doneTask](int, const volatile bool &) mutable {
 		using Matrix = float[4][4];
 		AttrTransform transform(*reinterpret_cast<Matrix*>(smoke->transform.data()));
 
 		ScopeTimer tm("exportSmoke");
 		Assets::exportVRayNodePhxShaderSim(smoke->name, smoke->cacheDir, transform, smoke->domainRes.data(), *m_exporter);
 
-		{
-			nb::gil_scoped_acquire gil;
-			smoke.reset();
-		}
+		m_releaseQueue.push(std::move(smoke));
 
 	}, ThreadManager::Priority::LOW);
 }
@@ -258,18 +371,19 @@ void SceneExporter::exportSmoke(SmokeDataPtr smoke)
 
 void SceneExporter::exportPointCloud(PointCloudDataPtr pc, bool asyncExport)
 {
+	releaseDeferred();
+
+	auto memory = std::make_shared<TaskMemory>(*this, estimateTaskMemory(*pc));
+
 	if (asyncExport) {
 		m_wg->add(1);
-		m_threadManager->addTask([this, pc](int, const volatile bool &) mutable {
-			NotifyTaskDone<CondWaitGroup> doneTask(*m_wg);
+		auto doneTask = std::make_shared<NotifyTaskDone<CondWaitGroup>>(*m_wg);
 
+		m_threadManager->addTask([this, pc, memory, doneTask](int, const volatile bool &) mutable {
 			ScopeTimer tm("exportPointCloud");
 			Assets::exportPointCloud(*pc, *m_exporter);
 
-			{
-				nb::gil_scoped_acquire gil;
-				pc.reset();
-			}
+			m_releaseQueue.push(std::move(pc));
 
 		}, ThreadManager::Priority::LOW);
 	} else {
@@ -283,17 +397,18 @@ void SceneExporter::exportPointCloud(PointCloudDataPtr pc, bool asyncExport)
 
 void SceneExporter::exportInstancer(InstancerDataPtr inst)
 {
+	releaseDeferred();
+
+	auto memory = std::make_shared<TaskMemory>(*this, estimateTaskMemory(*inst));
+
 	m_wg->add(1);
-	m_threadManager->addTask([this, inst](int, const volatile bool &) mutable {
-		NotifyTaskDone<CondWaitGroup> doneTask(*m_wg);
+	auto doneTask = std::make_shared<NotifyTaskDone<CondWaitGroup>>(*m_wg);
 
+	m_threadManager->addTask([this, inst, memory, doneTask](int, const volatile bool &) mutable {
 		ScopeTimer tm("exportInstancer");
 		Assets::exportInstancer(*inst, *m_exporter);
 
-		{
-			nb::gil_scoped_acquire gil;
-			inst.reset();
-		}
+		m_releaseQueue.push(std::move(inst));
 
 	}, ThreadManager::Priority::LOW);
 
@@ -303,28 +418,44 @@ void SceneExporter::exportInstancer(InstancerDataPtr inst)
 void SceneExporter::startExport(int threadCount)
 {
 	m_threadManager->setThreadCount(threadCount);
+
+	{
+		std::scoped_lock lock(m_memoryMtx);
+		m_peakInFlightBytes = m_taskBytes + m_exporter->getQueuedBytes();
+		m_memoryStalled = false;
+	}
 }
 
 
 void SceneExporter::finishExport(bool interactive)
 {
-	nb::gil_scoped_release noGIL;
-
-	ScopeTimer tm("finish_export: wait");
-	m_wg->wait();
+	{
+		nb::gil_scoped_release noGIL;
 
+		ScopeTimer tm("finish_export: wait");
+		m_wg->wait();
 
-	if (interactive)
-	{
-		if (!m_rendererStarted){
-			// Only start the renderer once, then use commitChanges() to apply changs to the scene
-			m_exporter->start();
-			m_rendererStarted = true;
+		{
+			// All tasks have finished, the caller frees whatever it still holds
+			std::scoped_lock lock(m_completedMtx);
+			m_completedMeshes.clear();
 		}
-		else {
-			m_exporter->commitChanges();
+
+
+		if (interactive)
+		{
+			if (!m_rendererStarted){
+				// Only start the renderer once, then use commitChanges() to apply changs to the scene
+				m_exporter->start();
+				m_rendererStarted = true;
+			}
+			else {
+				m_exporter->commitChanges();
+			}
 		}
 	}
+
+	releaseDeferred();
 }
 
 
@@ -355,3 +486,121 @@ void SceneExporter::endStatsCollection(bool printStats, const std::string& title
 }
 
 
+SceneExporter::TaskMemory::TaskMemory(SceneExporter& exporter, size_t bytes) :
+	m_exporter(exporter),
+	m_bytes(bytes)
+{
+	m_exporter.reserveTaskMemory(m_bytes);
+}
+
+
+SceneExporter::TaskMemory::~TaskMemory()
+{
+	m_exporter.releaseTaskMemory(m_bytes);
+}
+
+
+/// Account for the memory of a new export task. If the memory in flight exceeds the
+/// limit, block the caller until enough of it has been serialized and sent.
+void SceneExporter::reserveTaskMemory(size_t bytes)
+{
+	// The first task is always let through so that objects larger than the limit
+	// can still be exported.
+	auto fits = [this, bytes](size_t inFlight) {
+		return (m_memoryLimit == 0) || m_memoryStalled || (inFlight == 0) || (inFlight + bytes <= m_memoryLimit);
+	};
+
+	std::unique_lock lock(m_memoryMtx);
+	size_t inFlight = m_taskBytes + m_exporter->getQueuedBytes();
+
+	if (!fits(inFlight)) {
+		lock.unlock();
+
+		{
+			// Don't block the threads which invoke Python callbacks
+			nb::gil_scoped_release noGIL;
+			ScopeTimer tm("export memory limit: wait");
+
+			std::unique_lock waitLock(m_memoryMtx);
+			auto lastProgress = std::chrono::steady_clock::now();
+
+			while (!fits(inFlight = m_taskBytes + m_exporter->getQueuedBytes())) {
+				m_memoryCond.wait_for(waitLock, MEMORY_POLL_INTERVAL);
+
+				const auto now = std::chrono::steady_clock::now();
+				if (m_taskBytes + m_exporter->getQueuedBytes() < inFlight) {
+					lastProgress = now;
+				}
+				else if (now - lastProgress > MEMORY_STALL_TIMEOUT) {
+					Logger::warning("Export memory limit of %1% MB exceeded, %2% MB are not being released. Continuing the export.",
+						m_memoryLimit / MB, inFlight / MB);
+					m_memoryStalled = true;
+					break;
+				}
+			}
+		}
+
+		lock.lock();
+		inFlight = m_taskBytes + m_exporter->getQueuedBytes();
+	}
+
+	m_taskBytes += bytes;
+	m_peakInFlightBytes = std::max(m_peakInFlightBytes, inFlight + bytes);
+}
+
+
+void SceneExporter::releaseTaskMemory(size_t bytes)
+{
+	{
+		std::scoped_lock lock(m_memoryMtx);
+
+		// The data of the task has just been queued for sending, this is where the
+		// total memory in flight peaks.
+		m_peakInFlightBytes = std::max(m_peakInFlightBytes, m_taskBytes + m_exporter->getQueuedBytes());
+		m_taskBytes -= bytes;
+	}
+
+	m_memoryCond.notify_all();
+}
+
+
+/// Release the Python data of the finished export tasks. The export tasks don't release it
+/// themselves because this requires the GIL, which the main thread holds most of the time
+/// during export. Must be called with the GIL held.
+void SceneExporter::releaseDeferred()
+{
+	if (m_releaseQueue.size() > 0) {
+		ScopeTimer tm("release task data");
+		m_releaseQueue.drain();
+	}
+}
+
+
+void SceneExporter::meshCompleted(const std::string& name)
+{
+	std::scoped_lock lock(m_completedMtx);
+	m_completedMeshes.push_back(name);
+}
+
+
+std::vector<std::string> SceneExporter::popCompletedMeshes()
+{
+	std::vector<std::string> names;
+	{
+		std::scoped_lock lock(m_completedMtx);
+		names = std::exchange(m_completedMeshes, {});
+	}
+
+	// A task queues its mesh data for release before it reports the mesh as completed, so draining
+	// the queue after taking the names releases the data of all of them. Once a name is returned,
+	// the caller may free the Blender mesh which the data references.
+	releaseDeferred();
+	return names;
+}
+
+
+std::pair<uint64_t, uint64_t> SceneExporter::getMemoryStats()
+{
+	std::scoped_lock lock(m_memoryMtx);
+	return { m_peakInFlightBytes, m_memoryLimit };
+}
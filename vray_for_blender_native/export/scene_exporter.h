@@ -7,11 +7,13 @@
 #include <nanobind/nanobind.h>
 #include <atomic>
 #include <chrono>
+#include <condition_variable>
 #include <cstdint>
 #include <memory>
 #include <mutex>
 #include <span>
 #include <string>
+#include <vector>
 
 
 #include "render_image.h"
@@ -40,6 +42,7 @@ namespace VRayForBlender {
 		virtual void setupCallbacks() {}
 		virtual void abortRender() {}
 		virtual bool imageWasUpdated() {return false;}
+		virtual void setImageUpdatedCallback(nb::callable&& /*cbImageUpdated*/) {}
 		virtual bool isRenderReady() {return false;}
 	};
 
@@ -102,24 +105,54 @@ public:
 	void          clearScene();
 
 	RenderImage   getImage();
+	ImageCopyResult copyImageRegion(float* dest, int destW, int destH, uint64_t& version, ImageRegion& region, ImageSize& size);
 	RenderImage   getRenderPassImage(const std::string& passName);
 	float          getRenderProgress() const;
 
 	std::string   getEngineUpdateMessage(); // Returns status of the renderring in text
 	bool          isRenderReady(); // Indicates that the final rendered image has come
 	bool          imageWasUpdated(); // True when there is updated image for drawing
+	void          setImageUpdatedCallback(nb::callable&& cbImageUpdated) { m_policy->setImageUpdatedCallback(std::move(cbImageUpdated)); }
 	bool          vrsceneExportRunning();
+	bool          waitForRenderEvent(float timeout); // Blocks until a render event is received or timeout (in seconds) expires
 
 	ZmqExporter*  getPluginExporter() { return m_exporter.get(); };
 
 	void          setRenderStoppedCallback(nb::callable&& cbRenderStopped);
 
+	std::vector<std::string> popCompletedMeshes(); // Names of the meshes whose export tasks have finished since the last call
+	std::pair<uint64_t, uint64_t> getMemoryStats(); // (peak bytes in flight, memory limit in bytes)
+
+protected:
+	/// Memory reserved for a single export task. The memory is reserved on construction, which may block
+	/// ( see reserveTaskMemory() ), and is released when the object goes out of scope. Export tasks
+	/// capture it, so that the memory of a task discarded by ThreadManager::stop() is released as well.
+	class TaskMemory {
+	public:
+		TaskMemory(SceneExporter& exporter, size_t bytes);
+		~TaskMemory();
+
+		TaskMemory(const TaskMemory&) = delete;
+		TaskMemory& operator=(const TaskMemory&) = delete;
+
+	private:
+		SceneExporter& m_exporter;
+		size_t         m_bytes;
+	};
+
+	void          reserveTaskMemory(size_t bytes);
+	void          releaseTaskMemory(size_t bytes);
+	void          stopTasks();
+	void          releaseDeferred();
+	void          meshCompleted(const std::string& name);
+
 protected:
 	ExporterBasePtr          m_policy;
 	ZmqExporterPtr           m_exporter;  ///< Pointer to the actual plugin exporter
 	ExporterSettings         m_settings; ///< Holder for all settings that affect way of export
 
 	CondWaitGroupPtr         m_wg;
+	DeferredReleaseQueue     m_releaseQueue; // Python data of the finished export tasks, released by the main thread
 	std::optional<TimePoint> m_tmStartExport;  // Used for the time-to-first-image metric
 	ThreadManager::Ptr       m_threadManager;
 	bool                     m_rendererStarted = false;
@@ -128,6 +161,18 @@ protected:
 	std::string              engineUpdateMessage;
 
 	std::atomic_bool         m_vrsceneExportInProgress = false; // Waiting for response to a requested .vrscene export operation
+
+	// Memory budget of the export. Accounts for the source data held by the pending export tasks
+	// and for the serialized messages waiting in the ZMQ outbound queue.
+	std::mutex               m_memoryMtx;
+	std::condition_variable  m_memoryCond;
+	size_t                   m_memoryLimit = 0;       // Max bytes in flight, 0 for no limit
+	size_t                   m_taskBytes = 0;         // Bytes reserved by the pending export tasks
+	size_t                   m_peakInFlightBytes = 0; // Peak of task + ZMQ queue bytes since the start of the export
+	bool                     m_memoryStalled = false; // The memory in flight stopped decreasing, the limit is suspended
+
+	std::mutex               m_completedMtx;
+	std::vector<std::string> m_completedMeshes;       // Meshes whose source data is no longer referenced by the exporter
 };
 
 }
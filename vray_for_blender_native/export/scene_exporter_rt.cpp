@@ -3,6 +3,7 @@
 // SPDX-License-Identifier: GPL-3.0-or-later
 
 #include "scene_exporter_rt.h"
+#include "api/interop/utils.hpp"
 
 namespace VRayForBlender
 {
@@ -16,6 +17,9 @@ InteractiveExporter::InteractiveExporter(const ExporterSettings& settings) :
 InteractiveExporter::~InteractiveExporter() {
 	m_exporter->set_callback_on_image_ready(nullptr);
 	m_exporter->set_callback_on_rt_image_updated(nullptr);
+
+	nb::gil_scoped_acquire gil;
+	m_imageUpdatedCallback = nb::callable();
 }
 
 
@@ -33,11 +37,23 @@ void InteractiveExporter::setupCallbacks()
 	});
 
 	m_exporter->set_callback_on_rt_image_updated([&]() {
-		m_imageUpdated = true;
+		if (!m_imageUpdated.exchange(true)) {
+			nb::gil_scoped_acquire gil;
+			if (m_imageUpdatedCallback) {
+				invokePythonCallback("imageUpdated", m_imageUpdatedCallback);
+			}
+		}
 	});
 }
 
 
+void InteractiveExporter::setImageUpdatedCallback(nb::callable&& cbImageUpdated)
+{
+	// Called from Python, the GIL is held
+	m_imageUpdatedCallback = std::move(cbImageUpdated);
+}
+
+
 void InteractiveExporter::renderEnd()
 {
 	m_exporter->stopRendering();
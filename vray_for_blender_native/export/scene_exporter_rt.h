@@ -26,6 +26,7 @@ private:
 	void setupCallbacks () override;
 	bool isRenderReady  () override;
 	bool imageWasUpdated() override;
+	void setImageUpdatedCallback(nb::callable&& cbImageUpdated) override;
 	void renderEnd      () override;
 	bool isRendering    () override;
 
@@ -35,6 +36,10 @@ private:
 
 	std::atomic_bool	m_imageUpdated = false;		// An image update was receved from VRay
 	std::atomic_bool	m_imageReadyReceived = false; // The last frame of the currently rendered frame has been received 
+
+	// Invoked when an image arrives after the previous one has been consumed through imageWasUpdated(),
+	// so that an idle draw scheduler could be woken up without polling. Only accessed with the GIL held.
+	nb::callable        m_imageUpdatedCallback;
 };
 
 } // namespace VRayForBlender
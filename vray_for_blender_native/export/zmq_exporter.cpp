@@ -301,6 +301,9 @@ void ZmqExporter::handleMsg(const zmq::message_t& msg) {
 
 void ZmqExporter::handleError(const std::string& err) {
 	Logger::error("Blender: %1%", err);
+
+	// Let any waiting thread check whether the connection to the server is still alive
+	notifyRenderEvent();
 }
 
 
@@ -367,10 +370,18 @@ void ZmqExporter::processRendererOnImage(const proto::MsgRendererOnImage& messag
 			std::scoped_lock lock(m_imgMutex);
 
 			for (const auto &img : message.imageSet.images) {
-				m_layerImages[img.first].update(
+				auto& layer = m_layerImages[img.first];
+				layer.update(
 					img.second,
 					this
 				);
+
+				if (img.first == RenderChannelType::RenderChannelTypeNone) {
+					// The stored image rows are in bottom-up order
+					markImageDirty(img.second.isBucket() ?
+						ImageRegion(img.second.x, layer.h - img.second.y - img.second.height, img.second.width, img.second.height) :
+						ImageRegion(ImageSize{layer.w, layer.h, layer.channels}));
+				}
 			}
 		}
 
@@ -394,8 +405,11 @@ void ZmqExporter::processRendererOnImage(const proto::MsgRendererOnImage& messag
 		this->callback_on_rt_image_updated();
 	}
 
-	if (ready && this->callback_on_image_ready) {
-		this->callback_on_image_ready();
+	if (ready) {
+		if (this->callback_on_image_ready) {
+			this->callback_on_image_ready();
+		}
+		notifyRenderEvent();
 	}
 }
 
@@ -420,6 +434,8 @@ void ZmqExporter::processRendererOnChangeState(const proto::MsgRendererOnChangeS
 	default:
 		vassert(!"Receieved unexpected RendererState message from renderer.");
 	}
+
+	notifyRenderEvent();
 }
 
 
@@ -429,11 +445,39 @@ void ZmqExporter::processRendererOnAsyncOpComplete(const proto::MsgRendererOnAsy
 	if (this->callback_on_async_op_complete) {
 		this->callback_on_async_op_complete(message.operation, message.success, message.message);
 	}
+
+	notifyRenderEvent();
 }
 
 
 void ZmqExporter::processRendererOnProgress(const proto::MsgRendererOnProgress& message) {
 	m_renderProgress = static_cast<float>(message.elements) / message.totalElements;
+	notifyRenderEvent();
+}
+
+
+/// Wake up any thread blocked in waitForRenderEvent()
+void ZmqExporter::notifyRenderEvent() {
+	{
+		std::scoped_lock lock(m_renderEventMutex);
+		++m_renderEventCount;
+	}
+	m_renderEventCond.notify_all();
+}
+
+
+/// Block until a render event is received from the server or the timeout expires.
+/// Events received since the previous call are reported immediately.
+/// @return true if an event has been received
+bool ZmqExporter::waitForRenderEvent(std::chrono::milliseconds timeout) {
+	std::unique_lock lock(m_renderEventMutex);
+
+	const bool received = m_renderEventCond.wait_for(lock, timeout, [this]() {
+		return m_renderEventCount != m_renderEventsSeen;
+	});
+
+	m_renderEventsSeen = m_renderEventCount;
+	return received;
 }
 
 
@@ -508,12 +552,77 @@ bool ZmqExporter::readViewportImage() {
 			layer.h = buffer.height;
 			layer.channels = 4;
 		}
+
+		markImageDirty(ImageRegion(ImageSize{layer.w, layer.h, layer.channels}));
 	}
 
 	return true;
 }
 
 
+/// Extend the updated region of the composite image. m_imgMutex should be locked by the caller.
+void ZmqExporter::markImageDirty(const ImageRegion& region) {
+	if (m_imageDirty.w == 0 || m_imageDirty.h == 0) {
+		m_imageDirty = region;
+	}
+	else {
+		const int x0 = std::min(m_imageDirty.x, region.x);
+		const int y0 = std::min(m_imageDirty.y, region.y);
+		const int x1 = std::max(m_imageDirty.x + m_imageDirty.w, region.x + region.w);
+		const int y1 = std::max(m_imageDirty.y + m_imageDirty.h, region.y + region.h);
+
+		m_imageDirty = ImageRegion(x0, y0, x1 - x0, y1 - y0);
+	}
+
+	++m_imageVersion;
+}
+
+
+/// Copy the part of the composite image updated since the version held by the caller to a buffer
+/// owned by the caller. Only the updated region is copied if the caller holds the version of the previous
+/// call, otherwise the whole image is copied.
+/// @param dest - destination buffer for destW x destH RGBA pixels, in the row order of the stored image
+/// @param version [in/out] - the version of the image in dest, 0 if dest holds no image
+/// @param region [out] - the copied region
+/// @param size [out] - the size of the current image
+ImageCopyResult ZmqExporter::copyImageRegion(float* dest, int destW, int destH, uint64_t& version, ImageRegion& region, ImageSize& size) {
+	std::scoped_lock lock(m_imgMutex);
+
+	auto imgIter = m_layerImages.find(RenderChannelType::RenderChannelTypeNone);
+	if ((imgIter == m_layerImages.end()) || !imgIter->second.pixels || (imgIter->second.channels != 4)) {
+		return ImageCopyResult::NoImage;
+	}
+
+	const RenderImage& image = imgIter->second;
+	size = ImageSize{image.w, image.h, image.channels};
+
+	if (version == m_imageVersion) {
+		return ImageCopyResult::Unchanged;
+	}
+
+	if ((image.w != destW) || (image.h != destH)) {
+		return ImageCopyResult::SizeMismatch;
+	}
+
+	const bool partial = (version != 0) && (version == m_imageDirtyBase) && (m_imageDirty.w > 0) && (m_imageDirty.h > 0);
+	region = partial ? m_imageDirty : ImageRegion(size);
+
+	const size_t lineSize = static_cast<size_t>(image.w) * image.channels;
+	const size_t copySize = static_cast<size_t>(region.w) * image.channels * sizeof(float);
+
+	for (int y = region.y; y < region.y + region.h; ++y) {
+		const size_t offset = y * lineSize + static_cast<size_t>(region.x) * image.channels;
+		memcpy(dest + offset, image.pixels + offset, copySize);
+	}
+
+	version = m_imageVersion;
+	m_imageDirtyBase = m_imageVersion;
+	m_imageDirty = ImageRegion(0, 0, 0, 0);
+
+	return ImageCopyResult::Copied;
+}
+
+
 RenderImage ZmqExporter::getImage() {
 	return getRenderChannelImage(RenderChannelType::RenderChannelTypeNone);
 }
@@ -536,7 +645,7 @@ RenderImage ZmqExporter::getPass(const std::string& name)
 
 void ZmqExporter::freeRenderer()
 {
-	m_client->send(serializeMessage(MsgRendererFree{}));
+	sendRendererMsg(serializeMessage(MsgRendererFree{}));
 }
 
 
@@ -546,7 +655,7 @@ bool ZmqExporter::isStopped() const {
 
 void ZmqExporter::clearFrameData(float upTo)
 {
-	m_client->send(serializeMessage(MsgRendererClearFrameValues{upTo}));
+	sendRendererMsg(serializeMessage(MsgRendererClearFrameValues{upTo}));
 	m_dirty = true;
 }
 
@@ -554,12 +663,12 @@ void ZmqExporter::clearFrameData(float upTo)
 void ZmqExporter::clearScene()
 {
 	m_cachedValues = ValueCache{}; // Resetting the cached values, becaues have to be set again after the scene is cleared.
-	m_client->send(serializeMessage(MsgRendererReset{}));
+	sendRendererMsg(serializeMessage(MsgRendererReset{}));
 }
 
 void VRayForBlender::ZmqExporter::abortRender()
 {
-	m_client->send(serializeMessage(MsgRendererAbort{}));
+	sendInteractiveMsg(serializeMessage(MsgRendererAbort{}));
 }
 
 void ZmqExporter::pluginCreate(const std::string& pluginName, const std::string& pluginType, bool allowTypeChanges)
@@ -587,13 +696,72 @@ void ZmqExporter::pluginUpdate(const std::string& pluginName, const std::string&
 	msg.setForceUpdate(forceUpdate);
 	msg.setReCreateAttribute(recreate);
 
-	sendPluginMsg(serializeMessage(msg));
+	sendPluginUpdate(msg);
+}
+
+
+void ZmqExporter::pluginUpdateBatch(const std::string& pluginName, const AttrUpdates& updates)
+{
+	if (updates.empty()) {
+		return;
+	}
+
+	// The protocol has no multi-attribute update message, so each attribute still travels
+	// as a separate MsgPluginUpdate. All of them are serialized here in one pass and handed
+	// to the agent's queue under a single lock.
+	std::vector<zmq::message_t> messages;
+	messages.reserve(updates.size());
+
+	for (const auto& update : updates) {
+		MsgPluginUpdate msg{
+			pluginName,
+			update.attrName,
+			update.value
+		};
+		msg.setAnimatable(update.animatable);
+		msg.setForceUpdate(update.forceUpdate);
+
+		messages.push_back(serializeMessage(msg));
+	}
 
+	m_client->send(std::move(messages));
 	m_dirty = true;
 }
 
 
 
+/// Set the same boolean attribute ( e.g. 'visible' or 'enabled' ) on many plugins at once.
+/// @param attrName - the attribute to set
+/// @param pluginNames - the plugins to update
+/// @param flags - the values to set, one per plugin
+void ZmqExporter::pluginUpdateVisibility(const std::string& attrName, const std::vector<std::string>& pluginNames, const std::vector<int>& flags)
+{
+	vassert(pluginNames.size() == flags.size());
+
+	const size_t count = std::min(pluginNames.size(), flags.size());
+	if (count == 0) {
+		return;
+	}
+
+	std::vector<zmq::message_t> messages;
+	messages.reserve(count);
+
+	for (size_t i = 0; i < count; ++i) {
+		MsgPluginUpdate msg{
+			pluginNames[i],
+			attrName,
+			AttrValue(flags[i] ? 1 : 0)
+		};
+		msg.setAnimatable(true);
+
+		messages.push_back(serializeMessage(msg));
+	}
+
+	m_client->send(std::move(messages));
+	m_dirty = true;
+}
+
+
 void ZmqExporter::sendPluginMsg(zmq::message_t && msg)
 {
 	m_client->send(std::move(msg));
@@ -601,6 +769,38 @@ void ZmqExporter::sendPluginMsg(zmq::message_t && msg)
 }
 
 
+/// Send a plugin update. If the server accepts multi-frame messages, large lists are sent as separate
+/// frames which reference the data of the lists instead of being copied into the message.
+void ZmqExporter::sendPluginUpdate(const MsgPluginUpdate& msg)
+{
+	if (m_client->peerAcceptsFrames()) {
+		m_client->send(serializeMessageFrames(msg));
+		m_dirty = true;
+	}
+	else {
+		sendPluginMsg(serializeMessage(msg));
+	}
+}
+
+
+/// Send a renderer message which does not depend on the order of plugin updates. Such
+/// messages are queued separately and are not delayed by large amounts of plugin data.
+/// They are still sent after all renderer messages sent before them ( see sendRendererMsg() ).
+void ZmqExporter::sendInteractiveMsg(zmq::message_t && msg)
+{
+	m_client->send(std::move(msg), ControlMessage::DATA, SendLane::Interactive);
+}
+
+
+/// Send a renderer message which changes the state of the renderer, e.g. initializes or starts it.
+/// The message is ordered after the plugin data sent before it and no interactive message sent
+/// after it can overtake it.
+void ZmqExporter::sendRendererMsg(zmq::message_t && msg)
+{
+	m_client->sendFence(std::move(msg));
+}
+
+
 
 void ZmqExporter::syncView(const ViewSettings& viewSettings)
 {
@@ -611,10 +811,13 @@ void ZmqExporter::syncView(const ViewSettings& viewSettings)
 		m_cachedValues.viewSettings.name = viewSettings.name;\
 	}
 
-	CHECK_UPDATE(vfbFlags, m_client->send(serializeMessage(MsgRendererSetVfbOptions{viewSettings.vfbFlags})));
-	CHECK_UPDATE(viewportImageQuality, m_client->send(serializeMessage(MsgRendererSetQuality{viewSettings.viewportImageQuality})));
-	CHECK_UPDATE(viewportImageType, m_client->send(serializeMessage(MsgRendererSetViewportImageFormat{static_cast<AttrImage::ImageType>(viewSettings.viewportImageType)})));
-	CHECK_UPDATE(renderMode, m_client->send(serializeMessage(MsgRendererSetRenderMode{viewSettings.renderMode})));
+	// View settings do not depend on plugin data, let them overtake any queued scene updates.
+	// They cannot overtake renderer messages, so they always arrive after the initialization of the
+	// renderer and after the values resent by start().
+	CHECK_UPDATE(vfbFlags, sendInteractiveMsg(serializeMessage(MsgRendererSetVfbOptions{viewSettings.vfbFlags})));
+	CHECK_UPDATE(viewportImageQuality, sendInteractiveMsg(serializeMessage(MsgRendererSetQuality{viewSettings.viewportImageQuality})));
+	CHECK_UPDATE(viewportImageType, sendInteractiveMsg(serializeMessage(MsgRendererSetViewportImageFormat{static_cast<AttrImage::ImageType>(viewSettings.viewportImageType)})));
+	CHECK_UPDATE(renderMode, sendInteractiveMsg(serializeMessage(MsgRendererSetRenderMode{viewSettings.renderMode})));
 #undef CHECK_UPDATE
 
 	m_cachedValues.viewSettings = viewSettings;
@@ -623,14 +826,14 @@ void ZmqExporter::syncView(const ViewSettings& viewSettings)
 
 void ZmqExporter::showVFB()
 {
-	m_client->send(serializeMessage(MsgRendererSetVfbOptions{static_cast<int>(VfbFlags::Show)}));
+	sendInteractiveMsg(serializeMessage(MsgRendererSetVfbOptions{static_cast<int>(VfbFlags::Show)}));
 }
 
 
 void ZmqExporter::setVfbAlwaysOnTop(bool alwaysOnTop)
 {
 	int vfbFlags = static_cast<int>((alwaysOnTop ? VfbFlags::AlwaysOnTop : VfbFlags::None));
-	m_client->send(serializeMessage(MsgRendererSetVfbOptions{vfbFlags}));
+	sendInteractiveMsg(serializeMessage(MsgRendererSetVfbOptions{vfbFlags}));
 }
 
 
@@ -643,7 +846,7 @@ float ZmqExporter::getRenderProgress() const
 void ZmqExporter::setCurrentFrame(float frame)
 {
 	m_currentSceneFrame = frame;
-	m_client->send(serializeMessage(MsgRendererSetCurrentFrame{frame}));
+	sendRendererMsg(serializeMessage(MsgRendererSetCurrentFrame{frame}));
 	m_dirty = true;
 }
 
@@ -659,7 +862,7 @@ void ZmqExporter::setRenderSize(const RenderSizes& renderSizes)
 	std::scoped_lock lock(m_imgMutex);
 	if (renderSizes != m_cachedValues.renderSizes) {
 		m_cachedValues.renderSizes = renderSizes;
-		m_client->send(serializeMessage(MsgRendererResize{renderSizes}));
+		sendRendererMsg(serializeMessage(MsgRendererResize{renderSizes}));
 		m_dirty = true;
 	}
 }
@@ -669,7 +872,7 @@ void ZmqExporter::setCameraName(const std::string &cameraName)
 {
 	if (m_cachedValues.activeCamera != cameraName) {
 		m_cachedValues.activeCamera = cameraName;
-		m_client->send(serializeMessage(MsgRendererSetCurrentCamera{cameraName}));
+		sendRendererMsg(serializeMessage(MsgRendererSetCurrentCamera{cameraName}));
 		m_dirty = true;
 	}
 }
@@ -678,7 +881,7 @@ void ZmqExporter::setCameraName(const std::string &cameraName)
 void ZmqExporter::commitChanges()
 {
 	if (m_dirty){
-		m_client->send(serializeMessage(MsgRendererSetCommitAction{CommitAction::CommitNow}));
+		sendRendererMsg(serializeMessage(MsgRendererSetCommitAction{CommitAction::CommitNow}));
 		m_dirty = false;
 	}
 }
@@ -711,9 +914,9 @@ void ZmqExporter::init(const ExporterSettings & settings)
 			type = RendererType::SingleFrame;
 		}
 
-		m_client->send(serializeMessage(MsgRendererInit{type, m_settings.renderThreads, (int)exporterType}));
-		m_client->send(serializeMessage(MsgRendererSetCommitAction{CommitAction::CommitAutoOff}));
-		m_client->send(serializeMessage(MsgRendererGetImage{static_cast<int>(RenderChannelType::RenderChannelTypeNone)}));
+		sendRendererMsg(serializeMessage(MsgRendererInit{type, m_settings.renderThreads, (int)exporterType}));
+		sendRendererMsg(serializeMessage(MsgRendererSetCommitAction{CommitAction::CommitAutoOff}));
+		sendRendererMsg(serializeMessage(MsgRendererGetImage{static_cast<int>(RenderChannelType::RenderChannelTypeNone)}));
 
 #ifndef VRAY_BLENDER_COMMUNITY_EDITION
 		if (m_settings.drUse) {
@@ -731,7 +934,7 @@ void ZmqExporter::init(const ExporterSettings & settings)
 			}
 			if (!hostsStr.empty())
 				hostsStr.pop_back(); // remove last delimiter - ;
-			m_client->send(serializeMessage(MsgRendererEnableDistributedRendering{hostsStr, (DRFlags)drFlags, m_settings.remoteDispatcher}));
+			sendRendererMsg(serializeMessage(MsgRendererEnableDistributedRendering{hostsStr, (DRFlags)drFlags, m_settings.remoteDispatcher}));
 		}
 #endif // !VRAY_BLENDER_COMMUNITY_EDITION
 
@@ -756,12 +959,12 @@ void ZmqExporter::start()
 	// In that case init() isn't called, but the viewsettings could have been changed from Blender's UI.
 	// The view settings are exported here
 	const ViewSettings& viewSettings = m_cachedValues.viewSettings;
-	m_client->send(serializeMessage(MsgRendererSetVfbOptions{viewSettings.vfbFlags}));
-	m_client->send(serializeMessage(MsgRendererSetQuality{viewSettings.viewportImageQuality}));
-	m_client->send(serializeMessage(MsgRendererSetViewportImageFormat{static_cast<AttrImage::ImageType>(viewSettings.viewportImageType)}));
-	m_client->send(serializeMessage(MsgRendererSetRenderMode{viewSettings.renderMode}));
+	sendRendererMsg(serializeMessage(MsgRendererSetVfbOptions{viewSettings.vfbFlags}));
+	sendRendererMsg(serializeMessage(MsgRendererSetQuality{viewSettings.viewportImageQuality}));
+	sendRendererMsg(serializeMessage(MsgRendererSetViewportImageFormat{static_cast<AttrImage::ImageType>(viewSettings.viewportImageType)}));
+	sendRendererMsg(serializeMessage(MsgRendererSetRenderMode{viewSettings.renderMode}));
 
-	m_client->send(serializeMessage(MsgRendererStart{}));
+	sendRendererMsg(serializeMessage(MsgRendererStart{}));
 
 	// Production rendering could be aborted and started again.
 	// For that reason this flag should be cleared.
@@ -795,7 +998,7 @@ void ZmqExporter::renderSequence(const vray::AttrList<int>& sequences)
 	m_layerImages.clear();
 
 	m_lastRenderedFrame = (*sequences)[0] - 1;
-	m_client->send(serializeMessage(MsgRendererRenderSequence{sequences}));
+	sendRendererMsg(serializeMessage(MsgRendererRenderSequence{sequences}));
 
 
 	// Production rendering could be aborted and started again.
@@ -805,13 +1008,13 @@ void ZmqExporter::renderSequence(const vray::AttrList<int>& sequences)
 
 void ZmqExporter::continueRenderSequence()
 {
-	m_client->send(serializeMessage(MsgRendererContinueSequence{}));
+	sendRendererMsg(serializeMessage(MsgRendererContinueSequence{}));
 }
 
 
 void ZmqExporter::stopRendering()
 {
-	m_client->send(serializeMessage(MsgRendererStop{}));
+	sendInteractiveMsg(serializeMessage(MsgRendererStop{}));
 }
 
 
@@ -857,7 +1060,7 @@ int ZmqExporter::exportVrscene(const ExportSceneSettings& settings)
 		}
 	}
 
-	m_client->send(serializeMessage(MsgRendererExportScene{exportSettings}));
+	sendRendererMsg(serializeMessage(MsgRendererExportScene{exportSettings}));
 	return true;
 }
 
@@ -880,14 +1083,12 @@ AttrPlugin ZmqExporter::exportPlugin(const PluginDesc& pluginDesc)
 	for (auto & attributePairs : pluginDesc.pluginAttrs) {
 		const PluginAttr & attr = attributePairs.second;
 		if (attr.attrValue.getType() != ValueTypeUnknown) {
-			auto msg = serializeMessage(MsgPluginUpdate{
+			sendPluginUpdate(MsgPluginUpdate{
 				name,
 				attr.attrName,
 				attr.attrValue,
 				attr.flags
 			});
-
-			sendPluginMsg(std::move(msg));
 		}
 	}
 
@@ -17,9 +17,12 @@
 #include <unordered_set>
 #include <functional>
 #include <atomic>
+#include <chrono>
+#include <condition_variable>
 #include <map>
 #include <memory>
 #include <string>
+#include <vector>
 
 
 // Forward declarations
@@ -75,6 +78,16 @@ class ZmqExporter{
 	ZmqExporter& operator=(ZmqExporter&) = delete;
 
 public:
+	/// A single attribute update in a batch passed to pluginUpdateBatch()
+	struct AttrUpdate {
+		std::string          attrName;
+		vray::AttrValue      value;
+		bool                 animatable  = true;
+		bool                 forceUpdate = false;
+	};
+
+	using AttrUpdates = std::vector<AttrUpdate>;
+
 	explicit ZmqExporter(proto::ExporterType exporterType);
 	~ZmqExporter();
 
@@ -99,16 +112,21 @@ public:
 	void        showVFB(); // sends VfbFlags::Show in a SetVfbOptions message
 	void        setVfbAlwaysOnTop(bool alwaysOnTop); // sends VfbFlags::AlwaysOnTop in a SetVfbOptions message
 	float       getRenderProgress() const;
+	bool        waitForRenderEvent(std::chrono::milliseconds timeout);
+	size_t      getQueuedBytes() const { return m_client->getQueuedBytes(); } // Bytes waiting to be sent to the server
 
 	// Export API
 	void        pluginCreate(const std::string& pluginName, const std::string& pluginType, bool allowTypeChanges);
 	void        pluginRemove(const std::string& pluginName);
 	void        pluginUpdate(const std::string& pluginName, const std::string& attrName, const VRayBaseTypes::AttrValue& value, bool animatable, bool forceUpdate = false, bool recreate = false);
+	void        pluginUpdateBatch(const std::string& pluginName, const AttrUpdates& updates);
+	void        pluginUpdateVisibility(const std::string& attrName, const std::vector<std::string>& pluginNames, const std::vector<int>& flags);
 	void        sendPluginMsg(zmq::message_t&& message);
 
 	RenderImage getImage        ();
 	RenderImage getPass         (const std::string& name);
 	RenderImage getRenderChannelImage(RenderChannelType channelType);
+	ImageCopyResult copyImageRegion(float* dest, int destW, int destH, uint64_t& version, ImageRegion& region, ImageSize& size);
 	void        setRenderSize   (const proto::RenderSizes &sizes);
 	void        setCameraName   (const std::string &cameraSceneName);
 	void        commitChanges   ();
@@ -134,9 +152,13 @@ public:
 
 private:
 	bool readViewportImage  ();
+	void markImageDirty     (const ImageRegion& region);
 
 	void handleMsg(const zmq::message_t& msg);
 	void handleError(const std::string& err);
+	void sendInteractiveMsg(zmq::message_t&& msg);
+	void sendRendererMsg(zmq::message_t&& msg);
+	void sendPluginUpdate(const proto::MsgPluginUpdate& msg);
 
 	void processControlOnLogMessage(proto::DeserializerStream& stream);
 	void processControlOnUpdateVfbLayers(proto::DeserializerStream& stream);
@@ -147,6 +169,7 @@ private:
 	void processRendererOnProgress(const proto::MsgRendererOnProgress& message);
 
 	void fireStopEvent(bool isAborted);
+	void notifyRenderEvent();
 
 private:
 	ExporterSettings m_settings;
@@ -169,12 +192,25 @@ private:
 	std::mutex        m_callbacksMutex;  // Guards (de)registering of callbacks
 
 	ImageMap          m_layerImages;
+
+	// Version of the composite image, incremented on each update, and the region of it updated since the
+	// last call to copyImageRegion(). Guarded by m_imgMutex.
+	uint64_t          m_imageVersion = 0;
+	uint64_t          m_imageDirtyBase = 0; // The version from which m_imageDirty has been accumulated
+	ImageRegion       m_imageDirty{0, 0, 0, 0};
 	ImgIdReaderPtr    m_imgIdReader;
 
 	float             m_currentSceneFrame = 0;
 	float             m_renderProgress = 0.0;     // Fraction of job done in [0, 1]
 	std::atomic<int>  m_lastRenderedFrame = 0;
 
+	// Render events (state changes, progress, etc.) are counted so that a waiting thread would
+	// not miss an event which arrived between two waits.
+	std::mutex              m_renderEventMutex;
+	std::condition_variable m_renderEventCond;
+	uint64_t                m_renderEventCount = 0;
+	uint64_t                m_renderEventsSeen = 0;
+
 	std::map<std::string, AttrStats> m_exportStats;
 	std::mutex m_statsMutex;
 
@@ -49,6 +49,7 @@ void ThreadManager::setThreadCount(int count) {
 }
 
 void ThreadManager::stop() {
+	std::deque<Task> discarded;
 	{
 		std::scoped_lock lock(m_queueMtx);
 		m_stop = true;
@@ -67,6 +68,12 @@ void ThreadManager::stop() {
 
 		m_workers.clear();
 	}
+
+	{
+		std::scoped_lock lock(m_queueMtx);
+		discarded.swap(m_tasks);
+	}
+	// The discarded tasks are destroyed here, outside of the lock
 }
 
 void ThreadManager::addTask(ThreadManager::Task task, ThreadManager::Priority priority) {
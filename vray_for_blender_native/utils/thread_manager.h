@@ -147,6 +147,53 @@ private:
 
 
 
+/// Queue of objects whose destruction has to be done on a particular thread, e.g. objects
+/// holding references to Python data which may only be released while holding the GIL.
+/// Worker threads push such objects here instead of acquiring the GIL themselves and the
+/// owning thread destroys them in bulk at points where it is safe to do so.
+class DeferredReleaseQueue {
+	DeferredReleaseQueue(const DeferredReleaseQueue &) = delete;
+	DeferredReleaseQueue &operator=(const DeferredReleaseQueue &) = delete;
+
+public:
+	using Item = std::shared_ptr<void>;
+
+	DeferredReleaseQueue() = default;
+
+	/// Queue an object for release. Okay to be called concurrently.
+	void push(Item &&item)
+	{
+		std::scoped_lock lock(m_mtx);
+		m_items.push_back(std::move(item));
+	}
+
+	/// Destroy all queued objects on the calling thread
+	/// @return the number of released objects
+	size_t drain()
+	{
+		std::vector<Item> items;
+		{
+			std::scoped_lock lock(m_mtx);
+			items.swap(m_items);
+		}
+		// The objects are destroyed here, outside of the lock
+		return items.size();
+	}
+
+	/// Get number of queued objects at call time
+	size_t size() const
+	{
+		std::scoped_lock lock(m_mtx);
+		return m_items.size();
+	}
+
+private:
+	mutable std::mutex m_mtx;  ///< lock guarding @m_items
+	std::vector<Item> m_items; ///< objects waiting to be released
+};
+
+
+
 /// Basic thread manager able to execute tasks on different threads
 class ThreadManager {
 
@@ -189,6 +236,8 @@ public:
 	// if thread count is 0, stop will still set the flag for stop to true
 	// and if addTask was called from another thread it will signal the task to
 	// stop
+	// The discarded tasks are destroyed on the calling thread, so any data they
+	// capture is released there
 	void stop();
 
 	// Add task to queue
@@ -135,15 +135,22 @@ def register():
     # Parse command line
     StartupConfig.init()
 
+    from vray_blender.exporting.tools import TimeStats
+    StartupConfig.startupTimes = TimeStats("V-Ray for Blender startup")
+
     for mod in _getModules():
-        mod.register()
+        StartupConfig.timeStartupPhase(mod.__name__.split('.')[-1], mod.register)
 
-    events.register()
+    StartupConfig.timeStartupPhase("events", events.register)
 
     # NOTE: Register engine at the end,
     # to be sure all used data is registered.
-    engine.register()
-    engine.ensureRunning()
+    StartupConfig.timeStartupPhase("engine", engine.register)
+    StartupConfig.timeStartupPhase("engine_start", engine.ensureRunning)
+
+    if StartupConfig.startupReport:
+        StartupConfig.startupTimes.printSummary()
+    StartupConfig.startupTimes = None
 
     if not bpy.app.background:
         # In headless mode, the upgrade will be triggered when the scene is loaded
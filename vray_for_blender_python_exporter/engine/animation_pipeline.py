@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: Chaos Software EOOD
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from collections import deque
+from typing import Callable, Iterable
+
+
+def renderPipelined(frames: Iterable[float], lookAhead: int,
+                    exportFrame: Callable[[float], None],
+                    startRenderSequence: Callable[[], None],
+                    waitFrameRenderEnd: Callable[[float], None],
+                    clearFrameData: Callable[[float], None],
+                    setRenderFrame: Callable[[float], None],
+                    continueRenderSequence: Callable[[], None]):
+    """ Schedule the export and rendering of an animation so that up to 'lookAhead' frames are
+        exported while V-Ray renders the current one. The animated values of a frame are cleared
+        as soon as V-Ray proceeds past it, which keeps at most lookAhead + 1 frames worth of data
+        in the renderer.
+
+        exportFrame() sets the renderer frame to the exported one, so while frame N renders the
+        renderer frame is N + lookAhead. Before V-Ray is allowed to proceed, the frame it is about to
+        render is sent again. This relies on the server processing SetCurrentFrame and ContinueSequence
+        in the order in which they are sent, which holds because both go through the bulk send lane.
+
+        @return True if the rendering process has been started
+    """
+    # Exported frames which have not been rendered yet. The first one is being rendered.
+    pendingFrames = deque()
+    renderingStarted = False
+
+    def renderNextFrame():
+        # Wait for the frame being rendered to finish and let V-Ray proceed to the next exported frame.
+        waitFrameRenderEnd(pendingFrames.popleft())
+
+        if pendingFrames:
+            nextFrame = pendingFrames[0]
+            clearFrameData(nextFrame)
+            setRenderFrame(nextFrame)
+            continueRenderSequence()
+
+    for frame in frames:
+        exportFrame(frame)
+        pendingFrames.append(frame)
+
+        if not renderingStarted:
+            clearFrameData(frame)
+            startRenderSequence()
+            renderingStarted = True
+        elif len(pendingFrames) > lookAhead:
+            # lookAhead frames have been exported ahead of the one being rendered
+            renderNextFrame()
+
+    while pendingFrames:
+        renderNextFrame()
+
+    return renderingStarted
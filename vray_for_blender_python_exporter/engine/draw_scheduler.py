@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import bpy
+import time
 
 from vray_blender.bin import VRayBlenderLib as vray
 from vray_blender.lib.mixin import VRayOperatorBase
@@ -35,6 +36,12 @@ class ColorManagementSettings:
 class VRay_OT_draw_viewport_timer(VRayOperatorBase):
     """ A modal operator which will periodically check for new rendered images and
         trigger a viewport redraw operation.
+
+        The check runs at the display rate while images are streaming and backs off
+        exponentially while the renderer is idle. An image arriving while the operator is
+        backed off wakes it up through the renderer's image updated callback. The callback
+        is re-armed by each viewport draw, so every new image is drawn without waiting for
+        the timer.
     """
     bl_idname   = "vray.draw_viewport_timer"
     bl_label    = "V-Ray Draw Viewport Timer Operator"
@@ -42,6 +49,15 @@ class VRay_OT_draw_viewport_timer(VRayOperatorBase):
 
     _timer = None
     _fps = 30
+    _maxIdleInterval = 1.0  # Longest interval between two checks in seconds
+
+    # Set from the renderer's image updated callback, which is invoked on a non-UI thread
+    _wakeRequested = False
+
+    @staticmethod
+    def wake():
+        """ Request checks at the display rate, e.g. because a new image has arrived """
+        VRay_OT_draw_viewport_timer._wakeRequested = True
 
     def switchViewTransformToStandard(self):
         if not hasattr(self, "previousColorManagementSettings"):
@@ -78,22 +94,37 @@ class VRay_OT_draw_viewport_timer(VRayOperatorBase):
                 self.clearViewTransform()
                 return {'FINISHED'}
 
-            # Blender applies color correction (view transform) on top of the images displayed in the 3D viewport.
-            # This can alter the appearance of images already color-corrected by V-Ray.
-            # To prevent this, we switch Blender to standard view (no transform) until there is active VRayRendererIprViewport,
-            # ensuring it doesn't alter the render result's appearance.
-            self.switchViewTransformToStandard()
-            if vray.imageWasUpdated(VRayRendererIprViewport.getActiveRenderer()):
-                if context.area:
-                    context.area.tag_redraw()
+            # Timer events of other operators are delivered to this handler as well
+            now = time.perf_counter()
+            if (now - self._lastCheck) < (self._interval * 0.5) and not __class__._wakeRequested:
+                return {'PASS_THROUGH'}
+            self._lastCheck = now
+
+            imageUpdated = vray.imageWasUpdated(VRayRendererIprViewport.getActiveRenderer())
+            if imageUpdated and context.area:
+                context.area.tag_redraw()
+
+            if imageUpdated or __class__._wakeRequested:
+                __class__._wakeRequested = False
+                self._setInterval(context, 1.0 / self._fps)
+            else:
+                self._setInterval(context, min(self._interval * 2, self._maxIdleInterval))
 
         return {'PASS_THROUGH'}
 
 
     def execute(self, context):
-        wm = context.window_manager
-        self._timer = wm.event_timer_add(1.0 / self._fps, window=context.window)
-        wm.modal_handler_add(self)
+        # Blender applies color correction (view transform) on top of the images displayed in the 3D viewport.
+        # This can alter the appearance of images already color-corrected by V-Ray.
+        # To prevent this, we switch Blender to standard view (no transform) until there is active VRayRendererIprViewport,
+        # ensuring it doesn't alter the render result's appearance.
+        self.switchViewTransformToStandard()
+
+        self._interval = 0.0
+        self._lastCheck = time.perf_counter()
+        self._setInterval(context, 1.0 / self._fps)
+
+        context.window_manager.modal_handler_add(self)
 
         # Tell Blender the operator will continue execution
         return {'RUNNING_MODAL'}
@@ -102,3 +133,16 @@ class VRay_OT_draw_viewport_timer(VRayOperatorBase):
     def cancel(self, context):
         wm = context.window_manager
         wm.event_timer_remove(self._timer)
+
+
+    def _setInterval(self, context, interval: float):
+        """ Replace the timer if the interval has changed. Window manager timers cannot be modified. """
+        if interval == self._interval:
+            return
+
+        wm = context.window_manager
+        if self._timer:
+            wm.event_timer_remove(self._timer)
+
+        self._timer = wm.event_timer_add(interval, window=context.window)
+        self._interval = interval
@@ -18,7 +18,7 @@ from vray_blender.exporting.instancer_export import InstancerExporter
 from vray_blender.exporting.plugin_tracker import ObjTracker, ScopedNodeTracker
 from vray_blender.exporting.settings_export import SettingsExporter
 from vray_blender.exporting.tools import isObjectVrayProxy, isObjectVrayScene
-from vray_blender.exporting.update_tracker import UpdateTracker, UpdateTarget
+from vray_blender.exporting.update_tracker import UpdateTracker
 from vray_blender.exporting import tools, obj_export, mtl_export, view_export, settings_export, light_export, world_export, fur_export
 from vray_blender.nodes.filters import filterRenderMasks
 from vray_blender.plugins.system.compute_devices import updateEnabledComputeDevices
@@ -33,11 +33,16 @@ from vray_blender.bin import VRayBlenderLib as vray
 
 def _exportObjects(ctx: ExporterContext):
     ctx.ts.timeThis("export_objects", lambda: obj_export.run(ctx))
+    ctx.stats.append(f"{'Geometry:':<12} {ctx.persistedState.geomFingerprints.summary()}")
+    ctx.stats.append(f"{'Export mem:':<12} {obj_export.exportMemorySummary(ctx.renderer)}")
+    ctx.stats.append(f"{'Metadata:':<12} {ctx.sceneMetadata.summary()}")
+    ctx.stats.append(f"{'Scene index:':<12} {ctx.persistedState.sceneIndex.summary()}")
 
 
 def _exportMaterials(ctx: ExporterContext):
     stats: SceneStats = ctx.ts.timeThis("export_materials", lambda: mtl_export.run(ctx))
     ctx.stats.append(f"{'Materials:':<12} exported {stats.mtls} materials, {stats.plugins} plugins, {stats.attrs} attributes")
+    ctx.stats.append(f"{'Mtl cache:':<12} {ctx.persistedState.mtlFingerprints.summary()}")
 
 
 def _exportLights(ctx: ExporterContext):
@@ -92,9 +97,11 @@ def _syncPlugins(self, exporterCtx: ExporterContext):
 
     # NOTE: Updates should tagged be BEFORE any export structures are calculated
     # for the current pass. Keep this at the beginning of the function.
-    UpdateTracker.tagCrossObjectUpdates(exporterCtx, bpy.data.materials, UpdateTarget.MATERIAL)
-    UpdateTracker.tagCrossObjectUpdates(exporterCtx, bpy.data.lights, UpdateTarget.LIGHT)
-    UpdateTracker.tagCrossObjectUpdates(exporterCtx, bpy.data.worlds, UpdateTarget.WORLD)
+    crossDependencies = exporterCtx.persistedState.crossDependencies
+    exporterCtx.ts.timeThis("sync_cross_dependencies", lambda: crossDependencies.sync(exporterCtx))
+    exporterCtx.stats.append(f"{'Cross deps:':<12} {crossDependencies.summary()}")
+
+    UpdateTracker.tagCrossObjectUpdates(exporterCtx)
 
     light_export.syncLightMeshInfo(exporterCtx)
     mtl_export.syncMtlExportCache(exporterCtx)
@@ -489,6 +496,7 @@ class VRayRendererIprBase:
         setupDistributedRendering(settings, exporterType, True)
         settings.exporterType  = exporterType
         settings.renderThreads = exporter.custom_thread_count if exporter.use_custom_thread_count=='FIXED' else -1
+        settings.exportMemoryLimit = exporter.export_memory_limit
 
         updateEnabledComputeDevices(bpy.context)
         self.renderer = vray.getMainRenderer(settings)
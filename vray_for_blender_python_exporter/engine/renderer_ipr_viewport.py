@@ -6,9 +6,8 @@ import bpy
 import time
 import blf
 
-from numpy import ndarray
-
 from vray_blender.engine.renderer_ipr_base import VRayRendererIprBase, exportViewportView
+from vray_blender.engine.draw_scheduler import VRay_OT_draw_viewport_timer
 
 from vray_blender import debug
 from vray_blender.lib import gl_draw
@@ -73,6 +72,7 @@ class VRayRendererIprViewport(VRayRendererIprBase):
 
     def stop(self, block=True):
         if self.renderer:
+            vray.setImageUpdatedCallback(self.renderer, None)
             vray.renderEnd(self.renderer)
 
             if block:
@@ -157,6 +157,10 @@ class VRayRendererIprViewport(VRayRendererIprBase):
 
                 engine.update_stats("", vray.getEngineUpdateMessage(self.renderer))
 
+                # Consume the pending image notification before drawing. This re-arms the image updated
+                # callback, so any image which arrives from now on triggers another redraw instead of
+                # waiting for the backed off draw timer.
+                vray.imageWasUpdated(self.renderer)
                 self._drawViewport(context)
                 self.persistedState.prevRegion3dViewMatrix = region3d.view_matrix.copy()
 
@@ -181,6 +185,15 @@ class VRayRendererIprViewport(VRayRendererIprBase):
         self.cbRenderStopped = lambda isAborted: onStopped(isAborted)
         vray.setRenderStoppedCallback(self.renderer, self.cbRenderStopped)
 
+        def onImageUpdated():
+            # Invoked on a non-UI thread. Tagging the engine for redraw only sets a flag which is
+            # checked by Blender's main loop.
+            VRay_OT_draw_viewport_timer.wake()
+            engine.tag_redraw()
+
+        self.cbImageUpdated = onImageUpdated
+        vray.setImageUpdatedCallback(self.renderer, self.cbImageUpdated)
+
         # 'renderer' member of engine is only used by the draw polling thread
         engine.renderer = self.renderer
         self._startDrawPoller()
@@ -192,12 +205,13 @@ class VRayRendererIprViewport(VRayRendererIprBase):
     def _drawViewport(self, context: bpy.types.Context):
         region: bpy.types.Region = context.region
 
-        # If there is a new image, update DrawData with it.
-        image: ndarray = vray.getImage(self.renderer)
-        if image is not None:
-            self.drawData = gl_draw.DrawData(image, self.viewParams)
-
         if self.drawData is None:
+            self.drawData = gl_draw.DrawData()
+
+        # If there is a new image, upload it to the GPU.
+        self.drawData.update(self.renderer, self.viewParams)
+
+        if self.drawData.texture is None:
             # Nothing to draw ( before the first image has arrived )
             return
 
@@ -237,7 +251,8 @@ class VRayRendererIprViewport(VRayRendererIprBase):
         fontSize = 20
         blf.size(fontId, fontSize)
 
-        fpsText = f"FPS: {self.currentFps:.2f}"
+        drawData = self.drawData
+        fpsText = f"FPS: {self.currentFps:.2f}  Upload: {drawData.uploadTime * 1000:.2f} ms ({drawData.uploadedFraction:.0%} of {drawData.imgW}x{drawData.imgH})"
         width, height = blf.dimensions(fontId, fpsText)
 
         # position in bottom right
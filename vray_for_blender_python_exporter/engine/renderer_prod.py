@@ -3,9 +3,9 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import threading
-import time
 import bpy
 
+from vray_blender.engine.animation_pipeline import renderPipelined
 from vray_blender.engine.renderer_prod_base import VRayRendererProdBase
 from vray_blender.exporting.update_tracker import UpdateTracker
 
@@ -23,7 +23,9 @@ from vray_blender.bin import VRayBlenderLib as vray
 ## VRayRendererProd
 #############################
 
-FRAME_EXPORT_SLEEP_TIME = 0.1
+# The render loops wake up as soon as V-Ray reports a state change. The timeout only
+# determines how often an abort request from the user is checked.
+RENDER_EVENT_WAIT_TIMEOUT = 0.25
 
 class VRayRendererProd(VRayRendererProdBase):
     """ Final (or 'production' in VRay lingo) renderer implementation.
@@ -145,40 +147,12 @@ class VRayRendererProd(VRayRendererProdBase):
             # Save the current render frame since VRayRendererProd._exportAnimationFrame() modifies it.
             currentFrame = bpy.context.scene.frame_current
 
-            # Determine if the rendering process has started.
-            # Note: Don't replace it with "frame == self.exporterCtx.commonSettings.animation.startFrame" if-statement,
-            # because in 'Single Frame' render mode with motion blur enabled, this statement won't be valid.
-            renderingStarted = False
-            for frame in self._getFrameRange(scene):
-
-                self._exportAnimationFrame(engine, frame)
-                self.exporterCtx.fullExport = False
-
-                if self.exporterCtx.commonSettings.useMotionBlur:
-                    # During motion blur animation export rendering is started only when
-                    # the entire interval of required frames is exported.
-                    if self.exporterCtx.motionBlurBuilder.isLastFrame():
-                        # The frames before the maximum motion blur duration are no longer needed.
-                        frameForClearing = frame - self.exporterCtx.commonSettings.maxMBlurDuration
-                        self._clearFrameData(upToTime=frameForClearing)
-
-                        # Setting the frame to be the original one from which the interval is calculated.
-                        frame = self.exporterCtx.motionBlurBuilder.getFrameReadyForRender()
-                        vray.setRenderFrame(self.renderer, frame)
-                    else:
-                        continue
-                else:
-                    self._clearFrameData(upToTime=frame)
+            lookAhead = scene.vray.Exporter.animation_export_look_ahead
 
-                if not renderingStarted:
-                    self._startRenderSequence(engine)
-                    renderingStarted = True
-                else:
-                    # Proceed to the next frame
-                    vray.continueRenderSequence(self.renderer)
-
-                self._waitFrameRenderEnd(engine, frame)
-                self._persistState(self.exporterCtx)
+            if (lookAhead > 0) and not self.exporterCtx.commonSettings.useMotionBlur:
+                renderingStarted = self._renderAnimationPipelined(scene, engine, lookAhead)
+            else:
+                renderingStarted = self._renderAnimationSequential(scene, engine)
 
             if renderingStarted:
                 self._reportInfo(engine, "Animation exported.")
@@ -193,6 +167,69 @@ class VRayRendererProd(VRayRendererProdBase):
         return None
 
 
+    def _renderAnimationSequential(self, scene: bpy.types.Scene, engine: bpy.types.RenderEngine):
+        """ Export each animation frame after the previous one has been rendered.
+
+            @return True if the rendering process has been started
+        """
+        # Determine if the rendering process has started.
+        # Note: Don't replace it with "frame == self.exporterCtx.commonSettings.animation.startFrame" if-statement,
+        # because in 'Single Frame' render mode with motion blur enabled, this statement won't be valid.
+        renderingStarted = False
+        for frame in self._getFrameRange(scene):
+
+            self._exportAnimationFrame(engine, frame)
+            self.exporterCtx.fullExport = False
+
+            if self.exporterCtx.commonSettings.useMotionBlur:
+                # During motion blur animation export rendering is started only when
+                # the entire interval of required frames is exported.
+                if self.exporterCtx.motionBlurBuilder.isLastFrame():
+                    # The frames before the maximum motion blur duration are no longer needed.
+                    frameForClearing = frame - self.exporterCtx.commonSettings.maxMBlurDuration
+                    self._clearFrameData(upToTime=frameForClearing)
+
+                    # Setting the frame to be the original one from which the interval is calculated.
+                    frame = self.exporterCtx.motionBlurBuilder.getFrameReadyForRender()
+                    vray.setRenderFrame(self.renderer, frame)
+                else:
+                    continue
+            else:
+                self._clearFrameData(upToTime=frame)
+
+            if not renderingStarted:
+                self._startRenderSequence(engine)
+                renderingStarted = True
+            else:
+                # Proceed to the next frame
+                vray.continueRenderSequence(self.renderer)
+
+            self._waitFrameRenderEnd(engine, frame)
+            self._persistState(self.exporterCtx)
+
+        return renderingStarted
+
+
+    def _renderAnimationPipelined(self, scene: bpy.types.Scene, engine: bpy.types.RenderEngine, lookAhead: int):
+        """ Export up to 'lookAhead' frames ahead of the frame being rendered, so that the export
+            of the next frames overlaps with the rendering of the current one.
+
+            @return True if the rendering process has been started
+        """
+        def exportFrame(frame: float):
+            self._exportAnimationFrame(engine, frame)
+            self.exporterCtx.fullExport = False
+            self._persistState(self.exporterCtx)
+
+        return renderPipelined(self._getFrameRange(scene), lookAhead,
+                               exportFrame = exportFrame,
+                               startRenderSequence = lambda: self._startRenderSequence(engine),
+                               waitFrameRenderEnd = lambda frame: self._waitFrameRenderEnd(engine, frame),
+                               clearFrameData = lambda frame: self._clearFrameData(upToTime=frame),
+                               setRenderFrame = lambda frame: vray.setRenderFrame(self.renderer, frame),
+                               continueRenderSequence = lambda: vray.continueRenderSequence(self.renderer))
+
+
     def _writeVrscene(self, scene: bpy.types.Scene, engine: bpy.types.RenderEngine, baseScenePath="", isCloudExport=False):
         """ Export the full animation sequence to V-Ray and write a .vrscene file """
         self._exportFullScene(scene, engine)
@@ -208,7 +245,7 @@ class VRayRendererProd(VRayRendererProdBase):
             # Writing the scene is an asynchronous task during which we need to keep the renderer alive.
             while vray.exportJobIsRunning(self.renderer):
                 __class__.testBreak(engine)
-                time.sleep(FRAME_EXPORT_SLEEP_TIME)
+                vray.waitRenderEvent(self.renderer, RENDER_EVENT_WAIT_TIMEOUT)
 
             self._reportInfo(engine, f"Exported scene: {exportSettings.filePath}")
 
@@ -279,7 +316,7 @@ class VRayRendererProd(VRayRendererProdBase):
 
             progress = vray.getRenderProgress(self.renderer)
             engine.update_progress(progress)
-            time.sleep(FRAME_EXPORT_SLEEP_TIME)
+            vray.waitRenderEvent(self.renderer, RENDER_EVENT_WAIT_TIMEOUT)
 
         debug.printDebug("End single-frame render.")
 
@@ -347,7 +384,7 @@ class VRayRendererProd(VRayRendererProdBase):
                     engine.update_progress(currentIdx / (totalFrames - 1))
                 return
 
-            time.sleep(FRAME_EXPORT_SLEEP_TIME)
+            vray.waitRenderEvent(self.renderer, RENDER_EVENT_WAIT_TIMEOUT)
 
 
     def _exportAnimationFrame(self, engine: bpy.types.RenderEngine, frame: float):
@@ -244,6 +244,7 @@ class VRayRendererProdBase:
         settings = vray.ExporterSettings()
         settings.exporterType     = exporterType
         settings.renderThreads    = exporter.custom_thread_count if exporter.use_custom_thread_count=='FIXED' else -1
+        settings.exportMemoryLimit = exporter.export_memory_limit
 
         setupDistributedRendering(settings, exporterType)
 
@@ -267,6 +268,9 @@ class VRayRendererProdBase:
 
     def _exportObjects(self, exporterCtx: ExporterContext):
         obj_export.run(exporterCtx)
+        debug.printDebug(f"Geometry cache: {exporterCtx.persistedState.geomFingerprints.summary()}")
+        debug.printDebug(f"Export memory: {obj_export.exportMemorySummary(exporterCtx.renderer)}")
+        debug.printDebug(f"Scene metadata cache: {exporterCtx.sceneMetadata.summary()}")
 
 
     def _exportLights(self, exporterCtx: ExporterContext):
@@ -275,6 +279,7 @@ class VRayRendererProdBase:
 
     def _exportMaterials(self, exporterCtx: ExporterContext):
         mtl_export.run(exporterCtx)
+        debug.printDebug(f"Material cache: {exporterCtx.persistedState.mtlFingerprints.summary()}")
 
 
     def _exportSettings(self, exporterCtx: ExporterContext):
@@ -14,7 +14,7 @@ from vray_blender.exporting.node_export import NodeContext, exportNodeTree, expo
 from vray_blender.exporting.plugin_tracker import TrackObj
 from vray_blender.lib.defs import AttrPlugin, ExporterBase, ExporterContext, PluginDesc
 from vray_blender.lib.export_utils import exportPluginCommon, ActiveConnectedMeshInfo
-from vray_blender.exporting.plugin_tracker import getObjTrackId
+from vray_blender.exporting.plugin_tracker import getObjTrackId, PLUGIN_TYPE_NODE
 
 def syncFurInfo(exporterCtx: ExporterContext):
     """ Collect info about the visible and updated objects associated with Fur exports. """
@@ -178,7 +178,7 @@ class FurExporter(ExporterBase):
 
         # This call of trackPlugin() is just to mark the node plugin as instanced (if it is an instance)
         # so that the visibility of the node plugin is not affected by GeometryExporter.syncObjVisibility()
-        self.objTracker.trackPlugin(furObjTrackId, nodePlugin.name, isInstance)
+        self.objTracker.trackPlugin(furObjTrackId, nodePlugin.name, isInstance, pluginType=PLUGIN_TYPE_NODE)
 
         return nodePlugin
         
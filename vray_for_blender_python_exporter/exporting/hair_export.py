@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import bpy
+import itertools
 import math
 import numpy as np
 
@@ -39,6 +40,68 @@ class HairData:
         self.maxSteps = 0
 
 
+def _sampleParticles(pmod: bpy.types.ParticleSystemModifier, particles: list, particleNumbers, uvIndex: int, colorIndex: int):
+    """ Sample the emitter UVs and colors for a sequence of particle numbers.
+
+        @param particles - the particle to pass to Blender for each entry in particleNumbers
+        @returns (uvs, colors) as flat float32 arrays, or empty arrays for the layers which are not sampled
+    """
+    psys = pmod.particle_system
+    count = len(particleNumbers)
+    uvs = np.empty(0)
+    colors = np.empty(0)
+
+    if uvIndex != -1:
+        uvOnEmitter = psys.uv_on_emitter
+        uvs = np.fromiter(itertools.chain.from_iterable(uvOnEmitter(pmod, particle=p, particle_no=n, uv_no=uvIndex)
+                                                        for p, n in zip(particles, particleNumbers)),
+                          dtype=np.float32, count=2 * count)
+    if colorIndex != -1:
+        mcolOnEmitter = psys.mcol_on_emitter
+        colors = np.fromiter(itertools.chain.from_iterable(mcolOnEmitter(pmod, particle=p, particle_no=n, vcol_no=colorIndex)
+                                                           for p, n in zip(particles, particleNumbers)),
+                             dtype=np.float32, count=3 * count)
+    return uvs, colors
+
+
+def sampleEmitter(pmod: bpy.types.ParticleSystemModifier, firstExported: int, totalParticles: int, uvIndex: int, colorIndex: int):
+    """ Sample the emitter UVs and vertex colors at the roots of the exported particle range.
+
+        'Simple' children take their position on the emitter from their parent, so their UVs and colors
+        are sampled once per parent and scattered to the children using the parent indices read natively
+        from the particle system. All other cases are sampled per strand with the RNA calls hoisted out
+        of the loop.
+
+        @param uvIndex - index of the UV layer to sample, -1 to skip the UVs
+        @param colorIndex - index of the vertex color layer to sample, -1 to skip the colors
+        @returns (uvs, colors) as flat float32 arrays ( 2 and 3 floats per strand respectively )
+    """
+    if (uvIndex == -1 and colorIndex == -1) or (totalParticles <= firstExported):
+        return np.empty(0), np.empty(0)
+
+    psys = pmod.particle_system
+    particles = psys.particles[:]
+    parents = len(particles)
+
+    if firstExported >= parents and psys.settings.child_type == 'SIMPLE':
+        childParents = vray.getChildParticleParents(psys.as_pointer(), firstExported - parents, totalParticles - firstExported)
+
+        if (childParents is not None) and ((childParents >= 0) & (childParents < parents)).all():
+            uniqueParents, strandToParent = np.unique(childParents, return_inverse=True)
+            uvs, colors = _sampleParticles(pmod, [particles[p] for p in uniqueParents], uniqueParents.tolist(), uvIndex, colorIndex)
+            if uvIndex != -1:
+                uvs = uvs.reshape(-1, 2)[strandToParent].ravel()
+            if colorIndex != -1:
+                colors = colors.reshape(-1, 3)[strandToParent].ravel()
+            return uvs, colors
+
+    # The 'particle' argument is only used by Blender for the parent particles, but it is
+    # still required, so pass the same particle as the per-strand loop does.
+    particleNumbers = range(firstExported, totalParticles)
+    strandParticles = [particles[(n - parents) % parents] for n in particleNumbers]
+    return _sampleParticles(pmod, strandParticles, particleNumbers, uvIndex, colorIndex)
+
+
 class HairExporter(ExporterBase):
     def __init__(self, ctx: ExporterContext):
         super().__init__(ctx)
@@ -147,25 +210,9 @@ class HairExporter(ExporterBase):
                     activeLayerIndex = objMesh.vertex_colors.find(activeLayer.name)
 
         exportUVs = uvIndex != -1 and uvLayers[uvIndex].data
-        exportColors = activeLayerIndex != -1
-
-        uvs = np.empty(2*(totalParticles - firstExported), dtype=np.float32) if exportUVs else np.empty(0)
-        colors = np.empty(3*(totalParticles - firstExported), dtype=np.float32) if exportColors else np.empty(0)
-
-        i = 0
-        for pindex in range(firstExported, totalParticles):
-            particle = psys.particles[(pindex - parents) % parents]
-
-            if exportUVs:
-                uv = psys.uv_on_emitter(pmod, particle=particle, particle_no=pindex, uv_no=uvIndex)
-                uvs[i*2+0] = uv[0]
-                uvs[i*2+1] = uv[1]
-            if exportColors:
-                color = psys.mcol_on_emitter(pmod, particle=particle, particle_no=pindex, vcol_no=activeLayerIndex)
-                colors[i*3+0] = color[0]
-                colors[i*3+1] = color[1]
-                colors[i*3+2] = color[2]
-            i += 1
+
+        uvs, colors = sampleEmitter(pmod, firstExported, totalParticles,
+                                    uvIndex if exportUVs else -1, activeLayerIndex)
         data.uvs = uvs
         data.vertColors = colors
 
@@ -3,73 +3,139 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import bpy
-import ctypes
-import struct
+import numpy as np
 from collections import defaultdict
-from mathutils import Matrix
 
-from vray_blender.exporting import tools, marshaller
+from vray_blender import debug
+from vray_blender.exporting import tools
 from vray_blender.exporting.node_export import exportNodePlugin
 from vray_blender.exporting.plugin_tracker import getObjTrackId
 from vray_blender.lib.blender_utils import TestBreak
-from vray_blender.lib.defs import DataArray, ExporterBase, ExporterContext, AttrPlugin
+from vray_blender.lib.defs import ExporterBase, ExporterContext, AttrPlugin
 from vray_blender.lib.names import Names
 
 from vray_blender.bin import VRayBlenderLib as vray
 
 
-# Struct to pass to C++.
-# To avoid the hassle of unpacking Instancer objects in C++ using Python interop,
-# for the time being pack all the data to a single blob here.
-# TODO: Figure out whether doing this in C++ will be more convenient/fast.
-
 class InstancerData:
-    def __init__(self, name, frame, data, itemCount):
-        self.name   = name
-        self.frame  = frame
-        self.data   = data
+    """ Columnar instancer data passed to C++. The arrays are read in place by
+        the native exporter, so they should be C-contiguous and stay alive until
+        the export task completes (C++ keeps a reference to this object).
+    """
+    def __init__(self, name, frame, persistentIds, transforms, nodeIndices, nodeNames):
+        self.name           = name
+        self.frame          = frame
+        self.persistentIds  = persistentIds # int32[count, 8]
+        self.transforms     = transforms    # float32[count, 16], column-major 4x4 matrices
+        self.nodeIndices    = nodeIndices   # int32[count], indices into nodeNames
+        self.nodeNames      = nodeNames     # list[str], table of the instanced node plugin names
+
+    @property
+    def count(self):
+        return len(self.nodeIndices)
 
-        dataLen = len(self.data)
-        ptr = (ctypes.c_char * dataLen).from_buffer(self.data)
-        self.arr    = DataArray(ctypes.addressof(ptr), dataLen)
-        self.count  = itemCount
 
-
-# Temp collector for instance data, will be converted to InstanceData before 
-# passing it to C++
 class Instancer:
-    class Instance:
-        def __init__(self, persistentId):
-            self.persistentId   = persistentId
-            self.tm: Matrix     = None
-            self.nodePlugin     = ""
-
-        def pack(self):
-            m = marshaller.Marshaller()
-
-            m.dumpPersistentId(self.persistentId)
-            m.dumpMatrix4(self.tm)
-            m.dumpString(self.nodePlugin)
-
-            return m.pack()
-
+    """ Collects instance data in preallocated arrays, one row per instance.
+        The arrays grow geometrically, so adding an instance only costs a few array writes.
+    """
+    INITIAL_CAPACITY = 256
 
     def __init__(self, inst, name: str):
         self.obj    = inst.instance_object  # The object being instanced
         self.instancer = inst.parent        # The object whose geometry determines the position and number of instances
         self.name   = name
         self.frame  = 0
-        self._data = bytearray()
-        self._items: list[Instancer.Instance]  = []
+        self._count = 0
+
+        self._persistentIds = np.empty((__class__.INITIAL_CAPACITY, 8), dtype=np.int32)
+        self._matrices      = np.empty((__class__.INITIAL_CAPACITY, 4, 4), dtype=np.float32)
+        self._nodeIndices   = np.empty(__class__.INITIAL_CAPACITY, dtype=np.int32)
+
+        # String table for the names of the instanced node plugins. Usually, there are only
+        # a few distinct nodes per instancer, so the names are sent only once.
+        self._nodeNames: list[str] = []
+        self._nodeNameIndices: dict[str, int] = {}
+
+
+    def append(self, persistentId, tm, nodePlugin: str):
+        if self._count == len(self._nodeIndices):
+            self._grow()
+
+        if (nodeIndex := self._nodeNameIndices.get(nodePlugin)) is None:
+            nodeIndex = len(self._nodeNames)
+            self._nodeNameIndices[nodePlugin] = nodeIndex
+            self._nodeNames.append(nodePlugin)
+
+        i = self._count
+        self._persistentIds[i] = persistentId
+        self._matrices[i]      = tm
+        self._nodeIndices[i]   = nodeIndex
+        self._count += 1
+
 
+    def _grow(self):
+        capacity = 2 * len(self._nodeIndices)
 
-    def append(self, item):
-        self._items.append(item)
-        self._data.extend(item.pack())
+        def resized(arr: np.ndarray):
+            newArr = np.empty((capacity,) + arr.shape[1:], dtype=arr.dtype)
+            newArr[:self._count] = arr[:self._count]
+            return newArr
+
+        self._persistentIds = resized(self._persistentIds)
+        self._matrices      = resized(self._matrices)
+        self._nodeIndices   = resized(self._nodeIndices)
 
 
     def toData(self):
-        return InstancerData(self.name, self.frame, self._data, len(self._items))
+        count = self._count
+
+        # V-Ray expects column-major matrices (see tools.mat4x4ToTuple), transpose all of them at once.
+        transforms = np.ascontiguousarray(self._matrices[:count].transpose(0, 2, 1)).reshape(count, 16)
+
+        return InstancerData(self.name, self.frame,
+                             persistentIds = self._persistentIds[:count],
+                             transforms    = transforms,
+                             nodeIndices   = self._nodeIndices[:count],
+                             nodeNames     = list(self._nodeNames))
+
+
+class InstancerDelta:
+    """ The difference between two snapshots of the same instancer, matched by persistent_id """
+    def __init__(self, added = 0, removed = 0, transformed = 0):
+        self.added       = added
+        self.removed     = removed
+        self.transformed = transformed
+
+    def isEmpty(self):
+        return (self.added + self.removed + self.transformed) == 0
+
+    @staticmethod
+    def compute(prev: InstancerData, curr: InstancerData):
+        """ Match the instances of both snapshots by persistent_id and count the ones which have been
+            added, removed or whose transform or instanced node has changed.
+        """
+        def idKeys(data: InstancerData):
+            # View each 8-int persistent_id row as a single opaque value so that it can be used in set operations
+            return np.ascontiguousarray(data.persistentIds).view(np.dtype((np.void, data.persistentIds.itemsize * 8))).ravel()
+
+        prevKeys = idKeys(prev)
+        currKeys = idKeys(curr)
+
+        if (len(np.unique(currKeys)) != curr.count) or (len(np.unique(prevKeys)) != prev.count):
+            # Persistent ids are not unique, the instances cannot be matched
+            return InstancerDelta(added = curr.count, removed = prev.count)
+
+        _, prevIdx, currIdx = np.intersect1d(prevKeys, currKeys, assume_unique=True, return_indices=True)
+
+        prevNodes = np.asarray(prev.nodeNames, dtype=object)[prev.nodeIndices[prevIdx]]
+        currNodes = np.asarray(curr.nodeNames, dtype=object)[curr.nodeIndices[currIdx]]
+
+        changed = np.any(prev.transforms[prevIdx] != curr.transforms[currIdx], axis=1) | (prevNodes != currNodes)
+
+        return InstancerDelta(added       = curr.count - len(currIdx),
+                              removed     = prev.count - len(prevIdx),
+                              transformed = int(np.count_nonzero(changed)))
 
 
 class InstancerExporter(ExporterBase):
@@ -91,35 +157,34 @@ class InstancerExporter(ExporterBase):
             # controller objects for instanced collections
             return
         
+        idInstancer = instTrackIdOverride or getObjTrackId(instancerObj.original)
+        nameInstancer = nameOverride or Names.instancer(inst)
+
+        # There could be multiple instancers with the same id, but different names.
+        instancers = self.instancers[idInstancer]
+        if (instancer := instancers.get(nameInstancer)) is None:
+            instancer = instancers[nameInstancer] = Instancer(inst, nameInstancer)
+
         # The inst.persistent_id is used to uniquely identify each instance across frames
         # This allows V-Ray to track instances between frames for motion blur and other
         # frame-dependent effects. Without it, instances could get randomly reassigned
         # between frames, causing visual artifacts in animations.
-        instance = Instancer.Instance(inst.persistent_id)
-
-        # In VRay, instance transformation should be relative to the object being duplicated.
-        # Remove its component from the instance's world position.
-        instance.tm = inst.matrix_world
-
+        #
         # Pass the name of the exported node, for geometry nodes this will result in one Instancer2
         # instancing multiple different nodes. But we will still have one Instancer2 per scene object.
-        instance.nodePlugin = nodePluginName
-
-        idInstancer = instTrackIdOverride or getObjTrackId(instancerObj.original)
-        nameInstancer = nameOverride or Names.instancer(inst)
-        
-        # There could be multiple instancers with the same id, but different names.
-        instancer = self.instancers.setdefault(idInstancer, {}).setdefault(nameInstancer, Instancer(inst, nameInstancer))
-        instancer.append(instance)
+        instancer.append(inst.persistent_id, inst.matrix_world, nodePluginName)
 
 
     def export(self):
         # Export an Instancer2 plugin + a wrapper node for it
         for instancerId, instancers in self.instancers.items():
             for instancer in instancers.values():
-                vray.pluginCreate(self.renderer, instancer.name, 'Instancer2')
-                vray.exportInstancer(self.renderer, instancer.toData())
-                
+                data = instancer.toData()
+
+                if self._instancesChanged(instancerId, instancer, data):
+                    vray.pluginCreate(self.renderer, instancer.name, 'Instancer2')
+                    vray.exportInstancer(self.renderer, data)
+
                 # Track the Instancer2 plugin in both the instancer and the instanced_object
                 self.instTracker.trackPlugin(instancerId, instancer.name)
                 self.objTracker.trackPlugin(getObjTrackId(instancer.obj), instancer.name)
@@ -133,6 +198,39 @@ class InstancerExporter(ExporterBase):
                 TestBreak.check(self)
 
 
+    def _instancesChanged(self, instancerId, instancer: Instancer, data: InstancerData):
+        """ Compare the instance data with the one sent for the same Instancer2 plugin on the previous update
+            and return True if the plugin should be updated. Only used in interactive mode, the last sent table
+            is stored in the persisted state.
+        """
+        if not self.interactive:
+            return True
+
+        tables = self.persistedState.instancerTables
+        prev = tables.get(instancer.name)
+        tables[instancer.name] = (self.currentFrame, data)
+
+        if self.fullExport or (prev is None):
+            return True
+
+        prevFrame, prevData = prev
+
+        # The plugin may have been removed by the pruning of one of the objects it is tracked in
+        if not self.instTracker.hasPlugin(instancerId, instancer.name) \
+                or not self.objTracker.hasPlugin(getObjTrackId(instancer.obj), instancer.name):
+            return True
+
+        if prevFrame != self.currentFrame:
+            return True
+
+        delta = InstancerDelta.compute(prevData, data)
+        if delta.isEmpty():
+            return False
+
+        debug.printDebug(f"Instancer {instancer.name}: {delta.added} added, {delta.removed} removed, {delta.transformed} transformed")
+        return True
+
+
     @staticmethod
     def pruneInstances(exporterCtx: ExporterContext):
         """ Remove plugins associated with instanced objects.
@@ -145,6 +243,7 @@ class InstancerExporter(ExporterBase):
         def removeInstancer(instancerTrackId):
             for pluginName in instTracker.getOwnedPlugins(instancerTrackId):
                 vray.pluginRemove(exporterCtx.renderer, pluginName)
+                exporterCtx.persistedState.instancerTables.pop(pluginName, None)
         
             instTracker.forget(instancerTrackId) 
 
@@ -434,7 +434,7 @@ class LightExporter(ExporterBase):
         else:
             pluginDesc.setAttribute("transform", obj.matrix_world)
 
-        pluginDesc.setAttribute("scene_name", [light.name, getSceneNameOfObject(obj, self.dg.scene)])
+        pluginDesc.setAttribute("scene_name", [light.name, self.sceneMetadata.getScenePath(obj)])
 
         # Export a LightSelect render channel for this light, if necessary.
         self._exportIndividualLightInLightMix(obj, pluginDesc)
@@ -536,6 +536,8 @@ class LightExporter(ExporterBase):
 
         removedObjectIds = self.objTracker.diff(activeObjectIds)
         self._pruneObjectPlugins(removedObjectIds)
+        for objId in removedObjectIds:
+            self.sceneMetadata.forget(objId)
 
         # Remove from VRay the light trees for objects that have been removed from the scene or orphaned
         removedLightNodeIds = self.nodeTracker.diffObjs(activeLightIds)
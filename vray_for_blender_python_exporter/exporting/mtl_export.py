@@ -18,32 +18,25 @@ def getMtlTopologyUpdates():
     return {t[0] for t in topologyUpdates}
 
 
-def _getMtlsOfTextures(textureNames: list[str]):
-        """ Return the materials in whose node trees the texture names are used.
+def _getMtlsOfTextures(exporterCtx: ExporterContext, textureTrackIds: list[int]):
+    """ Return the track IDs of the materials in whose node trees the textures are used.
 
-          NOTE: This is hackish, but for the moment we don't know how to make Blender generate 
-          depsgraph updates for the node tree.
+        NOTE: This is hackish, but for the moment we don't know how to make Blender generate 
+        depsgraph updates for the node tree.
     """
-        result = set()
-
-        for mtl in [m for m in bpy.data.materials if hasattr(m, 'vray') and m.node_tree]:
-            for n in mtl.node_tree.nodes:
-                if (texture := getattr(n, 'texture', None)) and (texture.name in textureNames):
-                    result.add(mtl)
-
-        return result
+    dependencies = exporterCtx.persistedState.crossDependencies
+    return {mtlId for textureTrackId in textureTrackIds for mtlId in dependencies.getTextureMtls(textureTrackId)}
 
 
 def _tagForUpdateMtlWithSelectorNode(exporterCtx: ExporterContext):
     """ Tag for update object's material if it has and object selector node,
         referencing object with updated transform
     """
-    for mtl in [m for m in bpy.data.materials if m.node_tree]:
-        for node in mtl.node_tree.nodes:
-            if node.bl_idname == "VRayNodeSelectObject":
-                if node.objectPtr and (node.objectPtr.original.session_uid in exporterCtx.dgUpdates['transform']):
-                    UpdateTracker.tagUpdate(mtl, UpdateTarget.MATERIAL, UpdateFlags.DATA)
-                    break
+    dependencies = exporterCtx.persistedState.crossDependencies
+
+    for objTrackId in exporterCtx.dgUpdates['transform']:
+        for mtlId in dependencies.getSelectorMtls(objTrackId):
+            UpdateTracker.tagUpdateById(mtlId, UpdateTarget.MATERIAL, UpdateFlags.DATA)
 
 
 def syncMtlExportCache(exporterCtx: ExporterContext):
@@ -61,8 +54,8 @@ def syncMtlExportCache(exporterCtx: ExporterContext):
         mtlTaggedUpdates = {m[0] for m in UpdateTracker.getUpdatesOfType(UpdateTarget.MATERIAL, UpdateFlags.ALL)}
 
         updates = (u.id.original for u in exporterCtx.dg.updates if u.is_updated_geometry or u.is_updated_shading or u.is_updated_transform)
-        updatedTextures = [t.name for t in updates if isinstance(t, bpy.types.Texture)]
-        mtlsWithUpdatedTextures = _getMtlsOfTextures(updatedTextures)
+        updatedTextures = [getObjTrackId(t) for t in updates if isinstance(t, bpy.types.Texture)]
+        mtlsWithUpdatedTextures = _getMtlsOfTextures(exporterCtx, updatedTextures)
 
         # Get the materials that had their entire V-Ray node trees deleted. The update record for them will be just
         # an update to the node tree without any of the update flags set. If the update list also includes a record
@@ -83,8 +76,8 @@ def syncMtlExportCache(exporterCtx: ExporterContext):
                                                         getObjTrackId(m) in exporterCtx.dgUpdates['all'] or \
                                                         (m.use_nodes and getObjTrackId(m.node_tree) in exporterCtx.dgUpdates['all'])}
 
-        updatedMtls = updatedMtls.union(mtlsWithRemovedNodeTrees).union(mtlsWithUpdatedTextures)
-        updatedMtlIDs = [getObjTrackId(mtl) for mtl in updatedMtls]
+        updatedMtls = updatedMtls.union(mtlsWithRemovedNodeTrees)
+        updatedMtlIDs = mtlsWithUpdatedTextures.union(getObjTrackId(mtl) for mtl in updatedMtls)
 
         for mtlId in (exporterCtx.exportedMtls.keys() & updatedMtlIDs):
             del exporterCtx.exportedMtls[mtlId]
@@ -140,6 +133,24 @@ class MtlExporter(ExporterBase):
         assert mtl.use_nodes and mtl.node_tree, f"Material has no node tree: {mtl.name}"
 
         isConversion = (nodeCtx is not None)
+
+        # Reuse the plugins already in the renderer if nothing in the material has changed since its last export
+        fingerprint = None
+        if not (isConversion or self.preview):
+            mtlFingerprints = self.persistedState.mtlFingerprints
+            dgUpdates = self.dgUpdates.get('all', ())
+
+            if (mtlId in dgUpdates) or (getObjTrackId(mtl.node_tree) in dgUpdates):
+                # The depsgraph reports a change of the material, there is no point in hashing it.
+                # It will be hashed again the next time it is exported without being changed.
+                mtlFingerprints.forget(mtlId)
+            else:
+                fingerprint = self.ts.timeThis("hash_material", lambda: getMtlFingerprint(self, mtl))
+
+                if (mtlPlugin := mtlFingerprints.check(mtlId, fingerprint)) is not None:
+                    self.exportedMtls[mtlId] = mtlPlugin
+                    return mtlPlugin, SceneStats()
+
         if nodeCtx is None:
             nodeCtx = NodeContext(self, bpy.context.scene, bpy.data, self.renderer)
             nodeCtx.rootObj     = mtl
@@ -165,6 +176,7 @@ class MtlExporter(ExporterBase):
 
                 defaultMtlPlugin = MtlExporter.exportDefaultMaterial(self)
                 self.exportedMtls[mtlId] = defaultMtlPlugin
+                self.persistedState.mtlFingerprints.forget(mtlId)
                 return defaultMtlPlugin, SceneStats()
 
             with nodeCtx.push(outputNode):
@@ -182,6 +194,9 @@ class MtlExporter(ExporterBase):
                     self.exportedMtls[mtlId] = singleBRDFMtl
                     nodeCtx.cacheNodePlugin(outputNode, singleBRDFMtl)
 
+                    if fingerprint is not None:
+                        self.persistedState.mtlFingerprints.record(mtlId, fingerprint, singleBRDFMtl, nodeCtx.stats.plugins)
+
         return singleBRDFMtl, nodeCtx.stats
 
 
@@ -308,6 +323,8 @@ class MtlExporter(ExporterBase):
                     trackerLog(f"REMOVE NODE PLUGIN: {pluginName}")
                 self.nodeTracker.forgetNode(mtlId, nodeId)
 
+             self.persistedState.mtlFingerprints.forget(mtlId)
+
         # Remove from VRay the materials whose node trees' topology has changed.They will be
         # fully re-exported during the current update cycle
         if self.fullExport:
@@ -9,7 +9,7 @@ from vray_blender.lib import export_utils, lib_utils
 from vray_blender.lib.attribute_types import CompatibleNonVrayNodes
 from vray_blender.lib.names import Names
 from vray_blender.plugins import PLUGIN_MODULES, getPluginModule
-from vray_blender.exporting.plugin_tracker import TrackNode, getNodeTrackId, getObjTrackId
+from vray_blender.exporting.plugin_tracker import TrackNode, getNodeTrackId, getObjTrackId, PLUGIN_TYPE_NODE
 from vray_blender.exporting.node_exporters.material_node_export import exportVRayNodeBRDFBump, exportVRayNodeMtlMulti, exportVRayNodeShaderScript
 from vray_blender.exporting.node_exporters.uvw_node_export import exportVRayNodeUVWGenRandomizer, exportVRayNodeUVWMapping
 from vray_blender.nodes.tools import getLinkInfo, isVrayNode, isVraySocket, isCompatibleNode
@@ -385,12 +385,9 @@ def fillNodePluginDesc(exporterCtx: ExporterContext,
     nodeDesc.setAttribute("transform", transform)
 
     nodeDesc.setAttribute("objectID", obj.pass_index)
+    sceneMetadata = exporterCtx.sceneMetadata
     if exporterCtx.commonSettings.useMotionBlur:
-        objProperties = obj.vray.VRayObjectProperties
-        if objProperties.override_motion_blur_samples:
-            nodeDesc.setAttribute("nsamples", objProperties.motion_blur_samples)
-        else:
-            nodeDesc.setAttribute("nsamples", exporterCtx.commonSettings.mbSamples)
+        nodeDesc.setAttribute("nsamples", sceneMetadata.getMotionBlurSamples(obj, exporterCtx.commonSettings.mbSamples))
 
     if geomPlugin:
         # In the instancer case, geomPlugin is the instancer plugin
@@ -398,10 +395,9 @@ def fillNodePluginDesc(exporterCtx: ExporterContext,
         scenePath = f"scene/{geomPlugin.name}"
     else:
         sceneName = obj.name
-        scene = exporterCtx.dg.scene
-        scenePath = getSceneNameOfObject(obj, scene)
+        scenePath = sceneMetadata.getScenePath(obj)
     nodeDesc.setAttribute("scene_name", [sceneName, scenePath])
-    if userAttributes := obj.vray.UserAttributes.getAsString():
+    if userAttributes := sceneMetadata.getUserAttributes(obj):
         nodeDesc.setAttribute('user_attributes', userAttributes)
 
 
@@ -449,7 +445,7 @@ def exportNodePlugin(exporterCtx: ExporterContext,
 
         nodePlugin = export_utils.exportPlugin(exporterCtx, nodeDesc)
 
-        objTracker.trackPlugin(getObjTrackId(obj), nodePlugin.name, isInstance)
+        objTracker.trackPlugin(getObjTrackId(obj), nodePlugin.name, isInstance, pluginType=PLUGIN_TYPE_NODE)
 
         return nodePlugin
 
@@ -720,3 +716,181 @@ def _exportColorToUVWConverter(nodeCtx: NodeContext, fromPlugin: AttrPlugin):
     plDesc.attrs['uvw'] = fromPlugin
 
     return exportPluginWithStats(nodeCtx, plDesc)
+
+
+# Properties of the Node and NodeSocket base classes which are not relevant to the export,
+# e.g. position in the editor or selection state. Filled on first use.
+_NODE_BASE_PROPS: set[str] = set()
+_SOCKET_BASE_PROPS: set[str] = set()
+
+# Properties of the V-Ray nodes and sockets which are fixed for the class or only used by the UI
+_VRAY_NODE_STATIC_PROPS = ('vray_type', 'vray_plugin')
+_VRAY_SOCKET_STATIC_PROPS = ('vray_attr', 'vray_plugin', 'vray_socket_base_type', 'nest_level', 'ui_enabled', 'is_open')
+
+# Nodes exported by the dedicated functions in _exportVRayNodeImpl(). The export code of these nodes
+# may read any property of their plugin property groups.
+_CUSTOM_EXPORT_NODES = {
+    "VRayNodeBRDFBump", "VRayNodeMtlOSL", "VRayNodeMtlMulti", "VRayPluginListHolder", "VRayNodeSelectObject",
+    "VRayNodeMultiSelect", "VRayNodeSelectObjectGeometry", "VRayNodeUVWGenRandomizer", "VRayNodeUVWMapping",
+    "VRayNodeTexVectorProduct", "VRayNodeTransform", "VRayNodeMatrix", "VRayNodeVector"
+}
+
+# Limit for the nesting of property groups followed by the fingerprint
+_FINGERPRINT_MAX_DEPTH = 4
+
+# The names of the properties included in the fingerprint, per RNA class. Filled on first use of each class.
+_FINGERPRINT_CLASS_PROPS: dict[str, tuple[str]] = {}
+
+
+class _MtlFingerprint:
+    """ Collects the values which determine the plugins exported for a material node tree """
+
+    def __init__(self, exporterCtx: ExporterContext):
+        self.exporterCtx = exporterCtx
+        self.items = []
+        self.visitedTrees = set()
+
+
+    def addMaterial(self, mtl: bpy.types.Material):
+        self.items.append(mtl.name)
+        self.addStruct(mtl.vray, 0)
+        self.addNodeTree(mtl.node_tree)
+
+
+    def addNodeTree(self, ntree: bpy.types.NodeTree):
+        self.items.append(('NT', ntree.name))
+
+        if (treeId := getObjTrackId(ntree)) in self.visitedTrees:
+            return
+        self.visitedTrees.add(treeId)
+
+        for node in ntree.nodes:
+            self.addNode(node)
+
+            for sock in node.inputs:
+                self.items.append((sock.identifier, sock.is_linked, sock.enabled))
+                self.addStruct(sock, 0)
+
+        for link in ntree.links:
+            self.items.append((link.from_node.name, link.from_socket.identifier,
+                               link.to_node.name, link.to_socket.identifier, link.is_muted, link.is_valid))
+
+
+    def addNode(self, node: bpy.types.Node):
+        self.items.append((node.bl_idname, node.name, node.mute))
+
+        for propName in _getFingerprintProps(node):
+            value = getattr(node, propName, None)
+
+            if (propName in PLUGIN_MODULES) and _hasGenericExport(node, propName):
+                # The property group of a plugin exported by exportPluginParams(). Only the parameters
+                # read by it and the values of the sockets affect the exported plugin.
+                for attrName in export_utils.getPropGroupExportedAttrs(self.exporterCtx, propName):
+                    self.addValue(getattr(value, attrName, None), 1)
+            else:
+                self.addValue(value, 0)
+
+
+    def addStruct(self, struct: bpy.types.bpy_struct, depth: int):
+        if depth > _FINGERPRINT_MAX_DEPTH:
+            return
+
+        for propName in _getFingerprintProps(struct):
+            self.addValue(getattr(struct, propName, None), depth)
+
+
+    def addValue(self, value, depth: int):
+        match value:
+            case None | bool() | int() | float():
+                self.items.append(value)
+            case str():
+                self.items.append(value)
+                # String properties may reference scene objects by name
+                if obj := self.exporterCtx.sceneObjects.get(value):
+                    self.addID(obj)
+            case bpy.types.ID():
+                self.addID(value)
+            case bpy.types.PropertyGroup() | bpy.types.bpy_struct():
+                self.addStruct(value, depth + 1)
+            case bpy.types.bpy_prop_collection():
+                for item in value:
+                    self.addValue(item, depth + 1)
+            case set():
+                self.items.append(tuple(sorted(value)))
+            case _:
+                self.items.append(_toHashable(value))
+
+
+    def addID(self, id: bpy.types.ID):
+        match id:
+            case bpy.types.Object():
+                self.items.append(('OB', id.name, _toHashable(id.matrix_world)))
+
+                dgUpdates = self.exporterCtx.dgUpdates
+                if (getObjTrackId(id) in dgUpdates.get('geometry', ())) or \
+                        (id.data and (getObjTrackId(id.data) in dgUpdates.get('all', ()))):
+                    # The geometry or data of the referenced object has been updated
+                    self.items.append(object())
+            case bpy.types.NodeTree():
+                self.addNodeTree(id)
+            case _:
+                self.items.append((id.id_type, id.name))
+
+                if getObjTrackId(id) in self.exporterCtx.dgUpdates.get('all', ()):
+                    # The referenced data block has been updated. Make sure the fingerprint will not match.
+                    self.items.append(object())
+
+                if isinstance(id, bpy.types.Image) and (id.source in ('SEQUENCE', 'MOVIE')):
+                    self.items.append(self.exporterCtx.currentFrame)
+
+
+def _getFingerprintProps(struct: bpy.types.bpy_struct):
+    """ Return the names of the properties of a struct included in the fingerprint """
+    rna = struct.bl_rna
+    if (propNames := _FINGERPRINT_CLASS_PROPS.get(rna.identifier)) is None:
+        match struct:
+            case bpy.types.Node():
+                skippedProps = _NODE_BASE_PROPS.union(_VRAY_NODE_STATIC_PROPS)
+            case bpy.types.NodeSocket():
+                skippedProps = _SOCKET_BASE_PROPS.union(_VRAY_SOCKET_STATIC_PROPS)
+            case _:
+                skippedProps = ()
+        propNames = tuple(p.identifier for p in rna.properties if (p.identifier != 'rna_type') and (p.identifier not in skippedProps))
+        _FINGERPRINT_CLASS_PROPS[rna.identifier] = propNames
+
+    return propNames
+
+
+def _hasGenericExport(node: bpy.types.Node, pluginType: str):
+    """ Return True if the plugin of the node is exported only by exportNodeTree() and exportPluginParams() """
+    pluginModule = PLUGIN_MODULES[pluginType]
+    return (node.bl_idname not in _CUSTOM_EXPORT_NODES) and \
+        not (hasattr(pluginModule, 'exportTreeNode') or hasattr(pluginModule, 'exportCustom'))
+
+
+def _toHashable(value):
+    """ Convert arrays, vectors and matrices to (nested) tuples """
+    if isinstance(value, str):
+        return value
+    try:
+        return tuple(_toHashable(v) for v in value)
+    except TypeError:
+        return value if value.__hash__ else repr(value)
+
+
+def getMtlFingerprint(exporterCtx: ExporterContext, mtl: bpy.types.Material):
+    """ Compute a fingerprint of the material node tree.
+
+        The fingerprint covers the topology of the tree, the property and socket values of the nodes
+        and the state of the referenced data blocks. For plugins exported without custom code, only
+        the plugin parameters read by the export are included. Two equal fingerprints mean that the
+        export of the material will produce the same plugins.
+    """
+    if not _NODE_BASE_PROPS:
+        _NODE_BASE_PROPS.update(p.identifier for p in bpy.types.Node.bl_rna.properties)
+        _SOCKET_BASE_PROPS.update(p.identifier for p in bpy.types.NodeSocket.bl_rna.properties)
+
+    fingerprint = _MtlFingerprint(exporterCtx)
+    fingerprint.addMaterial(mtl)
+
+    return hash(tuple(fingerprint.items))
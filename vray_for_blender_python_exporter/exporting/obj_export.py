@@ -4,6 +4,7 @@
 
 import bpy
 import numpy as np
+from enum import IntFlag
 
 from vray_blender.engine.renderer_ipr_viewport import VRayRendererIprViewport
 from vray_blender.engine.renderer_ipr_vfb import VRayRendererIprVfb
@@ -15,7 +16,7 @@ from vray_blender.exporting.instancer_export import InstancerExporter
 from vray_blender.exporting.mtl_export import getMtlTopologyUpdates
 from vray_blender.exporting.node_export import exportNodePlugin, fillNodePluginDesc
 from vray_blender.exporting.node_exporters.geometry_node_export import exportVRayNodeDisplacement
-from vray_blender.exporting.plugin_tracker import getObjTrackId, log as trackerLog
+from vray_blender.exporting.plugin_tracker import getObjTrackId, log as trackerLog, PLUGIN_TYPE_NODE, PLUGIN_TYPE_PHX_SHADER_SIM, PLUGIN_TYPE_VRAY_DECAL
 from vray_blender.exporting.update_tracker import UpdateFlags, UpdateTarget, UpdateTracker
 from vray_blender.lib.blender_utils import geometryObjectIt, TestBreak, NonGeometryTypes, isMaterialAssignedToObject
 from vray_blender.lib.defs import AttrPlugin, AttrDataLayer, DataArray, ExporterBase, ExporterContext, PluginDesc
@@ -26,7 +27,7 @@ from vray_blender.bin import VRayBlenderLib as vray
 from vray_blender.nodes import utils as NodesUtils
 from vray_blender.nodes.specials.selector import resolveSelectorNode
 from vray_blender.plugins.geometry.GeomHair import getGeomHairPluginName
-from vray_blender.plugins.geometry.VRayDecal import isPluginVRayDecal, getVRayDecalPluginName
+from vray_blender.plugins.geometry.VRayDecal import getVRayDecalPluginName
 
 from vray_blender.exporting.node_export import *
 from vray_blender.exporting.plugin_tracker import TrackObj
@@ -83,6 +84,29 @@ class PointCloudData:
 
 
 
+class ExportDecision(IntFlag):
+    """ Per-object reasons for (re-)exporting an object in an interactive update. The flags of all objects
+        are computed once per export by GeometryExporter._buildExportDecisions().
+    """
+    NONE                = 0
+    TRANSFORM           = 1 << 0    # Transform or parent updated
+    VISIBILITY          = 1 << 1    # Visibility changed
+    NODE_TREE           = 1 << 2    # The "OBJECT" node tree has been updated
+    MTL_OPTIONS         = 1 << 3    # Object material options have been updated
+    MESH_LIGHT_GIZMO    = 1 << 4    # Gizmo of an active LightMesh
+    MESH_LIGHT_UPDATED  = 1 << 5    # Gizmo of an updated or disconnected LightMesh
+    FUR_GIZMO_UPDATED   = 1 << 6    # Gizmo of an updated or disconnected VRayFur
+    ENV_FOG_GIZMO       = 1 << 7    # Gizmo of an active EnvironmentFog
+    ENV_FOG_ADDED       = 1 << 8    # Became an EnvironmentFog gizmo in this update
+    ENV_FOG_REMOVED     = 1 << 9    # Stopped being an EnvironmentFog gizmo in this update
+
+    # Any of these flags requires the object to be re-exported
+    REEXPORT = TRANSFORM | VISIBILITY | NODE_TREE | MTL_OPTIONS | MESH_LIGHT_UPDATED | FUR_GIZMO_UPDATED | ENV_FOG_ADDED | ENV_FOG_REMOVED
+
+    # No Node plugin is exported for gizmo objects
+    GIZMO = MESH_LIGHT_GIZMO | ENV_FOG_GIZMO
+
+
 class GeometryExporter(ExporterBase):
     """ Export all geometry objects in a depsgraph """
 
@@ -112,8 +136,16 @@ class GeometryExporter(ExporterBase):
 
         self.updatedFurGizmos = set()
 
+        # objTrackId => ExportDecision flags ( as int ). Objects without any flags are not in the index.
+        self.exportDecisions: dict[int, int] = {}
+
+        # Mesh data name => [object, number of pending export tasks] for the temporary meshes whose
+        # geometry is being exported asynchronously. See _releaseExportedMeshes().
+        self.pendingTempMeshes: dict[str, list] = {}
+
     def export(self):
         if self.preview:
+            self._buildExportDecisions()
             self._exportPreview()
         else:
             # The list of updated light gizmos includes objects that have been updated and objects that were previously
@@ -125,6 +157,7 @@ class GeometryExporter(ExporterBase):
             self.updatedFurGizmos = {p.gizmoObjTrackId for p in self.updatedFurInfo}.union(disconnectedFurGizmos)
 
             self._calculateGizmoStates()
+            self.ts.timeThis("Build export decisions", lambda: self._buildExportDecisions())
 
             self._exportScene()
 
@@ -375,9 +408,7 @@ class GeometryExporter(ExporterBase):
             self._exportParticleSystems(evaluatedObj, exportMesh)
 
         objTrackId = getObjTrackId(evaluatedObj)
-        isMeshLightGizmo = objTrackId in {p.gizmoObjTrackId for p in self.activeMeshLightsInfo}
-        isEnvFogGizmo = objTrackId in self.activeGizmos
-        isGizmo = isMeshLightGizmo or isEnvFogGizmo
+        isGizmo = bool(self.exportDecisions.get(objTrackId, 0) & ExportDecision.GIZMO)
 
         # Export node
         nodePlugin = None
@@ -428,6 +459,7 @@ class GeometryExporter(ExporterBase):
                 # evaluated depsgraph are empty. We only need to re-export the instance data in this case.
                 return AttrPlugin(meshDataName)
             elif self.persistedState.objDataTracker.popData(meshDataName):
+                self.persistedState.geomFingerprints.forget(meshDataName)
                 # Geometry plugin previously existed for this object but is now invalid,
                 # so return an empty plugin to clear the geometry from the V-Ray Node plugin,
                 # effectively hiding any old geometry.
@@ -450,15 +482,35 @@ class GeometryExporter(ExporterBase):
         meshData = self._fillMeshData(evaluatedObj, mesh, meshDataName, isInstanced)
         self._applyMeshModifiers(evaluatedObj, meshData)
 
-        vray.pluginCreate(self.renderer, meshDataName, "GeomStaticMesh")
-        vray.exportGeometry(self.renderer, meshData, asyncExport)
-        self.objTracker.trackPlugin(getObjTrackId(evaluatedObj), meshDataName, isInstanced)
+        objTrackId = getObjTrackId(evaluatedObj)
+
+        if not self._isMeshDataUnchanged(objTrackId, meshData):
+            vray.pluginCreate(self.renderer, meshDataName, "GeomStaticMesh")
+            vray.exportGeometry(self.renderer, meshData, asyncExport)
+
+            if asyncExport and (mesh != evaluatedObj.data):
+                pending = self.pendingTempMeshes.setdefault(meshDataName, [evaluatedObj, 0])
+                pending[1] += 1
+
+        self.objTracker.trackPlugin(objTrackId, meshDataName, isInstanced)
 
         self.persistedState.objDataTracker.trackPluginOfData(meshDataName, meshDataName)
 
         return AttrPlugin(meshDataName)
 
 
+    def _isMeshDataUnchanged(self, objTrackId: int, meshData: MeshData):
+        """ Return True if the renderer already holds a geometry plugin with the same contents as meshData """
+        fingerprints = self.persistedState.geomFingerprints
+
+        if not self.objTracker.hasPlugin(objTrackId, meshData.name):
+            # The plugin has been removed or has never been exported for this object
+            fingerprints.forget(meshData.name)
+
+        fingerprint, dataSize = self.ts.timeThis("hash_mesh_data", lambda: vray.hashMeshData(meshData))
+        return fingerprints.checkAndUpdate(meshData.name, fingerprint, dataSize)
+
+
     # Export a MESH object to VRayScene plugin
     def _exportVrayScene(self, obj: bpy.types.Object, isVisible: bool, instance):
         assert obj.is_evaluated, f"Evaluated object expected: {obj.name}"
@@ -561,7 +613,7 @@ class GeometryExporter(ExporterBase):
             pluginDesc.vrayPropGroup = obj.data.vray.VRayDecal
             export_utils.exportPlugin(self, pluginDesc)
 
-        self.objTracker.trackPlugin(objTrackId, pluginName)
+        self.objTracker.trackPlugin(objTrackId, pluginName, pluginType=PLUGIN_TYPE_VRAY_DECAL)
 
     def _exportCurves(self, obj: bpy.types.Object, exportGeometry: bool, isVisible: bool, instance: bpy.types.DepsgraphObjectInstance = None):
         assert obj.is_evaluated, f"Evaluated object expected: {obj.name}"
@@ -674,6 +726,7 @@ class GeometryExporter(ExporterBase):
 
             self.furExporter.exportFursOfObject(obj)
             self.exportProgress.update(self.engine)
+            self._releaseExportedMeshes()
 
         # Block here, wait for all geoemtry to be exported and release all temp meshes before
         # iterating the scene for instance export. Not doing so will cause crashes.
@@ -682,6 +735,23 @@ class GeometryExporter(ExporterBase):
         for obj in self.objectsWithTempMeshes:
             obj.to_mesh_clear()
         self.objectsWithTempMeshes.clear()
+        self.pendingTempMeshes.clear()
+
+
+    def _releaseExportedMeshes(self):
+        """ Free the temporary meshes whose geometry has already been serialized by the exporter instead
+            of holding all of them until finishExport(). The objects stay in objectsWithTempMeshes,
+            calling to_mesh_clear() for an object without a temporary mesh does nothing.
+        """
+        for name in vray.popCompletedMeshes(self.renderer):
+            if (pending := self.pendingTempMeshes.get(name)) is None:
+                continue
+
+            pending[1] -= 1
+            if pending[1] == 0:
+                del self.pendingTempMeshes[name]
+                pending[0].to_mesh_clear()
+
 
     def _exportObject(self,
                       evaluatedObj: bpy.types.Object,
@@ -705,14 +775,7 @@ class GeometryExporter(ExporterBase):
 
         if (not self.fullExport) \
                 and not exportGeometry \
-                and objTrackId not in self.dgUpdates['transform'] \
-                and not export_utils.isObjectTreeUpdated(self, evaluatedObj) \
-                and (objTrackId not in self.objectsWithUpdatedVisibility) \
-                and (objTrackId not in self.updatedMeshLightGizmos) \
-                and (objTrackId not in self.updatedFurGizmos) \
-                and (UpdateFlags.NONE == UpdateTracker.getObjUpdate(UpdateTarget.OBJECT_MTL_OPTIONS, evaluatedObj)) \
-                and (objTrackId not in self.addedGizmos) \
-                and (objTrackId not in self.removedGizmos) \
+                and not (self.exportDecisions.get(objTrackId, 0) & ExportDecision.REEXPORT) \
                 and instance is None:
             return False
 
@@ -946,16 +1009,16 @@ class GeometryExporter(ExporterBase):
         assert(self.interactive)
 
         # LIGHT objects are tracked by the LightExporter
-        objectIds = set()
-        psysIds = set()
+        self.objTracker.beginSync()
+        self.modTracker.beginSync()
         for obj in self.allObjects:
             if obj.type != 'LIGHT':
-                objectIds.add(getObjTrackId(obj))
+                self.objTracker.markPresent(getObjTrackId(obj))
 
                 for psys in obj.particle_systems:
-                    psysIds.add(getObjTrackId(psys.settings))
+                    self.modTracker.markPresent(getObjTrackId(psys.settings))
 
-        diff = self.objTracker.diff(objectIds)
+        diff = self.objTracker.getRemoved()
         for objTrackId in diff:
             self._forgetObjNodes(objTrackId)
 
@@ -966,8 +1029,10 @@ class GeometryExporter(ExporterBase):
 
             for pluginName in self.instTracker.getOwnedPlugins(objTrackId):
                 vray.pluginRemove(self.renderer, pluginName)
+                self.persistedState.instancerTables.pop(pluginName, None)
                 trackerLog(f"REMOVE: {objTrackId} => {pluginName}")
             self.instTracker.forget(objTrackId)
+            self.sceneMetadata.forget(objTrackId)
 
         # Remove the material options plugins associated with the updated objects
         mtlOptionsUpdates = UpdateTracker.getUpdatesOfType(UpdateTarget.OBJECT_MTL_OPTIONS, UpdateFlags.TOPOLOGY)
@@ -983,7 +1048,7 @@ class GeometryExporter(ExporterBase):
 
         self.furExporter.purgeFurInfo()
 
-        diff = self.modTracker.diff(psysIds)
+        diff = self.modTracker.getRemoved()
         for psysTrackId in diff:
             for pluginName in self.modTracker.getOwnedPlugins(psysTrackId):
                 vray.pluginRemove(self.renderer, pluginName)
@@ -1016,6 +1081,17 @@ class GeometryExporter(ExporterBase):
             if isObjectVisible(self, o) and isVisibleInLocalView(o, self.dg, localView)
         }
 
+        # The visibility updates are collected and sent in one batch per attribute
+        visibleAttrUpdates = ([], [])   # Node plugins: (names, flags)
+        enabledAttrUpdates = ([], [])   # PhxShaderSim and VRayDecal plugins: (names, flags)
+        updatesByType = {
+            PLUGIN_TYPE_NODE:           visibleAttrUpdates,
+            PLUGIN_TYPE_PHX_SHADER_SIM: enabledAttrUpdates,
+            PLUGIN_TYPE_VRAY_DECAL:     enabledAttrUpdates
+        }
+
+        objTracker = self.objTracker
+
         for o in [obj for obj in self.sceneObjects if obj.type in tools.EXPORTED_OBJECT_TYPES or obj.is_instancer]:
             objTrackId = getObjTrackId(o)
 
@@ -1030,19 +1106,16 @@ class GeometryExporter(ExporterBase):
                 
                 self.furExporter.syncVisibility(o, isShown)
 
-                for pluginName in self.objTracker.getPlugins(objTrackId):
-                    # TODO: Checking for names is error-prone, but we might not know the types of
-                    # all plugins if they were exported in C++. Make C++ return the types
-                    # of the exported plugins and track plugin type as well, so that here
-                    # we could search by plugin type
-                    isInstanced = self.objTracker.getPluginInstanced(pluginName)
-                    if pluginName.startswith("node@"):
-                        plugin_utils.updateValue(self.renderer, pluginName, "visible", isShown and not isInstanced)
-                        trackerLog(f"{'SHOW' if isShown else 'HIDE'} : {objTrackId} => {pluginName}")
-                    elif pluginName.endswith("@PhxShaderSim") or isPluginVRayDecal(pluginName):
-                        plugin_utils.updateValue(self.renderer, pluginName, "enabled", isShown and not isInstanced)
+                for pluginName in objTracker.getPlugins(objTrackId):
+                    if (updates := updatesByType.get(objTracker.getPluginType(pluginName))) is not None:
+                        updates[0].append(pluginName)
+                        updates[1].append(isShown and not objTracker.getPluginInstanced(pluginName))
                         trackerLog(f"{'SHOW' if isShown else 'HIDE'} : {objTrackId} => {pluginName}")
 
+        for attrName, (pluginNames, flags) in (("visible", visibleAttrUpdates), ("enabled", enabledAttrUpdates)):
+            if pluginNames:
+                vray.pluginUpdateVisibility(self.renderer, attrName, pluginNames, flags)
+
         # Some objects may be referenced by multiple users, that is why
         # visibility in the tracker cannot be changed while syncing above
 
@@ -1086,6 +1159,62 @@ class GeometryExporter(ExporterBase):
         self.activeGizmos.update(activeGizmos)
 
 
+    def _buildExportDecisions(self):
+        """ Build the per-object export decision index for the current export. Must be called after
+            the visibility and the gizmo states have been calculated.
+        """
+        decisions = self.exportDecisions
+        decisions.clear()
+
+        def tag(objTrackIds, flag: ExportDecision):
+            flag = int(flag)
+            for objTrackId in objTrackIds:
+                decisions[objTrackId] = decisions.get(objTrackId, 0) | flag
+
+        tag(self.dgUpdates.get('transform', ()), ExportDecision.TRANSFORM)
+        tag(self.objectsWithUpdatedVisibility, ExportDecision.VISIBILITY)
+        if self.ctx.scene.vray.ActiveNodeEditorType == "OBJECT":
+            tag(self.dgUpdates.get('shading', ()), ExportDecision.NODE_TREE)
+
+        mtlOptionUpdates = UpdateTracker.updates.get(UpdateTarget.OBJECT_MTL_OPTIONS, {})
+        tag((oid for oid, flags in mtlOptionUpdates.items() if flags != UpdateFlags.NONE), ExportDecision.MTL_OPTIONS)
+
+        tag((p.gizmoObjTrackId for p in self.activeMeshLightsInfo), ExportDecision.MESH_LIGHT_GIZMO)
+        tag(self.updatedMeshLightGizmos, ExportDecision.MESH_LIGHT_UPDATED)
+        tag(self.updatedFurGizmos, ExportDecision.FUR_GIZMO_UPDATED)
+        tag(self.activeGizmos, ExportDecision.ENV_FOG_GIZMO)
+        tag(self.addedGizmos, ExportDecision.ENV_FOG_ADDED)
+        tag(self.removedGizmos, ExportDecision.ENV_FOG_REMOVED)
+
+        # The stats are only printed when export times are logged. Building the summary
+        # requires a pass over all scene objects, so skip it otherwise.
+        if self.interactive and self.ctx.scene.vray.Exporter.debug_log_times:
+            self.stats.append(f"{'Decisions:':<12} {self._exportDecisionsSummary()}")
+
+
+    def _exportDecisionsSummary(self, maxObjects = 10):
+        """ Return a human-readable summary of the export decision index: the number of objects for each flag
+            and, for incremental updates, the flags of the first maxObjects objects that will be re-exported.
+        """
+        counts = {flag: 0 for flag in ExportDecision if flag.value and (flag.value & (flag.value - 1)) == 0}
+        for flags in self.exportDecisions.values():
+            for flag in counts:
+                if flags & flag:
+                    counts[flag] += 1
+
+        summary = ", ".join(f"{flag.name.lower()} {count}" for flag, count in counts.items() if count) or "no flagged objects"
+
+        if not self.fullExport:
+            reexported = [(oid, flags) for oid, flags in self.exportDecisions.items() if flags & ExportDecision.REEXPORT]
+            if reexported:
+                objNames = {getObjTrackId(o): o.name for o in self.sceneObjects}
+                details = "; ".join(f"{objNames.get(oid, oid)}: {ExportDecision(flags).name}" for oid, flags in reexported[:maxObjects])
+                more = f"; +{len(reexported) - maxObjects} more" if len(reexported) > maxObjects else ""
+                summary += f" [{details}{more}]"
+
+        return summary
+
+
     def _syncGizmos(self):
         # Remove plugins associated with removed gizmo objects
         gizmoTracker = self.objTrackers['GIZMO']
@@ -1121,6 +1250,13 @@ class GeometryExporter(ExporterBase):
         return False
 
 
+def exportMemorySummary(renderer) -> str:
+    """ Return a human-readable summary of the memory held by the geometry export in the last export pass """
+    peakBytes, limitBytes = vray.getExportMemoryStats(renderer)
+    limit = f"{limitBytes / (1024 * 1024):.0f} MB limit" if limitBytes else "no limit"
+    return f"{peakBytes / (1024 * 1024):.2f} MB peak in flight ({limit})"
+
+
 # TODO: This function is just glue for the POC. Remove in final code
 def run(ctx: ExporterContext):
     GeometryExporter(ctx).export()
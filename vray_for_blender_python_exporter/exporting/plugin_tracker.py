@@ -3,11 +3,16 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from __future__ import annotations # For the forward type hints
-from typing import Dict, Set
+from typing import Dict, Set, TYPE_CHECKING
 import bpy
+from array import array
 from collections import defaultdict
 from vray_blender.lib.names import Names
 
+if TYPE_CHECKING:
+    # lib.defs imports this module
+    from vray_blender.lib.defs import AttrPlugin
+
 # This file contains code for tracking VRay plugin deletion in response to
 # objects/materials being deleted or hidden in Blender.
 
@@ -42,102 +47,298 @@ def getConnectedTrackIds(node: bpy.types.Node, connectedIds=None):
     return connectedIds
 
 
+# Plugin types recorded by ObjTracker for the plugins which need special handling when
+# syncing the visibility of the scene objects
+PLUGIN_TYPE_NODE           = "Node"
+PLUGIN_TYPE_PHX_SHADER_SIM = "PhxShaderSim"
+PLUGIN_TYPE_VRAY_DECAL     = "VRayDecal"
+
+# Objects with up to this many plugins keep their plugin ids in an array instead of a set.
+# Python sets take at least 216 bytes, while most objects have only a few plugins.
+SMALL_OBJ_PLUGINS = 16
+
+
+def getPluginTypeFromName(pluginId: str):
+    """ Deduce the type of a plugin from its name, for plugins tracked without an explicit type.
+        Only the types which are relevant to the visibility sync are recognized, None is returned
+        for all other plugins.
+    """
+    if pluginId.startswith("node@"):
+        return PLUGIN_TYPE_NODE
+    if pluginId.endswith("@PhxShaderSim"):
+        return PLUGIN_TYPE_PHX_SHADER_SIM
+    if pluginId.startswith("vraydecal@"):
+        return PLUGIN_TYPE_VRAY_DECAL
+    return None
+
+
 class ObjTracker:
     """ ObjTracker tracks the lifetimes of scene objects and their associated 
         VRay plugins. It is used to determine which objects and plugins should be 
         removed in reponse to changes to the Blender scene.
+
+        Plugin names and types are interned to integer ids and the per-plugin data is kept in flat
+        arrays indexed by the plugin id. The plugins owned by a single object ( i.e. which can be
+        deleted together with it ) are maintained incrementally, so that getOwnedPlugins() does not
+        need to check the reference counts of the object's plugins. Most objects own all of their
+        plugins, so a separate owned set is only kept for the objects which share plugins with others.
+        The plugins of an object are kept in a compact array, which is replaced by a set when the
+        object gets more than SMALL_OBJ_PLUGINS plugins.
+
+        Scene membership is tracked in generations. beginSync() starts a new generation and
+        markPresent() moves an object to it. The objects which were not marked in the current
+        generation are the removed ones, and getRemoved() returns them in time proportional
+        to their count.
     """
     def __init__(self, type: str):
-        self.type:      str                   = type  # Arbitrary description of the tracked objects' type
-        self.ids:       Dict[str, Set(str)]   = {}    # objTrackId: set(pluginId) - plugins per object
-        self.plugins:   Dict[str, int]        = {}    # pluginId: refCount - flat plugins list with refcounts
-        self.instanced: Dict[str, bool]       = {}    # objTrackId: Bool - True if the object is instanced.
+        self.type: str = type  # Arbitrary description of the tracked objects' type
+
+        # Interned plugin names and types
+        self._pluginIds: Dict[str, int] = {}      # pluginName: pluginId
+        self._pluginNames: list[str|None] = []    # pluginId: pluginName, None for free slots
+        self._freePluginIds: list[int] = []
+        self._typeIds: Dict[str, int] = { None: 0 }
+        self._typeNames: list[str|None] = [ None ]
+
+        # Per-plugin data, indexed by pluginId
+        self._owners: list = []                   # The objTrackId of the owner or a set of objTrackIds for shared plugins
+        self._instanced = array('b')              # 1 if the plugin is instanced
+        self._pluginTypes = array('H')            # Interned plugin type
 
+        # Per-object data
+        self._objPlugins: Dict[str, array|Set[int]] = {}  # objTrackId: pluginIds - plugins per object
+        self._objOwned: Dict[str, Set[int]] = {}     # objTrackId: set(pluginId) - plugins with refcount 1, only for
+                                                     # objects which share plugins. Otherwise, all plugins are owned.
 
-    def trackPlugin(self, objTrackId: str, pluginId: str, isInstanced=False):
-        """ Add plugin to the object's tracking list """
-        self._trackObj(objTrackId)
-        self._addPluginToObj(objTrackId, pluginId)
-        self.instanced[pluginId] = isInstanced
-        log(f"TRACK PLUGIN {self.type}: {objTrackId} => {pluginId}  [{self.ids[objTrackId]}]")
+        # Objects marked present in the current / previous generation. Each tracked object is in exactly one of them.
+        self._current: Set[str] = set()
+        self._previous: Set[str] = set()
+
+
+    def trackPlugin(self, objTrackId: str, pluginId: str, isInstanced=False, pluginType: str = None):
+        """ Add plugin to the object's tracking list.
+
+            pluginType is the V-Ray type of the plugin. If not specified, it is deduced from the name
+            of the plugin ( only for the types listed in PLUGIN_TYPE_XXX ).
+        """
+        objPlugins = self._trackObj(objTrackId)
+
+        if (pid := self._pluginIds.get(pluginId)) is None:
+            pid = self._internPlugin(pluginId, pluginType if pluginType is not None else getPluginTypeFromName(pluginId))
+            self._owners[pid] = objTrackId
+            self._addObjPlugin(objTrackId, objPlugins, pid)
+            if (owned := self._objOwned.get(objTrackId)) is not None:
+                owned.add(pid)
+        else:
+            if pluginType is not None:
+                self._pluginTypes[pid] = self._internType(pluginType)
+            if pid not in objPlugins:
+                self._addOwner(pid, objTrackId)
+
+        self._instanced[pid] = isInstanced
+        log(f"TRACK PLUGIN {self.type}: {objTrackId} => {pluginId}")
 
     
     def forget(self, objTrackId: str):
         """ Remove object from the tracking list """ 
-        if objTrackId not in self.ids:
+        if (objPlugins := self._objPlugins.pop(objTrackId, None)) is None:
             return
         
         # Release refcount on plugins first
-        for pluginId in self.ids[objTrackId]:
-           self._releasePlugin(pluginId)
+        for pid in objPlugins:
+            self._releasePlugin(pid, objTrackId)
         
         # Delete tracked object's registration
-        del self.ids[objTrackId]
+        self._objOwned.pop(objTrackId, None)
+        self._current.discard(objTrackId)
+        self._previous.discard(objTrackId)
         log(f"FORGET ID {self.type}: {objTrackId}")
     
 
     def forgetPlugin(self, objTrackId: str, pluginId: str):
-        if pluginId in self.ids.get(objTrackId, []):
-            self._releasePlugin(pluginId)
-            self.ids[objTrackId].remove(pluginId)
+        if ((pid := self._pluginIds.get(pluginId)) is not None) and (pid in (objPlugins := self._objPlugins.get(objTrackId, ()))):
+            objPlugins.remove(pid)
+            self._releasePlugin(pid, objTrackId)
 
 
     def diff(self, objTrackIds):
         """ Returns all tracked objects which are not in objTrackIds """
-        return set(self.ids.keys()).difference(objTrackIds)
-    
+        self.beginSync()
+        for objTrackId in objTrackIds:
+            self.markPresent(objTrackId)
+        return self.getRemoved()
+
+
+    def beginSync(self):
+        """ Start a new scene membership generation. All tracked objects are considered removed
+            until marked with markPresent().
+        """
+        current, previous = self._current, self._previous
+        # Objects which were not present in the last generation and have not been forgotten since
+        # remain not present. Merge the smaller set into the larger one.
+        if len(previous) > len(current):
+            previous.update(current)
+            current.clear()
+            self._current, self._previous = current, previous
+        else:
+            current.update(previous)
+            previous.clear()
+            self._current, self._previous = previous, current
+
+
+    def markPresent(self, objTrackId: str):
+        """ Mark a tracked object as present in the scene for the current generation """
+        if objTrackId in self._previous:
+            self._previous.remove(objTrackId)
+            self._current.add(objTrackId)
+
+
+    def getRemoved(self):
+        """ Returns the tracked objects which have not been marked present since the last beginSync() """
+        return set(self._previous)
+
 
     def getOwnedPlugins(self, objTrackId: str):
         """ Returns all object's plugins with reference count 1 ( i.e. that can be deleted ) """
-        if objTrackId in self.ids:
-            return [p for p in self.ids[objTrackId] if self.plugins[p] == 1]
-        return []
+        if (owned := self._objOwned.get(objTrackId)) is None:
+            owned = self._objPlugins.get(objTrackId, ())
+        names = self._pluginNames
+        return [names[pid] for pid in owned]
     
     def getTrackedObjects(self):
-        return self.ids.keys()
+        return self._objPlugins.keys()
     
 
     def getPlugins(self, objTrackId):
         """ Returns all tracked plugins for the object """
-        if objTrackId in self.ids:
-            return self.ids[objTrackId]
-        return set()
+        if objPlugins := self._objPlugins.get(objTrackId):
+            names = self._pluginNames
+            return [names[pid] for pid in objPlugins]
+        return []
+
+    def hasPlugin(self, objTrackId, pluginId):
+        """ Returns True if the plugin is tracked for the object """
+        return ((pid := self._pluginIds.get(pluginId)) is not None) and (pid in self._objPlugins.get(objTrackId, ()))
 
     def getPluginInstanced(self, pluginId):
         """ Returns True if the tracked plugin is instanced """
-        if pluginId in self.instanced:
-            return self.instanced[pluginId]
+        if (pid := self._pluginIds.get(pluginId)) is not None:
+            return bool(self._instanced[pid])
         return False
 
+    def getPluginType(self, pluginId):
+        """ Returns the recorded type of the tracked plugin or None if it is not known """
+        if (pid := self._pluginIds.get(pluginId)) is not None:
+            return self._typeNames[self._pluginTypes[pid]]
+        return None
+
+    def getPluginsCount(self):
+        return len(self._pluginIds)
+
 
     def _trackObj(self, objTrackId: str):
-        if objTrackId not in self.ids.keys():
-            self.ids[objTrackId] = set()
+        if (objPlugins := self._objPlugins.get(objTrackId)) is None:
+            objPlugins = self._objPlugins[objTrackId] = array('i')
+            # Newly tracked objects are present in the scene by definition
+            self._current.add(objTrackId)
             log(f"TRACK ID {self.type}: {objTrackId}")
+        return objPlugins
+
+
+    def _addObjPlugin(self, objTrackId: str, objPlugins: array|Set[int], pid: int):
+        """ Add a plugin which is not yet tracked for the object to its plugins """
+        if type(objPlugins) is set:
+            objPlugins.add(pid)
+        elif len(objPlugins) < SMALL_OBJ_PLUGINS:
+            objPlugins.append(pid)
+        else:
+            objPlugins = self._objPlugins[objTrackId] = set(objPlugins)
+            objPlugins.add(pid)
 
 
-    # Add to the list of all tracked plugins / increment recount on a plugin 
-    def _addRefPlugin(self, pluginId):
-        if pluginId not in self.plugins:
-            self.plugins[pluginId] = 1
+    def _internType(self, pluginType: str):
+        if (typeId := self._typeIds.get(pluginType)) is None:
+            typeId = self._typeIds[pluginType] = len(self._typeNames)
+            self._typeNames.append(pluginType)
+        return typeId
+
+
+    def _internPlugin(self, pluginName: str, pluginType: str):
+        typeId = self._internType(pluginType)
+
+        if self._freePluginIds:
+            pid = self._freePluginIds.pop()
+            self._pluginNames[pid] = pluginName
+            self._pluginTypes[pid] = typeId
+        else:
+            pid = len(self._pluginNames)
+            self._pluginNames.append(pluginName)
+            self._owners.append(None)
+            self._instanced.append(0)
+            self._pluginTypes.append(typeId)
+
+        self._pluginIds[pluginName] = pid
+        return pid
+
+
+    # Add an owner to a plugin which is already tracked by another object
+    def _addOwner(self, pid: int, objTrackId: str):
+        # The plugin is shared, so it is not owned by the new owner
+        objPlugins = self._objPlugins[objTrackId]
+        if objTrackId not in self._objOwned:
+            self._objOwned[objTrackId] = set(objPlugins)
+        self._addObjPlugin(objTrackId, objPlugins, pid)
+
+        owners = self._owners[pid]
+        if type(owners) is set:
+            owners.add(objTrackId)
         else:
-            self.plugins[pluginId] += 1
+            # The only owner so far is no longer the exclusive one
+            self._removeOwned(owners, pid)
+            self._owners[pid] = {owners, objTrackId}
+
+
+    # Remove an owner from a plugin and delete the plugin if it has no owners left.
+    # The plugin should already be removed from the object's plugins.
+    def _releasePlugin(self, pid: int, objTrackId: str):
+        owners = self._owners[pid]
+        if type(owners) is set:
+            owners.discard(objTrackId)
+            if len(owners) == 1:
+                lastOwner = next(iter(owners))
+                self._owners[pid] = lastOwner
+                self._addOwned(lastOwner, pid)
+            self._compactOwned(objTrackId)
+            return
+
+        self._compactOwned(objTrackId, pid)
+
+        del self._pluginIds[self._pluginNames[pid]]
+        self._pluginNames[pid] = None
+        self._owners[pid] = None
+        self._instanced[pid] = 0
+        self._freePluginIds.append(pid)
+
+
+    def _addOwned(self, objTrackId: str, pid: int):
+        if (owned := self._objOwned.get(objTrackId)) is not None:
+            owned.add(pid)
+            self._compactOwned(objTrackId)
 
 
-    # Decrement refcount on the plugin and delete from the list of tracked plugins
-    # if the refcount has reached 0
-    def _releasePlugin(self, pluginId):
-        self.plugins[pluginId] -= 1
-        if self.plugins[pluginId] == 0:
-            del self.plugins[pluginId]
-            del self.instanced[pluginId]
+    def _removeOwned(self, objTrackId: str, pid: int):
+        if (owned := self._objOwned.get(objTrackId)) is None:
+            owned = self._objOwned[objTrackId] = set(self._objPlugins[objTrackId])
+        owned.discard(pid)
 
 
-    # Register plugin with object
-    def _addPluginToObj(self, objTrackId, pluginId):
-        if pluginId not in self.ids[objTrackId]:
-            self.ids[objTrackId].add(pluginId)
-            self._addRefPlugin(pluginId)
+    # Drop the separate owned set of an object when it owns all of its plugins again
+    def _compactOwned(self, objTrackId: str, removedPid: int = None):
+        if (owned := self._objOwned.get(objTrackId)) is not None:
+            if removedPid is not None:
+                owned.discard(removedPid)
+            if (objPlugins := self._objPlugins.get(objTrackId)) is None or len(owned) == len(objPlugins):
+                del self._objOwned[objTrackId]
 
 
 class NodeTracker:
@@ -378,6 +579,86 @@ class ObjDataTracker:
         return self.dataToGeomPluginName.pop(dataName, None)
 
 
+class GeomFingerprintCache:
+    """ Content hashes of the geometry last sent to V-Ray, per geometry plugin. It is used to skip
+        the export of meshes whose data is identical to what the renderer already holds.
+    """
+
+    def __init__(self):
+        self.fingerprints: dict[str, int] = {} # pluginName: fingerprint
+        self.hits = 0
+        self.misses = 0
+        self.bytesSaved = 0 # Total size of the mesh data which was not sent because of a cache hit
+
+    def checkAndUpdate(self, pluginName: str, fingerprint: int, dataSize: int):
+        """ Return True if the fingerprint matches the one recorded for the plugin. Otherwise,
+            record the new fingerprint and return False.
+
+            Parameters:
+                pluginName (str): The name of the geometry plugin.
+                fingerprint (int): The content hash of the geometry data.
+                dataSize (int): The size of the hashed data in bytes.
+        """
+        if self.fingerprints.get(pluginName) == fingerprint:
+            self.hits += 1
+            self.bytesSaved += dataSize
+            return True
+
+        self.fingerprints[pluginName] = fingerprint
+        self.misses += 1
+        return False
+
+    def forget(self, pluginName: str):
+        """ Remove the fingerprint of a plugin which is no longer present in the renderer """
+        self.fingerprints.pop(pluginName, None)
+
+    def summary(self):
+        return f"{self.hits} unchanged meshes skipped ({self.bytesSaved / (1024 * 1024):.2f} MB), {self.misses} exported"
+
+
+class MtlFingerprintCache:
+    """ Fingerprints of the material node trees last sent to V-Ray, per material. It is used to reuse
+        the plugins of materials whose node trees, property values and referenced data blocks
+        are identical to what the renderer already holds.
+    """
+
+    def __init__(self):
+        self.entries: dict[int, tuple[int, AttrPlugin, int]] = {} # mtlTrackId: (fingerprint, material plugin, plugins count)
+        self.hits = 0
+        self.misses = 0
+        self.pluginsSaved = 0 # Total number of plugin updates which were not sent because of a cache hit
+
+    def check(self, mtlTrackId: int, fingerprint: int):
+        """ Return the plugin exported for the material if the fingerprint matches the recorded one, otherwise None """
+        entry = self.entries.get(mtlTrackId)
+
+        if (entry is not None) and (entry[0] == fingerprint):
+            self.hits += 1
+            self.pluginsSaved += entry[2]
+            return entry[1]
+
+        self.misses += 1
+        return None
+
+    def record(self, mtlTrackId: int, fingerprint: int, mtlPlugin: AttrPlugin, pluginsCount: int):
+        """ Record the fingerprint of a material after its export
+
+            Parameters:
+                mtlTrackId (int): The track ID of the material.
+                fingerprint (int): The fingerprint of the material node tree.
+                mtlPlugin (AttrPlugin): The top-level plugin exported for the material.
+                pluginsCount (int): The number of plugins exported for the material node tree.
+        """
+        self.entries[mtlTrackId] = (fingerprint, mtlPlugin, pluginsCount)
+
+    def forget(self, mtlTrackId: int):
+        """ Remove the fingerprint of a material whose plugins are no longer present in the renderer """
+        self.entries.pop(mtlTrackId, None)
+
+    def summary(self):
+        return f"{self.hits} unchanged materials reused ({self.pluginsSaved} plugin updates saved), {self.misses} exported"
+
+
 
 ################################
 ## No-op implementations
@@ -425,7 +706,7 @@ class FakeScopedNodeTracker:
 
 class FakeObjTracker:
     """ A no-op impementation for use with production exports """
-    def trackPlugin(self, objTrackId: str, pluginId: str, isInstanced = False):
+    def trackPlugin(self, objTrackId: str, pluginId: str, isInstanced = False, pluginType: str = None):
         pass
 
     def forget(self, objTrackId: str):
@@ -437,6 +718,15 @@ class FakeObjTracker:
     def diff(self, objTrackIds: list[str]):
         return set()
 
+    def beginSync(self):
+        pass
+
+    def markPresent(self, objTrackId: str):
+        pass
+
+    def getRemoved(self):
+        return set()
+
     def getOwnedPlugins(self, objTrackId: str):
         return []
 
@@ -445,3 +735,9 @@ class FakeObjTracker:
 
     def getPlugins(self, objTrackId):
         return set()
+
+    def hasPlugin(self, objTrackId, pluginId):
+        return False
+
+    def getPluginType(self, pluginId):
+        return None
@@ -8,7 +8,7 @@ import copy
 from mathutils import Matrix
 
 from vray_blender.exporting import tools
-from vray_blender.exporting.plugin_tracker import getObjTrackId
+from vray_blender.exporting.plugin_tracker import getObjTrackId, PLUGIN_TYPE_PHX_SHADER_SIM
 from vray_blender.lib.defs import AttrPlugin, ExporterContext, ExporterBase, PluginDesc
 from vray_blender.lib.export_utils import exportPlugin
 from vray_blender.lib.names import Names
@@ -84,7 +84,7 @@ class SmokeExporter(ExporterBase):
 
         objTrackId = getObjTrackId(obj)
 
-        self.objTracker.trackPlugin(objTrackId, pluginName)
+        self.objTracker.trackPlugin(objTrackId, pluginName, pluginType=PLUGIN_TYPE_PHX_SHADER_SIM)
         self.objTracker.trackPlugin(objTrackId, f'{pluginName}@PhxShaderCache')
         self.objTracker.trackPlugin(objTrackId, '__PhxShaderGlobalVolume__')
 
@@ -487,6 +487,131 @@ def getSceneNameOfObject(obj: bpy.types.Object, scene: bpy.types.Scene):
 
     return name
 
+class SceneMetadataCache:
+    """ Memoized per-object metadata which is exported with each Node plugin: the scene path,
+        the user attributes and the motion blur samples override.
+
+        The scene path of every ancestor is computed once, so the cost of building the path of
+        an object does not grow with the depth of its hierarchy. The cache is kept between the update
+        cycles of interactive renders. Paths are invalidated by transform updates ( reparenting is
+        reported as a transform update too ), and the other data by any update of the object.
+        Renames are not reported by the depsgraph, so the first use of an entry in each export
+        also checks that the name and parent of the object are still the same. The entries of
+        removed objects are dropped when their plugins are pruned.
+    """
+
+    class _Entry:
+        __slots__ = ("name", "parentId", "parentPath", "path", "generation")
+
+        def __init__(self, name: str, parentId: int, parentPath: str, path: str, generation: int):
+            self.name = name
+            self.parentId = parentId
+            self.parentPath = parentPath
+            self.path = path
+            self.generation = generation
+
+    _NOT_CACHED = object()
+
+    def __init__(self):
+        self._paths: dict[int, SceneMetadataCache._Entry] = {}  # objTrackId: _Entry
+        self._userAttributes: dict[int, str] = {}               # objTrackId: user_attributes string
+        self._mbSamples: dict[int, int|None] = {}               # objTrackId: samples override or None
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+
+    def beginExport(self, transformUpdates: set[int], allUpdates: set[int]):
+        """ Start a new export cycle and drop the entries of the updated objects.
+
+            Parameters:
+                transformUpdates (set[int]): objTrackIds of the objects with updated transforms or parents.
+                allUpdates (set[int]): objTrackIds of all updated objects.
+        """
+        self._generation += 1
+        self.hits = 0
+        self.misses = 0
+
+        for objTrackId in transformUpdates:
+            self._paths.pop(objTrackId, None)
+
+        for objTrackId in allUpdates:
+            self._userAttributes.pop(objTrackId, None)
+            self._mbSamples.pop(objTrackId, None)
+
+
+    def forget(self, objTrackId: int):
+        """ Drop the entries of an object removed from the scene """
+        self._paths.pop(objTrackId, None)
+        self._userAttributes.pop(objTrackId, None)
+        self._mbSamples.pop(objTrackId, None)
+
+
+    def getScenePath(self, obj: bpy.types.Object):
+        """ Return the scene path of an object, the same as getSceneNameOfObject(obj, scene) """
+        return f"scene/{self._getPath(obj)}"
+
+
+    def getUserAttributes(self, obj: bpy.types.Object):
+        """ Return the user attributes of the object as a string suitable for export """
+        objTrackId = obj.original.session_uid
+        if (userAttributes := self._userAttributes.get(objTrackId)) is None:
+            userAttributes = obj.vray.UserAttributes.getAsString()
+            self._userAttributes[objTrackId] = userAttributes
+        return userAttributes
+
+
+    def getMotionBlurSamples(self, obj: bpy.types.Object, defaultSamples: int):
+        """ Return the motion blur samples for the object, or defaultSamples if not overridden """
+        objTrackId = obj.original.session_uid
+        if (samples := self._mbSamples.get(objTrackId, self._NOT_CACHED)) is self._NOT_CACHED:
+            objProperties = obj.vray.VRayObjectProperties
+            samples = objProperties.motion_blur_samples if objProperties.override_motion_blur_samples else None
+            self._mbSamples[objTrackId] = samples
+        return defaultSamples if samples is None else samples
+
+
+    def _getPath(self, obj: bpy.types.Object):
+        """ Return the path of the object without the 'scene/' prefix """
+        objTrackId = obj.original.session_uid
+        entry = self._paths.get(objTrackId)
+
+        if entry is not None:
+            if entry.generation == self._generation:
+                self.hits += 1
+                return entry.path
+
+            # First use of the entry in this export, validate it against the object
+            parent = obj.parent
+            if entry.name == obj.name:
+                if parent is None:
+                    if entry.parentId is None:
+                        entry.generation = self._generation
+                        self.hits += 1
+                        return entry.path
+                elif (entry.parentId == parent.original.session_uid) and (entry.parentPath == self._getPath(parent)):
+                    entry.generation = self._generation
+                    self.hits += 1
+                    return entry.path
+
+        self.misses += 1
+
+        # We can use the plain object names instead of their unique names here because Blender
+        # guarantees that object names are unique.
+        if parent := obj.parent:
+            parentPath = self._getPath(parent)
+            entry = __class__._Entry(obj.name, parent.original.session_uid, parentPath, f"{parentPath}/{obj.name}", self._generation)
+        else:
+            entry = __class__._Entry(obj.name, None, None, obj.name, self._generation)
+
+        self._paths[objTrackId] = entry
+        return entry.path
+
+
+    def summary(self):
+        return f"{self.hits} cached scene paths, {self.misses} built"
+
+
 def isNodeConnected(node):
     return any(len(o.links) > 0 for o in node.outputs)
 
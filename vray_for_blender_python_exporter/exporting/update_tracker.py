@@ -6,9 +6,14 @@ from __future__ import annotations
 
 import bpy
 from enum import IntEnum, IntFlag
+from typing import TYPE_CHECKING
 
 from vray_blender.exporting.plugin_tracker import getObjTrackId
 
+if TYPE_CHECKING:
+    # lib.defs imports this module
+    from vray_blender.lib.defs import ExporterContext
+
 class UpdateFlags(IntFlag):
     NONE        = 0
     DATA        = 1     # A property value has changed 
@@ -40,9 +45,13 @@ class UpdateTracker:
 
     @staticmethod
     def tagUpdate(obj: bpy.types.ID, target: UpdateTarget, flag: UpdateFlags):
+        UpdateTracker.tagUpdateById(getObjTrackId(obj), target, flag)
+
+    @staticmethod
+    def tagUpdateById(objTrackId: int, target: UpdateTarget, flag: UpdateFlags):
         updatesForTarget = UpdateTracker.updates.setdefault(target, {})
-        flags = updatesForTarget.get(target, UpdateFlags.NONE)
-        updatesForTarget[getObjTrackId(obj)] = (flags | flag)
+        flags = updatesForTarget.get(objTrackId, UpdateFlags.NONE)
+        updatesForTarget[objTrackId] = (flags | flag)
 
     @staticmethod
     def getObjUpdate(target: UpdateTarget, obj):
@@ -70,30 +79,146 @@ class UpdateTracker:
                 UpdateTracker.tagUpdate(obj, UpdateTarget.OBJECT_MTL_OPTIONS, UpdateFlags.TOPOLOGY)
 
     @staticmethod
-    def tagCrossObjectUpdates(exporterCtx: ExporterContext, data, updateTarget: UpdateTarget):
-        """ Tag for update all properties that depend on objects that have been updated. 
+    def tagCrossObjectUpdates(exporterCtx: ExporterContext):
+        """ Tag for update all materials, lights and worlds with properties that depend on objects
+            whose transform or geometry have been updated.
+        """
+        updatedObjects = {u.id.original for u in exporterCtx.dg.updates if u.is_updated_transform or u.is_updated_geometry}
+
+        if not updatedObjects:
+            return
+
+        dependencies = exporterCtx.persistedState.crossDependencies
+
+        for obj in updatedObjects:
+            for target, ownerTrackId in dependencies.getObjectDependents(obj.name):
+                UpdateTracker.tagUpdateById(ownerTrackId, target, UpdateFlags.DATA)
+
+
+class CrossDependencyIndex:
+    """ Reverse index from the objects and textures referenced in the node trees of materials,
+        lights and worlds to the data blocks which own the referencing nodes. 
+        
+        Only the node trees of the data blocks which have been added or updated since the last sync
+        are rescanned, so that finding the dependents of an updated object does not require
+        a scan of all node trees in the scene.
+    """
+
+    # Reference kinds used as the first element of the index keys
+    REF_OBJECT_NAME = 0     # Object name set to a property listed in CROSS_DEPENDENCIES
+    REF_SELECTOR    = 1     # objTrackId of an object referenced by a VRayNodeSelectObject node
+    REF_TEXTURE     = 2     # Track ID of a texture used by a material node. Unlike the name, it does not change on rename.
+
+    def __init__(self):
+        # {(refKind, refKey): set((UpdateTarget, ownerTrackId))}
+        self._dependents: dict[tuple, set[tuple[UpdateTarget, int]]] = {}
+
+        # {(UpdateTarget, ownerTrackId): [(refKind, refKey)]}
+        self._ownerRefs: dict[tuple[UpdateTarget, int], list[tuple]] = {}
+
+        self.reindexedOwners = 0
+
+
+    def sync(self, exporterCtx: ExporterContext):
+        """ Reindex the node trees of the new and updated materials, lights and worlds and
+            drop the entries of the deleted ones.
+        """
+        if exporterCtx.fullExport:
+            self.clear()
+
+        self.reindexedOwners = 0
+        updatedIds = exporterCtx.dgUpdates['all']
+
+        for target, data in ((UpdateTarget.MATERIAL, bpy.data.materials),
+                             (UpdateTarget.LIGHT, bpy.data.lights),
+                             (UpdateTarget.WORLD, bpy.data.worlds)):
+            taggedIds = UpdateTracker.updates.get(target, {})
+            liveOwners = set()
+
+            for item in data:
+                ownerKey = (target, getObjTrackId(item))
+                liveOwners.add(ownerKey)
+
+                nodeTree = item.node_tree
+                if (ownerKey not in self._ownerRefs) or (ownerKey[1] in taggedIds) or (ownerKey[1] in updatedIds) or \
+                        ((nodeTree is not None) and (getObjTrackId(nodeTree) in updatedIds)):
+                    self._indexOwner(ownerKey, item)
+
+            for ownerKey in [k for k in self._ownerRefs if (k[0] == target) and (k not in liveOwners)]:
+                self._removeOwner(ownerKey)
 
-            Args:
-                data : the data collection ot scan e.g. bpy.data.materials
-                updateTarget: corresonding to the type of data in the collection
+
+    def clear(self):
+        self._dependents.clear()
+        self._ownerRefs.clear()
+
+
+    def getObjectDependents(self, objName: str):
+        """ Return (UpdateTarget, ownerTrackId) for the owners of nodes with properties referencing
+            the object by name.
         """
+        return self._dependents.get((CrossDependencyIndex.REF_OBJECT_NAME, objName), ())
+
+
+    def getSelectorMtls(self, objTrackId: int):
+        """ Return the track IDs of the materials with VRayNodeSelectObject nodes referencing the object """
+        return {ownerTrackId for _, ownerTrackId in self._dependents.get((CrossDependencyIndex.REF_SELECTOR, objTrackId), ())}
+
+
+    def getTextureMtls(self, textureTrackId: int):
+        """ Return the track IDs of the materials using the texture """
+        return {ownerTrackId for _, ownerTrackId in self._dependents.get((CrossDependencyIndex.REF_TEXTURE, textureTrackId), ())}
+
+
+    def summary(self):
+        return f"{len(self._ownerRefs)} indexed, {self.reindexedOwners} reindexed, {len(self._dependents)} references"
+
+
+    def _indexOwner(self, ownerKey: tuple[UpdateTarget, int], item: bpy.types.ID):
+        self._removeOwner(ownerKey)
+
+        refs = self._collectRefs(ownerKey[0], item)
+        self._ownerRefs[ownerKey] = refs
+
+        for ref in refs:
+            self._dependents.setdefault(ref, set()).add(ownerKey)
 
+        self.reindexedOwners += 1
+
+
+    def _removeOwner(self, ownerKey: tuple[UpdateTarget, int]):
+        for ref in self._ownerRefs.pop(ownerKey, ()):
+            if owners := self._dependents.get(ref):
+                owners.discard(ownerKey)
+                if not owners:
+                    del self._dependents[ref]
+
+
+    @staticmethod
+    def _collectRefs(target: UpdateTarget, item: bpy.types.ID):
         from vray_blender.lib.plugin_utils import CROSS_DEPENDENCIES
         from vray_blender.nodes.utils import getVrayPropGroup
-        from vray_blender.exporting.update_tracker import UpdateTracker, UpdateFlags
 
-        # Iterate over all plugin types and their cross dependencies
-        updatedObjects = {u.id.original for u in exporterCtx.dg.updates if u.is_updated_transform or u.is_updated_geometry}
+        if not item.node_tree:
+            return []
 
-        if not updatedObjects:
-            return
+        refs = set()
+        isVRayMtl = (target == UpdateTarget.MATERIAL) and hasattr(item, 'vray')
+
+        for node in item.node_tree.nodes:
+            if propList := CROSS_DEPENDENCIES.get(getattr(node, 'vray_plugin', '')):
+                propGroup = getVrayPropGroup(node)
+                for propName in propList:
+                    if refName := getattr(propGroup, propName):
+                        refs.add((CrossDependencyIndex.REF_OBJECT_NAME, refName))
+
+            if target != UpdateTarget.MATERIAL:
+                continue
+
+            if (node.bl_idname == "VRayNodeSelectObject") and node.objectPtr:
+                refs.add((CrossDependencyIndex.REF_SELECTOR, node.objectPtr.original.session_uid))
+
+            if isVRayMtl and (texture := getattr(node, 'texture', None)):
+                refs.add((CrossDependencyIndex.REF_TEXTURE, getObjTrackId(texture)))
 
-        for pluginType, propList in CROSS_DEPENDENCIES.items():
-            for item in [i for i in data if i.node_tree]:
-                for node in [n for n in item.node_tree.nodes if getattr(n, 'vray_plugin', '') == pluginType]:
-                    for propName in propList:
-                        propGroup = getVrayPropGroup(node)
-                        refProp = getattr(propGroup, propName)
-                        refObj = exporterCtx.sceneObjects.get(refProp)
-                        if refObj in updatedObjects:
-                            UpdateTracker.tagUpdate(item, updateTarget, UpdateFlags.DATA)
+        return list(refs)
@@ -10,7 +10,52 @@ import bpy
 from vray_blender import debug
 from vray_blender.lib import attribute_utils
 
-TYPES = {}
+class _PropGroupTypes(dict):
+    """ A {typeName: PropertyGroup class} dictionary of the registered plugin property groups.
+        Accessing a property group deferred with deferPluginPropertyGroup() registers it.
+    """
+    def __missing__(self, typeName):
+        if (pluginModule := _DEFERRED_PROP_GROUPS.pop(typeName, None)) is None:
+            raise KeyError(typeName)
+
+        registerPluginPropertyGroup(None, pluginModule)
+
+        # Registration may fail, in which case there is still no entry for the type
+        return dict.__getitem__(self, typeName)
+
+    def get(self, typeName, default=None):
+        try:
+            return self[typeName]
+        except KeyError:
+            return default
+
+    def __contains__(self, typeName):
+        return dict.__contains__(self, typeName) or (typeName in _DEFERRED_PROP_GROUPS)
+
+
+TYPES = _PropGroupTypes()
+
+# {typeName: pluginModule} of the property groups which will be registered on first access through TYPES
+_DEFERRED_PROP_GROUPS = {}
+
+
+def deferPluginPropertyGroup(pluginModule):
+    """ Postpone the registration of a plugin property group that is not attached to any entity
+        until the first time it is accessed through TYPES (including by registerPluginPropertyGroup).
+    """
+    typeName = f"VRay{pluginModule.ID}"
+
+    if not dict.__contains__(TYPES, typeName):
+        _DEFERRED_PROP_GROUPS[typeName] = pluginModule
+
+
+def getDeferredPropertyGroupsCount():
+    """ Return the number of deferred property groups which have not been registered yet. """
+    return len(_DEFERRED_PROP_GROUPS)
+
+
+def clearDeferredPropertyGroups():
+    _DEFERRED_PROP_GROUPS.clear()
 
 def registerPluginPropertyGroup(dataPointer: bpy.types.Node | bpy.types.PropertyGroup, pluginModule, overridePropGroup = False):
     """ Creates a PropertyGroup for the plugin module and attaches it to the 
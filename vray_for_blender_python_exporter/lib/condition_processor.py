@@ -66,6 +66,21 @@ class UIConditionCompiler:
     # Functions having the same rule string can be reused between plugin modules.
     _compiledFunctions = {}
 
+    # Dictionary of rule => generated Python source of the evaluation function. Translating
+    # the rules is the expensive part of the compilation, so the sources are saved to and
+    # restored from the plugin description cache (see plugin_utils.loadPluginDescriptions).
+    _conditionSources = {}
+
+    @staticmethod
+    def getConditionSources():
+        return UIConditionCompiler._conditionSources
+
+
+    @staticmethod
+    def addConditionSources(sources: dict):
+        UIConditionCompiler._conditionSources.update(sources)
+
+
     def __init__(self, pluginDesc: dict):
         self.pluginDesc = pluginDesc
         self.translator = UIConditionConverter(pluginDesc)
@@ -107,7 +122,10 @@ class UIConditionCompiler:
                 evalFn = importFunction(rule)
         else:
             try:
-                funcCode = self.translator.toPython(rule)
+                if (funcCode := __class__._conditionSources.get(rule)) is None:
+                    funcCode = self.translator.toPython(rule)
+                    __class__._conditionSources[rule] = funcCode
+
                 compiledMethod = compile(funcCode, '<string>', 'exec')
                 evalFn = types.FunctionType(compiledMethod.co_consts[1], globals(), "evaluate")
             except Exception as ex:
@@ -9,8 +9,9 @@ import bpy, mathutils
 from numpy import ndarray
 
 from vray_blender import debug
-from vray_blender.exporting.tools import TimeStats, FakeTimeStats
-from vray_blender.exporting.plugin_tracker import getObjTrackId, ObjTracker, ObjDataTracker, FakeObjTracker, ScopedNodeTracker, FakeScopedNodeTracker
+from vray_blender.exporting.tools import TimeStats, FakeTimeStats, SceneMetadataCache
+from vray_blender.exporting.plugin_tracker import getObjTrackId, ObjTracker, ObjDataTracker, GeomFingerprintCache, MtlFingerprintCache, FakeObjTracker, ScopedNodeTracker, FakeScopedNodeTracker
+from vray_blender.exporting.update_tracker import CrossDependencyIndex
 from vray_blender.lib.motion_blur import MotionBlurBuilder
 
 
@@ -62,6 +63,10 @@ class PersistedState:
         self.activeInstancers = set()
         self.activeGizmos     = set()
 
+        # The instance table last sent for each Instancer2 plugin, used to skip the re-export of
+        # unchanged instancers in interactive mode.
+        self.instancerTables = {} # Instancer2 plugin name => (frame, InstancerData)
+
         # Cache mapping for exported materials:
         # Each key is a session_uid of a Blender material that has been processed for export,
         # and the corresponding value is its AttrPlugin representation.
@@ -84,6 +89,21 @@ class PersistedState:
         # it is set during the export of node plugins.
         self.objDataTracker = ObjDataTracker()
 
+        # Content hashes of the exported meshes, used to skip the export of unchanged geometry.
+        self.geomFingerprints = GeomFingerprintCache()
+
+        # Fingerprints of the exported material node trees, used to skip the export of unchanged materials.
+        self.mtlFingerprints = MtlFingerprintCache()
+
+        # Memoized scene paths and other per-object metadata exported with the Node plugins.
+        self.sceneMetadata = SceneMetadataCache()
+
+        # Instancers and scene objects, updated incrementally between the interactive update cycles.
+        self.sceneIndex = SceneIndex()
+
+        # Objects and textures referenced from the node trees of materials, lights and worlds.
+        self.crossDependencies = CrossDependencyIndex()
+
         # Stores the render mask state for the current export.
         self.renderMaskState = RenderMaskState(-1, True, [])
 
@@ -92,6 +112,80 @@ class PersistedState:
         self.materialOverrideMode = '-1'
         self.overrideMaterial = None
 
+class SceneIndex:
+    """ Scene membership data needed on each export: the instancers and all objects in the scene,
+        including the ones in linked collections. In interactive mode, it is kept between the update cycles
+        and only the updated objects are reclassified, unless the scene structure has changed.
+    """
+    def __init__(self):
+        self.valid = False
+
+        self.legacyInstancers = set()   # objTrackIds of the objects instancing through Data Properties -> Instancing
+        self.furInstancers    = set()   # objTrackIds of the V-Ray Fur objects
+        self.geomInstancers   = set()   # objTrackIds of the parents of the depsgraph instances
+        self.allObjects       = set()   # All scene objects, including the ones from linked collections
+
+        self.fullRebuilds = 0
+        self.incrementalUpdates = 0
+
+
+    def rebuild(self, exporterCtx: ExporterContext):
+        """ Compute all data from scratch """
+        sceneObjects = exporterCtx.sceneObjects
+
+        self.legacyInstancers = {getObjTrackId(o) for o in sceneObjects if o.is_instancer}
+        self.furInstancers = {getObjTrackId(o) for o in sceneObjects if o.vray.isVRayFur}
+        self.geomInstancers = self._getGeomInstancers(exporterCtx.dg)
+
+        self.allObjects = set(sceneObjects)
+
+        # Add objects from linked collections as they are not included in scene's depsgraph
+        for c in bpy.data.collections:
+            if c.library is not None:
+                self.allObjects.update(c.all_objects)
+
+        self.valid = True
+        self.fullRebuilds += 1
+
+
+    def update(self, exporterCtx: ExporterContext, updatedObjects: list[bpy.types.Object]):
+        """ Reclassify only the objects reported as updated by the depsgraph """
+        for obj in updatedObjects:
+            obj = obj.original
+            objTrackId = getObjTrackId(obj)
+
+            if obj not in self.allObjects:
+                # A new object which was not reported with a collection update. Play it safe.
+                self.rebuild(exporterCtx)
+                return
+
+            self._setMembership(self.legacyInstancers, objTrackId, obj.is_instancer)
+            self._setMembership(self.furInstancers, objTrackId, obj.vray.isVRayFur)
+
+        # The depsgraph instances may only change when some geometry is re-evaluated
+        if exporterCtx.dgUpdates['geometry']:
+            self.geomInstancers = self._getGeomInstancers(exporterCtx.dg)
+
+        self.incrementalUpdates += 1
+
+
+    def summary(self):
+        return f"{self.fullRebuilds} full rebuilds, {self.incrementalUpdates} incremental updates"
+
+
+    @staticmethod
+    def _getGeomInstancers(dg: bpy.types.Depsgraph):
+        return {getObjTrackId(i.parent) for i in dg.object_instances if i.is_instance and (i.parent is not None)}
+
+
+    @staticmethod
+    def _setMembership(ids: set, objTrackId: int, isMember: bool):
+        if isMember:
+            ids.add(objTrackId)
+        else:
+            ids.discard(objTrackId)
+
+
 class UIRegionContext:
     """ UI context in which a render job is started. Blender does not provide 
         UI context for IPR and production rendering so we capture the relevant 
@@ -377,38 +471,81 @@ class ExporterContext:
     def exportedMtls(self):
         return self.persistedState.exportedMtls
 
+    @property
+    def sceneMetadata(self):
+        return self.persistedState.sceneMetadata
+
     def calculateObjectVisibility(self):
         """ Fill the visibility and active instancers info into ExporterContext """
+        ts = self.ts or FakeTimeStats()
+        sceneIndex = self.persistedState.sceneIndex
+
+        updatedObjects, structureChanged = ts.timeThis("Classify depsgraph updates", lambda: self._classifyDepsgraphUpdates())
+
+        # The cached membership data can only be updated incrementally in interactive mode and when no objects
+        # have been added to or removed from the scene. Otherwise, rebuild it from scratch.
+        if self.fullExport or (not self.interactive) or structureChanged or not sceneIndex.valid:
+            ts.timeThis("Rebuild scene index", lambda: sceneIndex.rebuild(self))
+        else:
+            ts.timeThis("Update scene index", lambda: sceneIndex.update(self, updatedObjects))
 
-        # Compile a list of the active instancers in the scene. There are two types of instancers:
+        # There are three types of instancers:
         #   1. Legacy, set through Data Properties -> Instancing
         #   2. Objects made instancers through e.g. geometry nodes
         #   3. V-Ray Fur Objects (they are also instancers if they have instancers selected)
         # The depsgraph only includes the visible instancers. We need however a list of all instancers
         # in the scene in order to determine which ones to delete and which to only hide.
-        legacyInstancers = set((getObjTrackId(o) for o in self.sceneObjects if o.is_instancer))
-        instancers = set((getObjTrackId(i.parent) for i in self.dg.object_instances if i.is_instance and (i.parent is not None)))
-        furInstancers = set((getObjTrackId(o) for o in self.sceneObjects if o.vray.isVRayFur))
+        # Note: A new set is created on each call because it is compared to the one from the previous update.
+        self.activeInstancers = sceneIndex.geomInstancers.union(sceneIndex.legacyInstancers).union(sceneIndex.furInstancers)
 
-        self.activeInstancers = instancers.union(legacyInstancers).union(furInstancers)
+        # All objects in the scene, including objects from linked collections. We will need them
+        # in order to determine which objects can be deleted from the scene vs only be hidden.
+        self.allObjects = sceneIndex.allObjects
 
-        # Get a list of all objects in the scene, including objects from linked collections. We will
-        # need it in order to determine which objects can be deleted from the scene vs only be hidden.
-        self.allObjects = set([o for o in self.ctx.scene.objects])
+        self.sceneMetadata.beginExport(self.dgUpdates['transform'], self.dgUpdates['all'])
 
-        # Add objects from linked collections as they are not included in scene's depsgraph
-        linkedCollections = [c for c in bpy.data.collections if c.library is not None]
-        for c in linkedCollections:
-            self.allObjects.update(c.all_objects)
 
+    def _classifyDepsgraphUpdates(self):
+        """ Split the depsgraph updates by type in a single pass over dg.updates.
+
+            Returns:
+                tuple(list[bpy.types.Object], bool): the updated objects and whether the structure of the
+                    scene ( its collections or view layers ) has been updated
+        """
+        geometry = set()
+        transform = set()
+        shading = set()
+        allUpdates = set()
+        updatedObjects = []
+        structureChanged = False
+
+        for u in self.dg.updates:
+            id = u.id
+            sessionUid = id.original.session_uid
+            allUpdates.add(sessionUid)
+
+            if u.is_updated_geometry:
+                geometry.add(sessionUid)
+            if u.is_updated_transform:
+                transform.add(sessionUid)
+            if u.is_updated_shading:
+                shading.add(sessionUid)
+
+            match id.id_type:
+                case 'OBJECT':
+                    updatedObjects.append(id)
+                case 'SCENE' | 'COLLECTION':
+                    structureChanged = True
 
         self.dgUpdates = {
-            'geometry':  set((u.id.original.session_uid for u in self.dg.updates if u.is_updated_geometry)),
-            'transform': set((u.id.original.session_uid for u in self.dg.updates if u.is_updated_transform)),
-            'shading':   set((u.id.original.session_uid for u in self.dg.updates if u.is_updated_shading)),
-            'all':       set(u.id.original.session_uid for u in self.dg.updates)
+            'geometry':  geometry,
+            'transform': transform,
+            'shading':   shading,
+            'all':       allUpdates
         }
 
+        return updatedObjects, structureChanged
+
 
     def linkPluginToRenderChannel(self, pluginName: str, channelLinkAttr: str, renderChannelPlugin: AttrPlugin):
         """ Store information about a link from a plugin to a render channel, i.e. that the plugin
@@ -523,6 +660,10 @@ class PluginDesc:
         # how to export meta properties.
         self.node: bpy.types.Node = None
 
+        # Attribute updates accumulated during export and sent to the renderer in
+        # a single call by plugin_utils.flushAttrUpdates(). Items are (attrName, value, subtype, animatable).
+        self.pendingUpdates = []
+
 
     def resetAttribute(self, name):
         """ Reset a single attribute to its default (not set) state.
@@ -565,6 +706,11 @@ class PluginDesc:
         return name in self.attrs
 
 
+    def queueUpdate(self, attrName, value, subtype=None, animatable=True):
+        """ Queue a converted attribute value to be sent to the renderer with the next flush. """
+        self.pendingUpdates.append((attrName, value, subtype, animatable))
+
+
 class AttrPlugin:
     OUTPUT_UNDEFINED = None
     OUTPUT_DEFAULT   = ''
@@ -21,44 +21,59 @@ from dataclasses import dataclass
 
 NON_DEFAULT_EXPORTABLE_TYPES = [ "Node", "CameraDefault", "MtlSingleBRDF" ]
 
-def _getOverridesFor(ctx: ExporterContext, pluginType: str):
-    mode = "PRODUCTION"
+def _getExportMode(ctx: ExporterContext):
     if ctx.preview:
-        mode = "PREVIEW"
+        return "PREVIEW"
     elif ctx.interactive:
-        mode = "VIEWPORT"
+        return "VIEWPORT"
+    return "PRODUCTION"
 
-    return DEFAULTS_OVERRIDES.get(mode, {}).get(pluginType, {})
 
+def _getOverridesFor(mode: str, pluginType: str):
+    return (DEFAULTS_OVERRIDES.get(mode) or {}).get(pluginType, {})
 
-def _convertEnumValue(value):
-    # Enum attribute is being reset
-    if type(value) is AttrPlugin and value.isEmpty():
-        return value
 
-    # Attribute that takes a list of enums
-    if type(value) is list:
-        return [_convertEnumValue(v) for v in value]
+@dataclass
+class _ParamExportStep:
+    """ The part of a parameter's export that does not depend on the exported plugin instance. """
+    attrDesc: dict
+    attrName: str
+    attrType: str
+    animatable: bool
+    explicitOnly: bool      # Export only if the value is explicitly set in PluginDesc.attrs
+    hasOverride: bool       # A mode-specific override exists for the parameter
+    overrideValue: object = None
 
-    # Some enums, for whatever reason, are defined only as strings in AppSDK.
-    # Try the default conversion to int, if that doesn't work, try converting to string
-    with contextlib.suppress(ValueError):
-        return int(value)
-    return str(value)
 
+@dataclass
+class _ExportPlan:
+    """ Precompiled list of the parameters of a plugin type to export in a given render mode. """
+    steps: list
+    exportDefaults: bool    # Export the default value when no value is set for a parameter
+    propGroupAttrs: tuple   # The parameters whose values may be read from the plugin's property group
 
-def exportPluginParams(ctx: ExporterContext, pluginDesc: PluginDesc):
-    """ Export plugin from a pre-filled PluginDesc object.
 
-    Returns:
-        AttrPlugin: The exported plugin.
+# Cache of {(pluginType, mode): _ExportPlan}
+_EXPORT_PLANS = {}
+
+
+def clearExportPlans():
+    """ Invalidate the cached export plans. Call when plugin descriptions or overrides are (re)loaded. """
+    _EXPORT_PLANS.clear()
+
+
+def _compileExportPlan(pluginType: str, mode: str):
+    """ Create the export plan of a plugin type. All checks which depend only on the plugin description
+        and the render mode are done once here instead of on every export of the plugin.
     """
-    overriddenParams = _getOverridesFor(ctx, pluginDesc.type)
-    pluginModule = getPluginModule(pluginDesc.type)
+    overriddenParams = _getOverridesFor(mode, pluginType)
+    pluginModule = getPluginModule(pluginType)
 
     nonExportableParams = getNonExportablePluginProperties(pluginModule)
     pluginAnimatable = pluginModule.Options.get("animatable", True)
 
+    steps = []
+
     for attrDesc in pluginModule.Parameters:
         attrName = attrDesc['attr']
         attrType = attrDesc['type']
@@ -79,24 +94,79 @@ def exportPluginParams(ctx: ExporterContext, pluginDesc: PluginDesc):
         if attrType in attribute_types.NodeOutputTypes:
             continue
 
-        isExplicit = attrName in pluginDesc.attrs
+        # Type could be skipped, but mappedParams could contain a manually defined value for it.
+        # Attributes that should only be exported when their input socket is linked are handled the same way.
+        explicitOnly = (attrType in attribute_types.SkippedTypes) or \
+                        ((attrType in attribute_types.AllNodeInputTypes) and options.get('linked_only', False))
 
-        # Type could be skipped, but mappedParams could contain a manually defined value for it
-        if attrType in attribute_types.SkippedTypes and not isExplicit:
-            continue
+        steps.append(_ParamExportStep(
+            attrDesc      = attrDesc,
+            attrName      = attrName,
+            attrType      = attrType,
+            animatable    = (pluginAnimatable and options.get("animatable", pluginAnimatable)),
+            explicitOnly  = explicitOnly,
+            hasOverride   = attrName in overriddenParams,
+            overrideValue = overriddenParams.get(attrName)
+        ))
+
+    propGroupAttrs = tuple(step.attrName for step in steps if not (step.explicitOnly or step.hasOverride))
+
+    return _ExportPlan(steps, exportDefaults=(pluginType not in NON_DEFAULT_EXPORTABLE_TYPES), propGroupAttrs=propGroupAttrs)
+
+
+def _getExportPlan(pluginType: str, mode: str):
+    key = (pluginType, mode)
+    if (plan := _EXPORT_PLANS.get(key)) is None:
+        plan = _EXPORT_PLANS[key] = _compileExportPlan(pluginType, mode)
+    return plan
+
+
+def getPropGroupExportedAttrs(ctx: ExporterContext, pluginType: str):
+    """ Return the names of the parameters which exportPluginParams() reads from the property group
+        of a plugin when they are not set explicitly.
+    """
+    return _getExportPlan(pluginType, _getExportMode(ctx)).propGroupAttrs
+
+
+def _convertEnumValue(value):
+    # Enum attribute is being reset
+    if type(value) is AttrPlugin and value.isEmpty():
+        return value
+
+    # Attribute that takes a list of enums
+    if type(value) is list:
+        return [_convertEnumValue(v) for v in value]
+
+    # Some enums, for whatever reason, are defined only as strings in AppSDK.
+    # Try the default conversion to int, if that doesn't work, try converting to string
+    with contextlib.suppress(ValueError):
+        return int(value)
+    return str(value)
+
+
+def exportPluginParams(ctx: ExporterContext, pluginDesc: PluginDesc):
+    """ Export plugin from a pre-filled PluginDesc object.
+
+    Returns:
+        AttrPlugin: The exported plugin.
+    """
+    plan = _getExportPlan(pluginDesc.type, _getExportMode(ctx))
+
+    for step in plan.steps:
+        attrDesc = step.attrDesc
+        attrName = step.attrName
+
+        isExplicit = attrName in pluginDesc.attrs
 
-        # Skip attributes that should only be exported when their input socket is linked.
-        if attrType in attribute_types.AllNodeInputTypes \
-                and options.get('linked_only', False) \
-                and (not isExplicit):
+        if step.explicitOnly and (not isExplicit):
             continue
 
         value = None
 
-        if attrName in overriddenParams:
+        if step.hasOverride:
             # Use the mode-specific user override read from the per-rendering-mode overrides/*.json file.
-            value = overriddenParams[attrName]
-        elif attrName in pluginDesc.attrs:
+            value = step.overrideValue
+        elif isExplicit:
             # Use the value set from the export code for the plugin. If a node is created for the plugin,
             # the values of the node input sockets have already been added to the attrs collection.
             value = pluginDesc.getAttribute(attrName)
@@ -109,7 +179,7 @@ def exportPluginParams(ctx: ExporterContext, pluginDesc: PluginDesc):
             value = getattr(pluginDesc.vrayPropGroup, attrName, None)
 
         if value is None:
-            if pluginDesc.type in NON_DEFAULT_EXPORTABLE_TYPES:
+            if not plan.exportDefaults:
                 continue
             else:
                 value = attrDesc['default']
@@ -119,7 +189,7 @@ def exportPluginParams(ctx: ExporterContext, pluginDesc: PluginDesc):
             value = AttrPlugin()
 
         # Handle special attribute types
-        match attrType:
+        match step.attrType:
             case 'ENUM':
                 value = _convertEnumValue(value)
 
@@ -138,11 +208,12 @@ def exportPluginParams(ctx: ExporterContext, pluginDesc: PluginDesc):
 
                 # Resetting the 'tex_prop' because most plugins will use it instead of 'color_prop'.
                 if attrName == attrDesc['color_prop']:
-                    plugin_utils.updateValue(ctx.renderer, pluginDesc.name, attrDesc['tex_prop'], AttrPlugin())
+                    pluginDesc.queueUpdate(attrDesc['tex_prop'], AttrPlugin())
 
-        paramAnimatable = (pluginAnimatable and options.get("animatable", pluginAnimatable))
-        plugin_utils.updateValue(ctx.renderer, pluginDesc.name, attrName, attribute_utils.convertUIValueToVRay(attrDesc, value), animatable=paramAnimatable)
+        pluginDesc.queueUpdate(attrName, attribute_utils.convertUIValueToVRay(attrDesc, value), animatable=step.animatable)
 
+    # Send all attribute values of the plugin in one go
+    plugin_utils.flushAttrUpdates(ctx.renderer, pluginDesc)
 
     return AttrPlugin(pluginDesc.name, pluginType=pluginDesc.type)
 
@@ -439,4 +510,4 @@ def isObjectTreeUpdated(exporterCtx: ExporterContext, obj: bpy.types.Object):
     """ Check if the object's "OBJECT" node tree has been updated. """
     objTrackId = getObjTrackId(obj)
     return objTrackId in exporterCtx.dgUpdates['shading'] and \
-            exporterCtx.ctx.scene.vray.ActiveNodeEditorType == "OBJECT"
\ No newline at end of file
+            exporterCtx.ctx.scene.vray.ActiveNodeEditorType == "OBJECT"
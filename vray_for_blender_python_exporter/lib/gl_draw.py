@@ -4,30 +4,43 @@
 
 import gpu
 import numpy
+import time
 
 from gpu_extras.batch import batch_for_shader
 from vray_blender.lib.camera_utils import Size, ViewParams
+from vray_blender.bin import VRayBlenderLib as vray
 
 
 class DrawData:
-    """ DrawData uploads a texture to the GPU and draws it 
-        on demand as a screen quad
+    """ DrawData keeps the most recent viewport image in a persistent buffer, uploads it 
+        to the GPU and draws it on demand as a screen quad
     """
 
     # The shader is created just once
     shader = None
 
-    def __init__(self, image: numpy.ndarray, viewParams: ViewParams):
+    def __init__(self):
         # Target render size
-        self.imgW = image.shape[0]
-        self.imgH = image.shape[1]
-        self.viewParams = viewParams
-        
-        pixels = gpu.types.Buffer('FLOAT', image.shape[0] * image.shape[1] * image.shape[2], image.data)
+        self.imgW = 0
+        self.imgH = 0
+        self.viewParams: ViewParams = None
+
+        # The pixel buffer is reused for all images of the same size. The native library copies into it
+        # (through the numpy view) only the regions of the image updated since the last copy.
+        self.buffer: gpu.types.Buffer = None
+        self.pixels = numpy.empty((0, 0, 4), dtype=numpy.float32)
+        self.version = 0    # Version of the image held in the buffer, 0 if there is none
+
+        self.texture: gpu.types.GPUTexture = None
+
+        # The screen quad is rebuilt only when its position changes
+        self.batch = None
+        self.batchCoords = None
+
+        # Profiling info for the last upload
+        self.uploadTime = 0.0
+        self.uploadedFraction = 0.0 # Fraction of the image copied from the renderer
 
-        ## Generate texture
-        self.texture = gpu.types.GPUTexture((self.imgW, self.imgH), format='RGBA32F', data=pixels)
-       
         if not DrawData.shader:
             DrawData.shader = self.createScreenQuadShader()
 
@@ -36,6 +49,54 @@ class DrawData:
         del self.texture
 
 
+    def update(self, renderer, viewParams: ViewParams):
+        """ Upload the image if a new one has been received from the renderer.
+
+        Args:
+            renderer : The renderer to get the image from.
+            viewParams (ViewParams): The view parameters the image is drawn with.
+
+        Returns:
+            bool: True if a new image has been uploaded.
+        """
+        start = time.perf_counter()
+
+        if (result := vray.updateImageBuffer(renderer, self.pixels, self.version)) is None:
+            return False
+
+        version, w, h, x, y, regionW, regionH = result
+
+        if (w, h) != (self.imgW, self.imgH):
+            self._resize(w, h)
+            if (result := vray.updateImageBuffer(renderer, self.pixels, self.version)) is None:
+                return False
+            version, w, h, x, y, regionW, regionH = result
+
+        if (regionW == 0) or (regionH == 0):
+            # The image has been resized again after the buffer reallocation. Try on the next draw.
+            return False
+
+        self.version = version
+        self.viewParams = viewParams
+
+        # The texture cannot be updated in place through the gpu module, so it is recreated from the
+        # persistent buffer. This avoids any intermediate copies of the pixel data.
+        self.texture = gpu.types.GPUTexture((self.imgW, self.imgH), format='RGBA32F', data=self.buffer)
+
+        self.uploadTime = time.perf_counter() - start
+        self.uploadedFraction = (regionW * regionH) / (w * h)
+        return True
+
+
+    def _resize(self, w: int, h: int):
+        self.imgW = w
+        self.imgH = h
+        self.buffer = gpu.types.Buffer('FLOAT', w * h * 4)
+        self.pixels = numpy.asarray(self.buffer).reshape((h, w, 4))
+        self.version = 0
+        self.texture = None
+
+
     def createScreenQuadShader(self):
         """ Create a shader to draw the textured screen quad we need for displaying in the viewport
             images received from V-Ray.
@@ -110,18 +171,15 @@ class DrawData:
         rn = r * 2 - 1.0
         bn = b * 2 - 1.0
 
-        batch = batch_for_shader(
-            DrawData.shader, 'TRI_FAN',
-            {
-                "position": ((ln, bn), (rn, bn), (rn, tn), (ln, tn)),
-                "uv": ((0, 0), (1, 0), (1, 1), (0, 1)),
-            },
-        )
+        if (coords := (ln, tn, rn, bn)) != self.batchCoords:
+            self.batch = batch_for_shader(
+                DrawData.shader, 'TRI_FAN',
+                {
+                    "position": ((ln, bn), (rn, bn), (rn, tn), (ln, tn)),
+                    "uv": ((0, 0), (1, 0), (1, 1), (0, 1)),
+                },
+            )
+            self.batchCoords = coords
 
         DrawData.shader.uniform_sampler("image", self.texture)
-        batch.draw(DrawData.shader)
-        
-
-
-
-
+        self.batch.draw(DrawData.shader)
@@ -6,8 +6,11 @@
 from __future__ import annotations
 
 import bpy
+import contextlib
+import hashlib
 import json
 import mathutils
+import pickle
 from pathlib import Path
 import os
 
@@ -16,6 +19,7 @@ from vray_blender.lib import sys_utils
 from vray_blender.lib.defs import AttrPlugin, AttrListValue, AColor, ExporterContext, PluginDesc
 from vray_blender.exporting import tools
 from vray_blender.lib.names import Names
+from vray_blender.lib import condition_processor
 from vray_blender.lib.condition_processor import UIConditionCompiler
 from vray_blender.lib.lib_utils import getLightPluginType
 from collections import defaultdict
@@ -29,6 +33,12 @@ PLUGINS_DESC = {}
 # A map of {pluginType: [property_list]} with cross-object dependencies
 CROSS_DEPENDENCIES = {}
 
+# Version of the format of the plugin description cache. Increase it when the cached data changes.
+_DESC_CACHE_FORMAT = 1
+
+# Name of the plugin description cache file in the user config directory
+_DESC_CACHE_FILE = "plugins_desc.cache"
+
 # Key that serves to describe a comment into a *.custom.json plugin description
 DESC_COMMENT_KEY = "//Comment"
 
@@ -43,10 +53,46 @@ def getPluginsDescDir():
 
 
 def loadPluginDescriptions():
+    """ Load the plugin descriptions into PLUGINS_DESC. The merged descriptions and the generated
+        source of their UI conditions are read from the description cache if it is up to date,
+        otherwise they are parsed from the .json files and the cache is rewritten.
+
+        Returns:
+            int: The number of loaded plugin descriptions
+    """
+    timeStartupPhase = sys_utils.StartupConfig.timeStartupPhase
+
     descDirpath = Path(getPluginsDescDir())
+    descFiles = sorted(descDirpath.glob("*/*.json"))
+    cacheKey = _getDescCacheKey(descDirpath, descFiles)
 
-    loadedPlugins = 0
-    for descFile in descDirpath.glob("*/*.json"):
+    if (cached := timeStartupPhase("read_cache", lambda: _readDescCache(cacheKey))) is not None:
+        pluginDescs, conditionSources = cached
+        UIConditionCompiler.addConditionSources(conditionSources)
+    else:
+        pluginDescs = timeStartupPhase("parse_json", lambda: _parseDescFiles(descFiles))
+
+    # The compiled condition evaluators are stored in the descriptions and cannot be pickled,
+    # so serialize the descriptions before compiling them.
+    descsData = pickle.dumps(pluginDescs, protocol=pickle.HIGHEST_PROTOCOL) if cached is None else None
+
+    loadedPlugins = timeStartupPhase("compile_conditions", lambda: _compileDescs(pluginDescs))
+
+    if cached is None:
+        timeStartupPhase("write_cache", lambda: _writeDescCache(cacheKey, descsData, UIConditionCompiler.getConditionSources()))
+
+    return loadedPlugins
+
+
+def _parseDescFiles(descFiles: list[Path]):
+    """ Parse and merge the plugin description files.
+
+        Returns:
+            list[dict]: The plugin descriptions in the format used in PLUGINS_DESC
+    """
+    pluginDescs = {}
+
+    for descFile in descFiles:
         isBaseDesc = True
 
         if str(descFile).endswith(".custom.json"):
@@ -67,12 +113,10 @@ def loadPluginDescriptions():
         if not (pluginDesc := _loadDescFromFile(descFile, isBaseDesc)):
             continue
 
-        if pluginDesc.get('ID') in PLUGINS_DESC:
+        if pluginDesc.get('ID') in pluginDescs:
             # Already loaded
             continue
 
-        loadedPlugins += 1
-
         try:
             pluginID       = pluginDesc.get('ID')
             pluginParams   = pluginDesc.get('Parameters')
@@ -86,7 +130,7 @@ def loadPluginDescriptions():
             pluginNode     = pluginDesc.get('Node', {})
             pluginOutputs  = [p for p in pluginParams if p['type'].startswith('OUTPUT_')]
                             
-            pluginDesc = {
+            pluginDescs[pluginID] = {
                 # To match plugin interface
                 'DESC'         : pluginIDDesc,
                 'ID'           : pluginID,
@@ -101,17 +145,96 @@ def loadPluginDescriptions():
                 'Outputs'      : pluginOutputs,
                 'SocketPanels' : {}
             }
+        
+        except Exception as ex:
+            debug.printExceptionInfo(ex, f"Load plugin description from '{descFile}'. Plugin will not be available.")
+
+    return list(pluginDescs.values())
+
+
+def _compileDescs(pluginDescs: list[dict]):
+    """ Generate the UI condition evaluators of the plugin descriptions and add them to PLUGINS_DESC """
+    loadedPlugins = 0
 
+    for pluginDesc in pluginDescs:
+        if pluginDesc['ID'] in PLUGINS_DESC:
+            # Already loaded
+            continue
+
+        loadedPlugins += 1
+
+        try:
             UIConditionCompiler(pluginDesc).generateEvaluators()
             _loadSocketPanels(pluginDesc)
 
-            PLUGINS_DESC[pluginID] = pluginDesc
-        
+            PLUGINS_DESC[pluginDesc['ID']] = pluginDesc
         except Exception as ex:
-            debug.printExceptionInfo(ex, f"Load plugin description from '{descFile}'. Plugin will not be available.")
+            debug.printExceptionInfo(ex, f"Load plugin description '{pluginDesc['ID']}'. Plugin will not be available.")
 
     return loadedPlugins
 
+
+def _getDescCacheKey(descDirpath: Path, descFiles: list[Path]):
+    """ Return a key identifying the current state of the plugin description files. Any change to the files,
+        the add-on version or the code generating the cached data will produce a different key.
+    """
+    from vray_blender.version import getBuildVersionString
+
+    h = hashlib.sha1(f"{_DESC_CACHE_FORMAT}|{getBuildVersionString()}".encode('utf-8'))
+
+    sourceFiles = [Path(__file__), Path(condition_processor.__file__)]
+    for file in sourceFiles + descFiles:
+        stat = file.stat()
+        h.update(f"|{file.name if file in sourceFiles else file.relative_to(descDirpath)}:{stat.st_mtime_ns}:{stat.st_size}".encode('utf-8'))
+
+    return h.hexdigest()
+
+
+def _getDescCacheFile():
+    return os.path.join(sys_utils.getUserConfigDir(), _DESC_CACHE_FILE)
+
+
+def _readDescCache(cacheKey: str):
+    """ Read the plugin description cache.
+
+        Returns:
+            tuple[list[dict], dict] | None: The cached plugin descriptions and condition sources,
+                                            or None if the cache does not exist or is outdated.
+    """
+    cacheFile = _getDescCacheFile()
+    if not os.path.exists(cacheFile):
+        return None
+
+    try:
+        with open(cacheFile, 'rb') as file:
+            cache = pickle.load(file)
+
+        if cache.get('key') != cacheKey:
+            debug.printDebug("Plugin description cache is outdated")
+            return None
+
+        return pickle.loads(cache['descs']), cache['conditions']
+    except Exception as ex:
+        debug.printWarning(f"Failed to read plugin description cache {cacheFile}: {ex}")
+        return None
+
+
+def _writeDescCache(cacheKey: str, descsData: bytes, conditionSources: dict):
+    cacheFile = _getDescCacheFile()
+    tmpFile = f"{cacheFile}.{os.getpid()}.tmp"
+
+    try:
+        with open(tmpFile, 'wb') as file:
+            pickle.dump({ 'key': cacheKey, 'descs': descsData, 'conditions': conditionSources }, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Multiple Blender instances may start at the same time, replace the file atomically
+        os.replace(tmpFile, cacheFile)
+    except Exception as ex:
+        debug.printWarning(f"Failed to write plugin description cache {cacheFile}: {ex}")
+        with contextlib.suppress(OSError):
+            os.remove(tmpFile)
+
+
 # Remove 'comment' keys from Plugin description
 def _removeCommentsFromDesc(desc):
     if type(desc) is list:
@@ -354,6 +477,82 @@ def updateValue(renderer, pluginName, attrName, val, subtype=None, animatable=Tr
 
     return 1
 
+def toTypedValue(val, subtype=None):
+    """ Convert a value to the (typeCode, payload) form accepted by vray.pluginUpdateBatch.
+        The type dispatch mirrors the one in updateValue().
+
+        Returns:
+            tuple | None: The typed value or None if the type of the value is not supported.
+    """
+    if type(val) is bool or type(val) is int:
+        return ('i', int(val))
+
+    elif type(val) is float:
+        return ('f', val)
+
+    elif type(val) is str:
+        return ('s', val)
+
+    elif type(val) is mathutils.Matrix:
+        if len(val.col) == 4:
+            return ('t', tools.mat4x4ToTuple(val))
+        elif len(val.col) == 3:
+            return ('m', tools.mat3x3ToTuple(val))
+        raise Exception(f"plugin_utils.py: Wrong matrix dimensions: {val.row}x{val.col}")
+
+    elif type(val) is mathutils.Vector:
+        return ('v', (val.x, val.y, val.z))
+
+    elif type(val) is mathutils.Color:
+        if subtype:
+            return ('a', (val.r, val.g, val.b, 1.0))
+        return ('c', (val.r, val.g, val.b))
+
+    elif type(val) is AColor:
+        return ('a', (val.r, val.g, val.b, val.a))
+
+    elif type(val) is list:
+        if len(val) == 0:
+            return ('r', None)
+        elif type(val[0]) is str:
+            return ('S', val)
+        elif type(val[0]) is int:
+            return ('I', val)
+        elif type(val[0]) is float:
+            return ('F', val)
+        elif type(val[0]) is AttrPlugin:
+            # See updateValue() for why the output is set to empty.
+            return ('P', [vray.AttrPlugin(p.name, '') for p in val])
+
+    elif type(val) is AttrPlugin:
+        return ('p', (_attrPluginToVRay(val), val.forceUpdate))
+
+    elif type(val) is AttrListValue:
+        return ('l', (val.attrList, val.attrType))
+
+    return None
+
+
+def flushAttrUpdates(renderer, pluginDesc: PluginDesc):
+    """ Send all attribute updates queued in pluginDesc to the renderer with a single call. """
+    if not pluginDesc.pendingUpdates:
+        return
+
+    batch = []
+    for attrName, val, subtype, animatable in pluginDesc.pendingUpdates:
+        if (typedValue := toTypedValue(val, subtype)) is None:
+            if type(val) is list:
+                debug.printError(f"List type not registered with exporter: List[{type(val[0]).__name__}], pluginName: {pluginDesc.name}, attr: {attrName}")
+            else:
+                debug.printError(f"Type not registered with exporter: {type(val)}, pluginName: {pluginDesc.name}, attr: {attrName}")
+            continue
+
+        batch.append((attrName, typedValue, animatable))
+
+    pluginDesc.pendingUpdates = []
+    vray.pluginUpdateBatch(renderer, pluginDesc.name, batch)
+
+
 def objectToAttrPlugin(obj: bpy.types.Object):
     """ Constructs an AttrPlugin for a scene object. """
 
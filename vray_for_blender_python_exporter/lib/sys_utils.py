@@ -258,6 +258,9 @@ class StartupConfig:
     logLevel = None         # Override the startup log level. It will be in effect
                             #   until a scene is loaded, when the log level will be
                             #   set to the value saved in the scene.
+    startupReport = False   # If True, print the time taken by each add-on startup phase
+    eagerRegistration = False # If True, register all plugin property groups at startup
+    startupTimes = None     # TimeStats collecting the durations of the add-on startup phases
 
     @staticmethod
     def init():
@@ -269,6 +272,16 @@ class StartupConfig:
         StartupConfig.zmqServerFolder = StartupConfig._getParamValue('--vray-server-folder')
         StartupConfig.zmqServerLog = StartupConfig._getParamValue('--dumpInfoLog')
         StartupConfig.logLevel = StartupConfig._getParamValue('--vray-log-level')
+        StartupConfig.startupReport = '--vray-startup-report' in sys.argv
+        StartupConfig.eagerRegistration = '--vray-eager-registration' in sys.argv
+
+
+    @staticmethod
+    def timeStartupPhase(phase: str, fn):
+        """ Run fn, recording its duration as the startup phase 'phase' if startup timing is enabled. """
+        if StartupConfig.startupTimes is None:
+            return fn()
+        return StartupConfig.startupTimes.timeThis(phase, fn)
 
       
     @staticmethod
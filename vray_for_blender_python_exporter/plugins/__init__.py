@@ -15,6 +15,7 @@ from vray_blender.lib import class_utils
 from vray_blender.lib import sys_utils
 from vray_blender.lib import attribute_utils, plugin_utils, sys_utils
 from vray_blender.lib.mixin import VRayEntity
+from vray_blender.plugins.skipped_plugins import SKIPPED_PLUGINS
 from vray_blender.nodes.utils import selectedObjectTagUpdate
 
 
@@ -100,9 +101,36 @@ def addAttributes(pluginModule, pointerProp):
         class_utils.registerPluginPropertyGroup(pointerProp, pluginModule)
 
 
+def _canDeferPropertyGroup(pluginModule, pointerProp):
+    """ Return True if the registration of the plugin's property group may be postponed until
+        it is first used. This is only safe for JSON-only plugins that do not get a node class
+        and whose property group is not attached to a Blender type, because nothing stored
+        in a .blend file or drawn in the UI refers to it directly.
+    """
+    return (not sys_utils.StartupConfig.eagerRegistration) \
+            and (pointerProp is None) \
+            and isinstance(pluginModule, type) \
+            and (pluginModule.ID in SKIPPED_PLUGINS)
+
+
 def _loadPluginAttributes(plugins, pointerProp):
+    """ Register the property groups of plugins, deferring the ones that are not needed at startup.
+
+        Returns:
+            int: The number of property groups registered at startup
+    """
+    registered = 0
+
     for pluginName in plugins:
-        addAttributes(plugins[pluginName], pointerProp)
+        pluginModule = plugins[pluginName]
+
+        if _canDeferPropertyGroup(pluginModule, pointerProp):
+            class_utils.deferPluginPropertyGroup(pluginModule)
+        else:
+            addAttributes(pluginModule, pointerProp)
+            registered += 1
+
+    return registered
 
 
 def _getPluginsDir():
@@ -164,6 +192,10 @@ def _loadAttributeOverrides(mode: str, file: str):
     try:
         overrides = sys_utils.readOverrides(file)
         DEFAULTS_OVERRIDES[mode] = json.loads(overrides) if overrides != "" else None
+
+        # Export plans contain the overridden values
+        from vray_blender.lib import export_utils
+        export_utils.clearExportPlans()
     except Exception as ex:
         # TODO: use the logging subsys methods when refactored as by
         # https://jira-chaos.atlassian.net/browse/VBLD-464
@@ -724,6 +756,42 @@ def _getRegClasses():
     )
 
 
+def _registerPluginModules():
+    """ Register the plugin modules. Returns a {name: class} dict with the classes they export. """
+    pluginClasses = {}
+
+    for pluginName in PLUGIN_MODULES:
+        plugin = PLUGIN_MODULES[pluginName]
+        if hasattr(plugin, 'getRegClasses'):
+            for pluginClass in plugin.getRegClasses():
+                pluginClasses[pluginClass.__name__] = pluginClass
+        if hasattr(plugin, 'register'):
+            plugin.register()
+
+    return pluginClasses
+
+
+def _loadAllPluginAttributes():
+    """ Returns the number of property groups registered at startup """
+    registered = 0
+
+    registered += _loadPluginAttributes(PLUGINS['CAMERA'],        VRayCamera)
+    registered += _loadPluginAttributes(PLUGINS['BRDF'],          None)
+    registered += _loadPluginAttributes(PLUGINS['MATERIAL'],      None)
+    registered += _loadPluginAttributes(PLUGINS['GEOMETRY'],      VRayMesh)
+    registered += _loadPluginAttributes(PLUGINS['LIGHT'],         VRayLight)
+    registered += _loadPluginAttributes(PLUGINS['OBJECT'],        VRayObject)
+    registered += _loadPluginAttributes(PLUGINS['RENDERCHANNEL'], VRayRenderChannel)
+    registered += _loadPluginAttributes(PLUGINS['EFFECT'],        None)
+    registered += _loadPluginAttributes(PLUGINS['SETTINGS'],      VRayScene)
+    registered += _loadPluginAttributes(PLUGINS['SYSTEM'],        VRayScene)
+    registered += _loadPluginAttributes(PLUGINS['TEXTURE'],       None)
+    registered += _loadPluginAttributes(PLUGINS['UVWGEN'],        None)
+    registered += _loadPluginAttributes(PLUGINS['MISC'],          None)
+
+    return registered
+
+
 def register():
     global PLUGINS
     global PLUGIN_MODULES
@@ -731,13 +799,15 @@ def register():
     from vray_blender.plugins import templates
     templates.register()
 
+    timeStartupPhase = sys_utils.StartupConfig.timeStartupPhase
+
     # Load plugin descriptions from the json definition files exported from Vray
-    if plugin_utils.loadPluginDescriptions() == 0:
+    if timeStartupPhase("descriptions", plugin_utils.loadPluginDescriptions) == 0:
         debug.printError('Failed to load JSON plugin descriptions')
         raise IOError('Failed to load JSON plugin descriptions')
 
     # Load plugins for which per-plugin .py modules exist
-    _loadPlugins()
+    timeStartupPhase("plugin_modules", _loadPlugins)
 
     # Load the rest of the plugins ( which only have plugin descriptions, but no
     # customized functionality in .py modules )
@@ -787,29 +857,12 @@ def register():
 
     # Register properties
     #
-    pluginClasses = {}
+    pluginClasses = timeStartupPhase("plugin_register", _registerPluginModules)
+    registeredPropGroups = timeStartupPhase("plugin_attributes", _loadAllPluginAttributes)
 
-    for pluginName in PLUGIN_MODULES:
-        plugin = PLUGIN_MODULES[pluginName]
-        if hasattr(plugin, 'getRegClasses'):
-            for pluginClass in plugin.getRegClasses():
-                pluginClasses[pluginClass.__name__] = pluginClass
-        if hasattr(plugin, 'register'):
-            plugin.register()
-
-    _loadPluginAttributes(PLUGINS['CAMERA'],        VRayCamera)
-    _loadPluginAttributes(PLUGINS['BRDF'],          None)
-    _loadPluginAttributes(PLUGINS['MATERIAL'],      None)
-    _loadPluginAttributes(PLUGINS['GEOMETRY'],      VRayMesh)
-    _loadPluginAttributes(PLUGINS['LIGHT'],         VRayLight)
-    _loadPluginAttributes(PLUGINS['OBJECT'],        VRayObject)
-    _loadPluginAttributes(PLUGINS['RENDERCHANNEL'], VRayRenderChannel)
-    _loadPluginAttributes(PLUGINS['EFFECT'],        None)
-    _loadPluginAttributes(PLUGINS['SETTINGS'],      VRayScene)
-    _loadPluginAttributes(PLUGINS['SYSTEM'],        VRayScene)
-    _loadPluginAttributes(PLUGINS['TEXTURE'],       None)
-    _loadPluginAttributes(PLUGINS['UVWGEN'],        None)
-    _loadPluginAttributes(PLUGINS['MISC'],          None)
+    if sys_utils.StartupConfig.startupReport:
+        debug.printInfo(f"Plugin property groups: {registeredPropGroups} registered at startup, "
+                        f"{class_utils.getDeferredPropertyGroupsCount()} deferred until first use")
 
     _loadAttributeOverrides("PREVIEW", "preview.json")
     _loadAttributeOverrides("VIEWPORT", "viewport.json")
@@ -1039,6 +1092,10 @@ def unregister():
         del plug
 
     plugin_utils.PLUGINS_DESC.clear()
+    class_utils.clearDeferredPropertyGroups()
+
+    from vray_blender.lib import export_utils
+    export_utils.clearExportPlans()
 
     from vray_blender.plugins import templates
     templates.unregister()
@@ -37,10 +37,6 @@ def getVRayDecalPluginName(obj: bpy.types.Object):
     return Names.pluginObject("vraydecal", Names.object(obj))
 
 
-def isPluginVRayDecal(pluginName: str):
-    return pluginName.startswith('vraydecal@')
-
-
 def getDecalPropGroup(obj: bpy.types.Object):
     assert isObjectVRayDecal(obj)
 
@@ -71,7 +71,7 @@ def exportCustom(ctx: ExporterContext, pluginDesc: PluginDesc):
             })
             
             if lightObj := ctx.objectContext.get():
-                if userAttributes := lightObj.vray.UserAttributes.getAsString():
+                if userAttributes := ctx.sceneMetadata.getUserAttributes(lightObj):
                     pluginDesc.setAttribute('user_attributes', userAttributes)
             else:
                 debug.printError(f"LightMesh {baseName} has no object context set. User attributes not exported.")
@@ -14,7 +14,7 @@ from vray_blender.lib import export_utils, plugin_utils
 from vray_blender.lib.blender_utils import getObjectFromEditorContext
 from vray_blender.nodes.utils import getNodeOfPropGroup
 from vray_blender.vray_tools.vrmat_parser import getMaterialNamesFromVRMatFile
-from vray_blender.vray_tools.vrscene_parser import getMaterialNamesFromVRScene
+from vray_blender.vray_tools.vrscene_parser import getMaterialNamesFromVRScene, VrsceneParseError
 
 
 plugin_utils.loadPluginOnModule(globals(), __name__)
@@ -82,7 +82,10 @@ def _getMaterialNamesFromMtlFile(fileName):
     if os.path.exists(filePath):
         match pathlib.Path(filePath).suffix:
             case ".vrscene":
-                return getMaterialNamesFromVRScene(filePath)
+                try:
+                    return getMaterialNamesFromVRScene(filePath)
+                except VrsceneParseError as e:
+                    debug.printError(f"Failed to read material names from '{filePath}': {e}")
             case ".vrmat" | ".vismat":
                 return getMaterialNamesFromVRMatFile(filePath)
             case ".mtlx":
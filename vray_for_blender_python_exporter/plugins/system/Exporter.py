@@ -265,6 +265,15 @@ class VRayExporter(bpy.types.PropertyGroup):
         default = True
     )
 
+    animation_export_look_ahead: bpy.props.IntProperty(
+        name = "Export Look-Ahead",
+        description = "Number of animation frames to export while the current frame is being rendered. "
+                      "0 exports each frame after the previous one has been rendered. Not used with motion blur",
+        default = 0,
+        min = 0,
+        max = 16
+    )
+
     animationSettingsVrsceneExport: bpy.props.PointerProperty(
         type=AnimationSettingsVrsceneExport
     )
@@ -364,6 +373,15 @@ class VRayExporter(bpy.types.PropertyGroup):
         options = set()
     )
 
+    export_memory_limit: bpy.props.IntProperty(
+        name = "Export Memory Limit",
+        description = "The maximum amount of geometry data in MB held in memory while it is being sent to V-Ray. The export waits for the data to be sent when the limit is reached. Set to 0 to disable the limit",
+        default = 4096,
+        min = 0,
+        soft_max = 65536,
+        options = set()
+    )
+
     lower_thread_priority: bpy.props.BoolProperty(
         name = "Lower Thread Priority",
         description = "Use lower thread priority for rendering. Helps reduce Windows issues (like freezing) during CPU-intensive tasks.",
@@ -136,6 +136,10 @@ class VRAY_PT_FrameRange(classes.VRayOutputPanel):
         else:
             col.prop(vrayExporter, "frames_list")
 
+        col = layout.column()
+        col.enabled = vrayExporter.animation_mode == 'ANIMATION'
+        col.prop(vrayExporter, "animation_export_look_ahead")
+
 class VRAY_PT_TimeStretching(classes.VRayOutputPanel):
     bl_label = "Time Stretching"
     bl_parent_id = "VRAY_PT_FrameRange"
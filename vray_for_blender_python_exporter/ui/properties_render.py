@@ -262,6 +262,7 @@ class VRAY_PT_Performance(classes.VRayRenderPanel):
         row = layout.row()
         row.enabled = vrayExporter.use_custom_thread_count == 'FIXED'
         row.prop(vrayExporter, 'custom_thread_count', text='Threads')
+        layout.prop(vrayExporter, 'export_memory_limit', text='Export Memory Limit (MB)')
         if platform.system() != "Linux":
             layout.separator()
             layout.prop(vrayExporter, 'lower_thread_priority', text='Lower Thread Priority')
@@ -2,7 +2,12 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import base64
 import os
+import re
+import zlib
+
+import numpy as np
 
 if __name__ == '__main__':
     from vray_blender.external.pyparsing import Literal, CaselessLiteral, Word, Keyword
@@ -172,8 +177,386 @@ nameParser.ignore(dblSlashComment)
 nameParser.ignore(cStyleComment)
 
 
+###################################################################
+## Streaming parser
+###################################################################
+
+class VrsceneParseError(Exception):
+    pass
+
+
+_TOKEN_RE = re.compile(r"""
+      (?P<ws>\s+)
+    | (?P<comment>//[^\n]*|/\*.*?\*/|(?m:^\#[^\n]*))
+    | (?P<punct>[(){}=;,*])
+    | (?P<word>[^\s(){}=;,*"/]+)
+""", re.VERBOSE | re.DOTALL)
+
+# Text in a plugin body which contains no braces, strings or comments
+_SKIP_RE = re.compile(r'[^{}"/]+')
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+_INT_RE   = re.compile(r"[+-]?\d+$")
+_FLOAT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$")
+_RANGE_RE = re.compile(r"([+-]?\d+(?:\.\d*)?)-(\d+(?:\.\d*)?)$")
+
+# Element type and number of components of the decoded hex lists
+_HEX_LIST_TYPES = {
+    'ListIntHex'    : (np.int32, 1),
+    'ListFloatHex'  : (np.float32, 1),
+    'ListVectorHex' : (np.float32, 3),
+    'ListColorHex'  : (np.float32, 3),
+}
+
+
+def _toNumber(text: str):
+    return int(text) if _INT_RE.match(text) else float(text)
+
+
+class _Tokenizer:
+    """ Splits a text stream into (kind, text) tokens, reading it in chunks. Whitespace and
+        comments are skipped.
+    """
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, file):
+        self.file = file
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.readSize = self.CHUNK_SIZE
+        self.peeked = None
+
+
+    def _fill(self):
+        chunk = self.file.read(self.readSize)
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+
+        # A single token (e.g. a hex list) may span many chunks. Grow the read size
+        # so that reading it does not take a quadratic number of buffer copies.
+        self.readSize *= 2
+
+
+    def _read(self):
+        while True:
+            if self.pos >= len(self.buf):
+                if self.eof:
+                    return None
+                self._fill()
+                continue
+
+            if self.buf[self.pos] == '"':
+                return self._readString()
+
+            m = _TOKEN_RE.match(self.buf, self.pos)
+
+            # A token ending at the end of the buffer may continue in the next chunk
+            if (m is None) or ((m.end() == len(self.buf)) and not self.eof):
+                if self.eof:
+                    raise VrsceneParseError(f"Unexpected input: {self.buf[self.pos:self.pos + 50]!r}")
+                self._fill()
+                continue
+
+            self.pos = m.end()
+            self.readSize = self.CHUNK_SIZE
+
+            if (kind := m.lastgroup) not in ('ws', 'comment'):
+                return kind, m.group()
+
+
+    def _readString(self):
+        """ Read a quoted string. Strings may be very large (e.g. hex lists), so the closing quote
+            is searched for without rescanning the part of the string which has already been read.
+        """
+        searchFrom = self.pos + 1
+
+        while True:
+            end = self.buf.find('"', searchFrom)
+
+            if end == -1:
+                if self.eof:
+                    raise VrsceneParseError("Unterminated string")
+                scanned = len(self.buf) - self.pos
+                self._fill()
+                searchFrom = self.pos + scanned
+                continue
+
+            # Skip escaped quotes
+            backslashes = 0
+            while self.buf[end - backslashes - 1] == '\\':
+                backslashes += 1
+
+            if backslashes % 2:
+                searchFrom = end + 1
+                continue
+
+            text = self.buf[self.pos:end + 1]
+            self.pos = end + 1
+            self.readSize = self.CHUNK_SIZE
+            return 'string', text
+
+
+    def skipBlock(self):
+        """ Skip the rest of a block whose opening brace has already been read. This is much faster
+            than reading the individual tokens of the block.
+        """
+        assert self.peeked is None
+        depth = 1
+
+        while depth:
+            if self.pos >= len(self.buf):
+                if self.eof:
+                    raise VrsceneParseError("Unexpected end of file")
+                self._fill()
+                continue
+
+            match self.buf[self.pos]:
+                case '"':
+                    self._readString()
+                case '{':
+                    depth += 1
+                    self.pos += 1
+                case '}':
+                    depth -= 1
+                    self.pos += 1
+                case '/':
+                    m = _COMMENT_RE.match(self.buf, self.pos)
+                    mayContinue = (m is not None and m.end() == len(self.buf)) \
+                                    or (m is None and self.buf.startswith('/*', self.pos)) \
+                                    or (self.pos + 1 == len(self.buf))
+
+                    if mayContinue and not self.eof:
+                        # The comment may continue in the next chunk
+                        self._fill()
+                        continue
+
+                    self.pos = m.end() if m else self.pos + 1
+                case _:
+                    self.pos = _SKIP_RE.match(self.buf, self.pos).end()
+
+        self.readSize = self.CHUNK_SIZE
+
+
+    def next(self):
+        if (tok := self.peeked) is not None:
+            self.peeked = None
+            return tok
+        return self._read()
+
+
+    def peek(self):
+        if self.peeked is None:
+            self.peeked = self._read()
+        return self.peeked
+
+
+    def expect(self, text):
+        tok = self.next()
+        if (tok is None) or (tok[1] != text):
+            raise VrsceneParseError(f"Expected '{text}', got {tok[1] if tok else 'end of file'!r}")
+
+
+def _decodeHexList(listType: str, data: str):
+    """ Decode the data of a ListXXXHex value to a NumPy array.
+
+        The data is either a hex string of the raw little-endian values or a compressed block:
+        'ZIPC' | uncompressed size (8 hex chars) | compressed size (8 hex chars) | base64 zlib data
+        'ZIPB' | uncompressed size (8 hex chars) | compressed size (8 hex chars) | hex zlib data
+    """
+    dtype, components = _HEX_LIST_TYPES[listType]
+
+    if data.startswith('ZIPC'):
+        raw = zlib.decompress(base64.b64decode(data[20:]))
+    elif data.startswith('ZIPB'):
+        raw = zlib.decompress(bytes.fromhex(data[20:]))
+    else:
+        raw = bytes.fromhex(data)
+
+    arr = np.frombuffer(raw, dtype=np.dtype(dtype).newbyteorder('<'))
+    return arr.reshape(-1, components) if components > 1 else arr
+
+
+class _PluginReader:
+    """ Reads plugin definitions from a token stream """
+
+    def __init__(self, tokenizer: _Tokenizer, decodeHex: bool):
+        self.tok = tokenizer
+        self.decodeHex = decodeHex
+        self.lastTypeName = None    # Type of the last value read by _readValue(), None for plain values
+
+
+    def _readArgs(self, readItem = None):
+        """ Read a parenthesized, comma-separated list of values. The opening parenthesis
+            has already been read.
+        """
+        readItem = readItem or self._readValue
+        args = []
+
+        if self.tok.peek() == ('punct', ')'):
+            self.tok.next()
+            return args
+
+        while True:
+            args.append(readItem())
+
+            tok = self.tok.next()
+            if tok == ('punct', ')'):
+                return args
+            if tok != ('punct', ','):
+                raise VrsceneParseError(f"Expected ',' or ')', got {tok[1] if tok else 'end of file'!r}")
+
+
+    def _readValue(self):
+        self.lastTypeName = None
+        tok = self.tok.next()
+        if tok is None:
+            raise VrsceneParseError("Unexpected end of file")
+
+        kind, text = tok
+
+        if kind == 'string':
+            return text[1:-1]
+
+        if tok == ('punct', '('):
+            return tuple(self._readArgs())
+
+        if kind != 'word':
+            raise VrsceneParseError(f"Unexpected '{text}'")
+
+        if self.tok.peek() == ('punct', '('):
+            self.tok.next()
+            value = self._readTypedValue(text)
+            self.lastTypeName = text
+            return value
+
+        if _INT_RE.match(text):
+            return int(text)
+        if _FLOAT_RE.match(text):
+            return float(text)
+        if m := _RANGE_RE.match(text):
+            # Frame range, e.g. 1-10
+            return (_toNumber(m.group(1)), _toNumber(m.group(2)))
+
+        # Plugin name, optionally with an output (plugin::output)
+        return text
+
+
+    def _readList(self):
+        """ Read the items of a List(...) value. The opening parenthesis has already been read.
+
+            The pyparsing grammar which this parser replaced returned the unsigned integers in a List
+            of plugin names and numbers as strings, because they are valid plugin names as well.
+            The importer relies on this, so it is kept. Lists with nested values ( map channels,
+            instances ) have int items.
+        """
+        digitItems = []     # Indices of the unsigned integer items
+        flat = True
+        count = 0
+
+        def readItem():
+            nonlocal flat, count
+            kind, text = self.tok.peek() or (None, None)
+            count += 1
+
+            if (kind == 'word') and text.isdigit():
+                self.tok.next()
+                digitItems.append(count - 1)
+                return text
+
+            value = self._readValue()
+            # Apart from names and numbers, the grammar only allowed AColor values in a List
+            if self.lastTypeName is None:
+                flat = flat and (kind == 'word') and not isinstance(value, tuple)
+            else:
+                flat = flat and (self.lastTypeName == 'AColor')
+            return value
+
+        items = self._readArgs(readItem)
+
+        if not flat:
+            for i in digitItems:
+                items[i] = int(items[i])
+
+        return tuple(items)
+
+
+    def _readTypedValue(self, typeName):
+        if typeName == 'List':
+            return self._readList()
+
+        args = self._readArgs()
+
+        match typeName:
+            case 'Color':
+                # The optional multiplier is not part of the value
+                if self.tok.peek() == ('punct', '*'):
+                    self.tok.next()
+                    self._readValue()
+                return tuple(args)
+
+            case 'TransformHex':
+                return args[0]
+
+            case 'interpolate':
+                # Only the value for the first key frame is used
+                return args[0][1] if args else None
+
+            case _ if typeName in _HEX_LIST_TYPES:
+                return _decodeHexList(typeName, args[0]) if self.decodeHex else args[0]
+
+            case _:
+                # AColor, Vector, Matrix, Transform and the non-hex typed lists
+                return tuple(args)
+
+
+    def readPlugins(self, headersOnly: bool):
+        while (tok := self.tok.next()) is not None:
+            pluginType = tok[1]
+            if (nameTok := self.tok.next()) is None:
+                raise VrsceneParseError(f"Missing name of plugin of type '{pluginType}'")
+
+            pluginName = nameTok[1]
+            self.tok.expect('{')
+
+            attrs = {}
+
+            if headersOnly:
+                self.tok.skipBlock()
+            else:
+                while (tok := self.tok.next()) != ('punct', '}'):
+                    if tok is None:
+                        raise VrsceneParseError(f"Unexpected end of file in plugin '{pluginName}'")
+                    self.tok.expect('=')
+                    attrs[tok[1]] = self._readValue()
+                    self.tok.expect(';')
+
+            yield {
+                "ID" : pluginType,
+                "Name" : pluginName,
+                "Attributes" : attrs,
+            }
+
+
+def iterVrscene(filePath, headersOnly = False, decodeHex = False):
+    """ Read the plugins from a .vrscene file one at a time.
+
+        Args:
+            filePath (str): path to the .vrscene file
+            headersOnly (bool): only read the types and names of the plugins, 'Attributes' will be empty
+            decodeHex (bool): decode ListXXXHex values to NumPy arrays. By default they are returned as
+                              the hex strings found in the file, like parseVrscene() always did.
+
+        Yields:
+            dict: {"ID": plugin type, "Name": plugin name, "Attributes": {name: value}}
+    """
+    with open(filePath, "r") as file:
+        yield from _PluginReader(_Tokenizer(file), decodeHex).readPlugins(headersOnly)
+
+
 def parseVrscene(filePath):
-    vrsceneDict = list(sceneDesc.parseString(open(filePath, "r").read()))
+    vrsceneDict = list(iterVrscene(filePath))
     vrsceneDict.append({
         "ID" : 'ImportSettings',
         "Name" : "Import Settings",
@@ -187,15 +570,11 @@ def parseVrscene(filePath):
 
 def getMaterialNamesFromVRScene(filePath):
     materialPluginNames = []
-    with open(filePath, "r") as f:
-        for l in f:
-            result = nameParser.parseString(l)
-            if result:
-                res = result[0]
-                if res[0].startswith("Mtl"):
-                    if res[1] == 'MANOMATERIALISSET':
-                        continue
-                    materialPluginNames.append(res[1])
+    for pluginDesc in iterVrscene(filePath, headersOnly=True):
+        if pluginDesc['ID'].startswith("Mtl"):
+            if pluginDesc['Name'] == 'MANOMATERIALISSET':
+                continue
+            materialPluginNames.append(pluginDesc['Name'])
     return materialPluginNames
 
 
@@ -0,0 +1,15 @@
+// SPDX-FileCopyrightText: Chaos Software EOOD
+//
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+#pragma once
+
+
+namespace VrayZmqWrapper {
+
+/// Marker written in place of the element count of a list whose data is sent as
+/// a separate frame of the same ZMQ message ( see serializeMessageFrames() ).
+/// Element counts are never negative.
+static const int FRAME_DATA_MARKER = -2;
+
+} // namespace VrayZmqWrapper
@@ -10,6 +10,7 @@
 #include <vector>
 
 #include "cppzmq/zmq.hpp"
+#include "cppzmq/zmq_addon.hpp"
 #include "base_types.h"
 #include "zmq_serializer.hpp"
 #include "zmq_deserializer.hpp"
@@ -130,10 +131,25 @@ static DeserializerStream& operator&& (DeserializerStream& s, Type& msg) {\
 #define PARAM(param) && msg.param
 
 
+/// Lists of at least this many bytes are sent as separate frames by serializeMessageFrames().
+static const size_t FRAME_THRESHOLD = 64 * 1024;
+
+
+/// Compute the size of a serialized protocol message including its type, without serializing it.
+template <typename TMsg>
+static size_t measureMessage(const TMsg& msg, size_t frameThreshold = 0) {
+	SerializerStream counter(frameThreshold);
+	counter.measureOnly();
+	counter && msg.getType() && msg;
+	return counter.getSize();
+}
+
+
 /// Serialize a protocol message including its type.
 template <typename TMsg>
 static zmq::message_t serializeMessage(const TMsg& msg) {
 	SerializerStream *stream = new SerializerStream();
+	stream->reserve(measureMessage(msg));
 	(*stream) && msg.getType() && msg;
 
 	// Transfer ownership of the stream serializer to the zmq message itself to avoid copying the
@@ -144,6 +160,56 @@ static zmq::message_t serializeMessage(const TMsg& msg) {
 	}, stream);
 }
 
+
+/// Serialize a protocol message including its type as a multi-frame message. The data of large
+/// POD lists is not copied. Each list is sent as a separate frame which references the list data
+/// and holds a reference to the list until the frame is sent. The lists must not be modified
+/// in the meantime.
+/// The first frame is the message itself, use frameDeserializer() to read the message back.
+/// @param frameThreshold - the minimum size in bytes of a list to send as a separate frame
+template <typename TMsg>
+static zmq::multipart_t serializeMessageFrames(const TMsg& msg, size_t frameThreshold = FRAME_THRESHOLD) {
+	SerializerStream *stream = new SerializerStream(frameThreshold);
+	stream->reserve(measureMessage(msg, frameThreshold));
+	(*stream) && msg.getType() && msg;
+
+	auto frames = std::move(stream->getFrames());
+
+	zmq::multipart_t result;
+	result.add(zmq::message_t(stream->getData(), stream->getSize(), [](void*, void* streamPtr) {
+		delete reinterpret_cast<SerializerStream*>(streamPtr);
+	}, stream));
+
+	for (auto& frame : frames) {
+		// The frame owns a reference to the list for as long as zmq needs its data.
+		auto owner = new std::shared_ptr<const void>(std::move(frame.owner));
+		result.add(zmq::message_t(const_cast<void*>(frame.data), frame.size, [](void*, void* ownerPtr) {
+			delete reinterpret_cast<std::shared_ptr<const void>*>(ownerPtr);
+		}, owner));
+	}
+
+	return result;
+}
+
+
+/// Create a deserializer for a message produced by serializeMessageFrames().
+/// The frames must outlive the returned stream.
+/// @param frames - the message frames, starting with the message itself
+inline DeserializerStream frameDeserializer(const zmq::multipart_t& frames) {
+	vassert(!frames.empty());
+
+	DeserializerStream stream(frames[0].data<char>(), frames[0].size());
+
+	std::vector<DeserializerStream::Frame> listFrames;
+	listFrames.reserve(frames.size() - 1);
+	for (size_t i = 1; i < frames.size(); ++i) {
+		listFrames.push_back({frames[i].data<char>(), frames[i].size()});
+	}
+	stream.setFrames(std::move(listFrames));
+
+	return stream;
+}
+
 /// Deserialize a protocol message excluding its type. The type should have been
 /// deserialized already in order to determine the type of message to read.
 template <typename TMsg>
@@ -5,10 +5,13 @@
 #pragma once
 
 #include <chrono>
+#include <atomic>
 #include <deque>
+#include <memory>
 #include <mutex>
 #include <string>
 #include <thread>
+#include <vector>
 
 
 #define ZMQ_HAVE_POLLER
@@ -35,10 +38,30 @@
 
 namespace VrayZmqWrapper{
 
+/// Outgoing messages are queued in separate lanes so that small, latency sensitive messages
+/// do not wait behind large amounts of plugin data. The order of messages is preserved only
+/// within a lane, except for fences ( see ZmqAgent::sendFence() ) which interactive messages
+/// cannot overtake.
+enum class SendLane : int {
+	Control = 0,    // Protocol control messages, e.g. heartbeats. Always sent first.
+	Interactive,    // Renderer messages which do not depend on queued plugin data
+	Bulk,           // Plugin data and all messages which should be ordered after it
+	COUNT
+};
+
+
 class ZmqAgent {
 	using Clock     = std::chrono::steady_clock;
 	using TimePoint = std::chrono::time_point<Clock>;
-	using MsgQueue  = std::deque<zmq::multipart_t>;
+
+	/// A message waiting to be sent
+	struct QueuedMsg {
+		zmq::multipart_t msg;
+		bool     isFence = false;  ///< Bulk lane only: interactive messages queued after this one wait for it
+		uint64_t fence   = 0;      ///< Interactive lane only: the number of fences which have to be sent first
+	};
+
+	using MsgQueue  = std::deque<QueuedMsg>;
 
 	// Disable copy and assign
 	ZmqAgent (const ZmqAgent&) = delete;
@@ -56,6 +79,7 @@ public:
 	static const bool Worker = false;
 
 	using MessageCallback = std::function<void(zmq::message_t&& payload)>;
+	using FramesCallback  = std::function<void(zmq::multipart_t&& frames)>;
 	using ErrorCallback   = std::function<void(const std::string& msg)>;
 	using TraceCallback   = std::function<void(const std::string& msg)>;
 
@@ -81,11 +105,42 @@ public:
 	/// Add a message to the outgoing message queue. This method is thread-safe.
 	/// @param payload - a ZMQ message
 	/// @param msgType - protocol message type
-	void send (zmq::message_t&& payload, ControlMessage msgType = ControlMessage::DATA);
+	/// @param lane - the lane to queue DATA messages in. All other message types use the control lane.
+	void send (zmq::message_t&& payload, ControlMessage msgType = ControlMessage::DATA, SendLane lane = SendLane::Bulk);
+
+	/// Add a batch of messages to the outgoing message queue in a single step. The messages
+	/// are sent in the order in which they appear in the batch. This method is thread-safe.
+	/// @param payloads - ZMQ messages
+	/// @param msgType - protocol message type for all messages in the batch
+	/// @param lane - the lane to queue DATA messages in. All other message types use the control lane.
+	void send (std::vector<zmq::message_t>&& payloads, ControlMessage msgType = ControlMessage::DATA, SendLane lane = SendLane::Bulk);
+
+	/// Add a single message consisting of multiple frames to the outgoing message queue. The
+	/// receiving agent passes all frames to its frames callback. This method is thread-safe.
+	/// @param frames - the frames of the message, e.g. produced by serializeMessageFrames()
+	/// @param msgType - protocol message type
+	/// @param lane - the lane to queue DATA messages in. All other message types use the control lane.
+	void send (zmq::multipart_t&& frames, ControlMessage msgType = ControlMessage::DATA, SendLane lane = SendLane::Bulk);
+
+	/// Add a message to the bulk lane which the interactive lane cannot overtake. Interactive
+	/// messages queued after it are sent only once it has been sent. This method is thread-safe.
+	/// @param payload - a ZMQ message
+	void sendFence (zmq::message_t&& payload);
+
+	/// Returns the number of messages waiting to be sent in a lane. This method is thread-safe.
+	size_t getQueueDepth (SendLane lane) const;
+
+	/// Returns the number of bytes waiting to be sent in all lanes, including large bulk frames
+	/// handed over to ZMQ but not yet transferred by it. This method is thread-safe.
+	size_t getQueuedBytes () const;
 
 	/// Subscribe for messages received from the socket. This subscription is obligatory.
 	void setMsgCallback  (MessageCallback cb);
 
+	/// Subscribe for multi-frame messages received from the socket ( see send(zmq::multipart_t&&) ).
+	/// Single-frame messages are still delivered to the message callback.
+	void setFramesCallback (FramesCallback cb);
+
 	/// Subscribe for error notifications
 	void setErrorCallback (ErrorCallback cb);
 
@@ -101,16 +156,25 @@ public:
 	/// Returns 'true' when the poller thread has exited and the agent can safely be destroyed
 	bool isStopped () const;
 
+	/// Returns 'true' if the peer has advertised that it accepts multi-frame messages. Always
+	/// 'false' for workers and for clients which have not completed the handshake yet.
+	bool peerAcceptsFrames () const;
+
 private:
 	void pollerLoop	(std::string addr);
 
 	zmq::socket_t connect(const std::string& addr, RoutingId id);
 	void handshake	 (zmq::socket_ref sock);
 	void sendPending (zmq::poller_t<>& pollerSend);
+	size_t sendFromLane (SendLane lane, zmq::poller_t<>& pollerSend, size_t maxBytes, size_t& maxMessages);
 	void recvPending (zmq::poller_t<>& pollerRecv);
 	void processTick ();
 
 	void sendPingMsg (bool ping);
+	bool hasPending  () const;
+	void pushMsg     (SendLane lane, zmq::multipart_t&& msg, bool isFence = false);
+	zmq::message_t trackBulk (zmq::message_t&& frame);
+
 	void reportError (const std::string& errMsg);
 	void trace       (const std::string& errMsg);
 
@@ -123,22 +187,44 @@ private:
 	// main limiting factor is MAX_MSG_BYTES in sendPending(...) to prevent a bunch of large messages
 	// e.g. meshes, hair, partcles from blocking everything else.
 	static const size_t MAX_BATCH = 16384;       ///< The max number of messages that will be sent in a single batch.
-	zmq::multipart_t* msgBufferItems[MAX_BATCH]; ///< The temporary buffer used for sending messages.
+	QueuedMsg* msgBufferItems[MAX_BATCH];        ///< The temporary buffer used for sending messages.
+
+	static const int LANES_COUNT = static_cast<int>(SendLane::COUNT);
+
+	/// Shares of the per-cycle byte budget of the interactive and bulk lanes. The share
+	/// of a lane which has nothing to send is given to the other one.
+	static const size_t INTERACTIVE_WEIGHT = 4;
+	static const size_t BULK_WEIGHT        = 1;
+
+	/// Bulk frames handed over to ZMQ are queued in its internal pipe where nothing can overtake
+	/// them. Limit the amount of such data so that messages from the other lanes are only
+	/// delayed by the time it takes to transfer this many bytes.
+	static const size_t MAX_BULK_IN_FLIGHT = 64 * 1024 * 1024;
+
+	/// Smaller bulk frames are not accounted for in the in-flight data. Tracking a frame takes
+	/// an allocation, which is not worth it for the many small plugin updates.
+	static const size_t MIN_TRACKED_BULK_BYTES = 64 * 1024;
 
 	zmq::context_t &ctx;            ///< The zmq context
 	RoutingId id;                   ///< ZMQ routing ID
 	ExporterType workerType;		///< The type of worker to create. This value is transparent to the protocol.
 	bool isClient;                  ///< Client will initiate the handshake
 	std::atomic<State> state;       ///< The running state of the agent
+	std::atomic<int> peerFeatures;  ///< PeerFeatures advertised by the worker in the handshake reply
 
 	ZmqTimeouts timeouts;           ///< Timeout settings
-	MsgQueue msgQueue;              ///< Queue for outgoing messages
-	std::mutex queueMutex;          ///< Guards msgQueue
+	MsgQueue msgQueues[LANES_COUNT];///< Queues for outgoing messages, one per lane
+	size_t queuedBytes = 0;         ///< Total size of the messages in msgQueues
+	uint64_t fencesQueued = 0;      ///< Number of fences queued in the bulk lane so far
+	uint64_t fencesSent = 0;        ///< Number of fences sent so far
+	mutable std::mutex queueMutex;  ///< Guards msgQueues, queuedBytes and the fence counters
+	std::shared_ptr<std::atomic<size_t>> bulkInFlight; ///< Bytes of bulk frames sent to ZMQ but not yet released by it
 	std::thread pollerThread;       ///< Thread for the polling operations
 
 	TimePoint lastActivity;         ///< Last time when activity was detected on the connected peer
 	TimePoint lastPing;             ///< Last time when a ping was sent
 	MessageCallback msgCallback;    ///< Callback for the message processing function
+	FramesCallback framesCallback;  ///< Callback for the multi-frame message processing function
 	ErrorCallback errorCallback;    ///< Callback for asynchronous errors
 	TraceCallback traceCallback;    ///< Callback for debug traces
 };
@@ -105,6 +105,19 @@ struct HandshakeMsg{
 	int workerType;
 };
 
+/// Optional features of a worker, advertised to the client in the handshake reply
+enum PeerFeatures : int {
+	PEER_NO_FEATURES    = 0,
+	PEER_ACCEPTS_FRAMES = 1 << 0,  // Multi-frame DATA messages are accepted ( see ZmqAgent::setFramesCallback() )
+};
+
+/// Payload of the CONNECTED message. The protocol version comes first, so peers which only read
+/// the version remain compatible with it.
+struct HandshakeReply{
+	Version protoVersion;
+	int features;
+};
+
 // Indicates render procedure type
 enum class ExporterType {
 	INVALID = -1,
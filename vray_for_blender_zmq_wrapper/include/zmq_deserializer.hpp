@@ -4,12 +4,23 @@
 
 #pragma once
 
+#include <vector>
+
 #include "base_types.h"
+#include "message_frames.h"
 #include "vassert.h"
+#include "zmq_common.hpp"
 
 namespace VrayZmqWrapper{
 
 class DeserializerStream {
+public:
+	/// A message frame following the main payload, see SerializerStream::Frame.
+	struct Frame {
+		const char * data = nullptr;
+		size_t       size = 0;
+	};
+
 public:
 	DeserializerStream() = delete;
 
@@ -56,10 +67,23 @@ public:
 		return true;
 	}
 
+	/// Set the frames which lists referenced from the stream are read from. The
+	/// frames must outlive the stream.
+	void setFrames(std::vector<Frame> && messageFrames) {
+		frames = std::move(messageFrames);
+	}
+
+	/// Get a frame referenced from the stream.
+	/// @return nullptr if there is no such frame
+	const Frame * getFrame(uint32_t index) const {
+		return (index < frames.size()) ? &frames[index] : nullptr;
+	}
+
 private:
 	const char *first;
 	const char *current;
 	const char *last;
+	std::vector<Frame> frames;
 };
 
 
@@ -97,6 +121,20 @@ inline DeserializerStream & operator>>(DeserializerStream & stream, VRayBaseType
 	int size = 0;
 	stream >> size;
 
+	if (size == FRAME_DATA_MARKER) {
+		uint32_t index = 0;
+		uint64_t bytes = 0;
+		stream >> index >> bytes;
+
+		// Construct the list directly from the frame, there is no need to initialize the storage first.
+		const auto* frame = stream.getFrame(index);
+		CHECK_ZMQ(frame && (frame->size == bytes), "Wrong message format: missing or invalid list data frame");
+
+		const Q* items = reinterpret_cast<const Q*>(frame->data);
+		list.getData()->assign(items, items + bytes / sizeof(Q));
+		return stream;
+	}
+
 	list.getData()->resize(size);
 	memcpy(list.getData()->data(), stream.getCurrent(), size * sizeof(Q));
 	stream.forward(size * sizeof(Q));
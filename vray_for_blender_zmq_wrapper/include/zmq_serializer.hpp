@@ -4,41 +4,97 @@
 
 #pragma once
 
+#include <memory>
 #include <vector>
 #include <string>
 
 #include "base_types.h"
+#include "message_frames.h"
 #include "vassert.h"
 
 namespace VrayZmqWrapper{
 
+/// Serializes values into a contiguous buffer.
+///
+/// Messages are serialized in two passes. The first pass runs on a stream in measure-only
+/// mode which just counts the bytes, so that the buffer of the second pass could be
+/// allocated with the exact size up front ( see serializeMessage() ).
+///
+/// When frames are enabled, large POD lists bypass the buffer. They are referenced as
+/// separate message frames without copying.
 class SerializerStream {
+public:
+	/// A span of list data which is sent as a separate message frame.
+	struct Frame {
+		const void* data = nullptr;
+		size_t      size = 0;
+		std::shared_ptr<const void> owner;  ///< Keeps the data alive until the frame has been sent
+	};
+
 public:
 
 	SerializerStream() {
 	}
+
+	/// @param frameThreshold - lists of at least this many bytes are referenced as separate frames. 0 disables frames.
+	explicit SerializerStream(size_t frameThreshold)
+		: frameThreshold(frameThreshold) {
+	}
 	SerializerStream(const SerializerStream& other) = delete;
 	SerializerStream& operator=(const SerializerStream& other) = delete;
 
+	/// Only count the bytes written to the stream instead of storing them.
+	void measureOnly() {
+		measuring = true;
+	}
+
+	/// Allocate the buffer for the expected size of the serialized data.
+	void reserve(size_t size) {
+		stream.reserve(size);
+	}
+
 	void write(const char * data, size_t size) {
 		if (size == 0) {
 			return;
 		}
-		const size_t prevSize = stream.size();
-		stream.resize(size + stream.size());
-		memcpy(&stream[prevSize], data, size);
+		if (measuring) {
+			measuredSize += size;
+			return;
+		}
+		stream.insert(stream.end(), data, data + size);
 	}
 
 	size_t getSize() const {
-		return stream.size();
+		return measuring ? measuredSize : stream.size();
 	}
 
 	char * getData() {
 		return stream.data();
 	}
 
+	/// Try to reference a payload as a separate message frame instead of copying it to the stream.
+	/// @param owner - the owner of the data. The data must not change until the message is sent.
+	/// @param index - [out] the index of the frame among the frames of the stream
+	/// @return false if the payload should be written inline
+	bool writeFrame(const void * data, size_t size, std::shared_ptr<const void> owner, uint32_t & index) {
+		if ((frameThreshold == 0) || (size < frameThreshold)) {
+			return false;
+		}
+		index = static_cast<uint32_t>(frames.size());
+		frames.push_back(Frame{data, size, std::move(owner)});
+		return true;
+	}
+
+	std::vector<Frame>& getFrames() {
+		return frames;
+	}
+
 private:
-	std::vector<char> stream;
+	std::vector<char>  stream;
+	std::vector<Frame> frames;
+	size_t             frameThreshold = 0;
+	bool               measuring      = false;
+	size_t             measuredSize   = 0;
 };
 
 
@@ -68,6 +124,16 @@ inline SerializerStream & operator<<(SerializerStream & stream, const VRayBaseTy
 
 template <typename Q>
 inline SerializerStream & operator<<(SerializerStream & stream, const VRayBaseTypes::AttrList<Q> & list) {
+	if (!list.empty()) {
+		const size_t size = list.getCount() * sizeof(Q);
+
+		uint32_t frame = 0;
+		if (stream.writeFrame(list.getData()->data(), size, list.getData(), frame)) {
+			// The data follows in a separate frame which references the list itself.
+			return stream << FRAME_DATA_MARKER << frame << static_cast<uint64_t>(size);
+		}
+	}
+
 	stream << list.getCount();
 	stream.write(reinterpret_cast<const char *>(list.getData()->data()), list.getCount() * sizeof(Q));
 	return stream;
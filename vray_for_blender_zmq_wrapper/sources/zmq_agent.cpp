@@ -5,6 +5,7 @@
 #include "zmq_common.hpp"
 #include "zmq_agent.h"
 
+#include <algorithm>
 #include <chrono>
 #include <vector>
 
@@ -30,6 +31,37 @@ zmq::multipart_t createMsg(ControlMessage msgType, zmq::message_t&& payload) {
 	return msg;
 }
 
+
+zmq::multipart_t createMsg(ControlMessage msgType, zmq::multipart_t&& frames) {
+
+	frames.push(toZmqMsg(msgType));
+	return std::move(frames);
+}
+
+/// Get the lane in which to queue a message. Only DATA messages can choose their lane.
+static SendLane laneFor(ControlMessage msgType, SendLane lane) {
+	return (msgType == ControlMessage::DATA) ? lane : SendLane::Control;
+}
+
+
+/// Get the total size of the frames of a message.
+static size_t messageBytes(const zmq::multipart_t& msg) {
+	size_t bytes = 0;
+	for (const zmq::message_t& frame : msg) {
+		bytes += frame.size();
+	}
+	return bytes;
+}
+
+
+/// A bulk frame which has been handed over to ZMQ. Accounts for the frame in the agent's
+/// in-flight counter until ZMQ releases it.
+struct TrackedFrame {
+	zmq::message_t frame;
+	std::shared_ptr<std::atomic<size_t>> inFlight;
+};
+
+
 const bool ZmqAgent::Worker;
 const bool ZmqAgent::Client;
 const size_t ZmqAgent::MAX_BATCH;
@@ -40,6 +72,8 @@ ZmqAgent::ZmqAgent(zmq::context_t& ctx, const RoutingId& id, ExporterType worker
 	, workerType(workerType)
 	, isClient(isClient)
 	, state(State::Idle)
+	, peerFeatures(PEER_NO_FEATURES)
+	, bulkInFlight(std::make_shared<std::atomic<size_t>>(0))
 {
 }
 
@@ -72,6 +106,14 @@ void ZmqAgent::setMsgCallback(MessageCallback cb) {
 }
 
 
+void ZmqAgent::setFramesCallback(FramesCallback cb) {
+	vassert(cb && "Unsubscribing is not supported");
+	vassert(!framesCallback && "Multiple subscriptions for the same event are not supported");
+	vassert((state == State::Idle) && "Callbacks should be registered before running the agent");
+	framesCallback = cb;
+}
+
+
 void ZmqAgent::setErrorCallback(ErrorCallback cb) {
 	vassert(cb && "Unsubscribing is not supported");
 	vassert(!errorCallback && "Multiple subscriptions for the same event are not supported");
@@ -104,6 +146,11 @@ bool ZmqAgent::isStopped() const {
 }
 
 
+bool ZmqAgent::peerAcceptsFrames() const {
+	return (peerFeatures & PEER_ACCEPTS_FRAMES) != 0;
+}
+
+
 void ZmqAgent::run(const std::string& endpoint, const ZmqTimeouts& timeoutSettings) {
 
 	vassert(state == State::Idle && "Cannot run the same ZmqAgent twice");
@@ -138,16 +185,116 @@ void ZmqAgent::stop(bool block) {
 }
 
 
-void ZmqAgent::send(zmq::message_t&& payload, ControlMessage msgType /*=ControlMessge::DATA*/) {
+void ZmqAgent::send(zmq::message_t&& payload, ControlMessage msgType /*=ControlMessge::DATA*/, SendLane lane /*=SendLane::Bulk*/) {
 
 	vassert((state != State::Idle) && "Agent should be started before data can be sent.");
 
 	if (state == State::Running) {
 		auto msg = createMsg(msgType, std::move(payload));
+		const size_t bytes = messageBytes(msg);
 
 		std::lock_guard<std::mutex> lock(queueMutex);
-		msgQueue.push_back(std::move(msg));
+		pushMsg(laneFor(msgType, lane), std::move(msg));
+		queuedBytes += bytes;
+	}
+}
+
+
+void ZmqAgent::send(std::vector<zmq::message_t>&& payloads, ControlMessage msgType /*=ControlMessge::DATA*/, SendLane lane /*=SendLane::Bulk*/) {
+
+	vassert((state != State::Idle) && "Agent should be started before data can be sent.");
+
+	if ((state == State::Running) && !payloads.empty()) {
+		std::vector<zmq::multipart_t> msgs;
+		msgs.reserve(payloads.size());
+		size_t bytes = 0;
+
+		for (auto& payload : payloads) {
+			msgs.push_back(createMsg(msgType, std::move(payload)));
+			bytes += messageBytes(msgs.back());
+		}
+
+		std::lock_guard<std::mutex> lock(queueMutex);
+		for (auto& msg : msgs) {
+			pushMsg(laneFor(msgType, lane), std::move(msg));
+		}
+		queuedBytes += bytes;
+	}
+}
+
+
+void ZmqAgent::send(zmq::multipart_t&& frames, ControlMessage msgType /*=ControlMessge::DATA*/, SendLane lane /*=SendLane::Bulk*/) {
+
+	vassert((state != State::Idle) && "Agent should be started before data can be sent.");
+	vassert(!frames.empty() && "A message should have at least one frame");
+
+	if (state == State::Running) {
+		auto msg = createMsg(msgType, std::move(frames));
+		const size_t bytes = messageBytes(msg);
+
+		std::lock_guard<std::mutex> lock(queueMutex);
+		pushMsg(laneFor(msgType, lane), std::move(msg));
+		queuedBytes += bytes;
+	}
+}
+
+
+void ZmqAgent::sendFence(zmq::message_t&& payload) {
+
+	vassert((state != State::Idle) && "Agent should be started before data can be sent.");
+
+	if (state == State::Running) {
+		auto msg = createMsg(ControlMessage::DATA, std::move(payload));
+		const size_t bytes = messageBytes(msg);
+
+		std::lock_guard<std::mutex> lock(queueMutex);
+		pushMsg(SendLane::Bulk, std::move(msg), true);
+		queuedBytes += bytes;
+	}
+}
+
+
+/// Add a message to the end of a lane. Should be called with queueMutex locked.
+/// @param lane - the lane to queue the message in
+/// @param msg - the message
+/// @param isFence - bulk lane only, make the interactive messages queued after this one wait for it
+void ZmqAgent::pushMsg(SendLane lane, zmq::multipart_t&& msg, bool isFence /*=false*/) {
+	vassert(!isFence || (lane == SendLane::Bulk));
+
+	QueuedMsg item{std::move(msg)};
+
+	if (lane == SendLane::Interactive) {
+		item.fence = fencesQueued;
 	}
+	else if (isFence) {
+		item.isFence = true;
+		++fencesQueued;
+	}
+
+	msgQueues[static_cast<int>(lane)].push_back(std::move(item));
+}
+
+
+size_t ZmqAgent::getQueueDepth(SendLane lane) const {
+	std::lock_guard<std::mutex> lock(queueMutex);
+	return msgQueues[static_cast<int>(lane)].size();
+}
+
+
+size_t ZmqAgent::getQueuedBytes() const {
+	std::lock_guard<std::mutex> lock(queueMutex);
+	return queuedBytes + *bulkInFlight;
+}
+
+
+bool ZmqAgent::hasPending() const {
+	std::lock_guard<std::mutex> lock(queueMutex);
+	for (const auto& queue : msgQueues) {
+		if (!queue.empty()) {
+			return true;
+		}
+	}
+	return false;
 }
 
 
@@ -180,7 +327,7 @@ void ZmqAgent::pollerLoop(std::string endpoint) {
 
 		// Try to send all outstanding messages. In case of connection loss,
 		// an error will be received from ZmqRouter and the poller loop will exit.
-		while ((state == State::Running) || !msgQueue.empty()) {
+		while ((state == State::Running) || hasPending()) {
 			sendPending(pollerSend);
 			recvPending(pollerRecv);
 		}
@@ -199,19 +346,68 @@ void ZmqAgent::pollerLoop(std::string endpoint) {
 
 	trace("Exit poller loop");
 
-	msgCallback   = nullptr;
-	errorCallback = nullptr;
-	traceCallback = nullptr;
+	msgCallback    = nullptr;
+	framesCallback = nullptr;
+	errorCallback  = nullptr;
+	traceCallback  = nullptr;
 
 	state = State::Stopped;
 }
 
 
-/// Send up to MAX_BATCH messages from the message queue in succession
+/// Send up to MAX_BATCH messages from the message queues in succession. Control messages
+/// are sent first, the byte budget for the cycle is then split between the interactive
+/// and the bulk lanes according to their weights.
 void ZmqAgent::sendPending(zmq::poller_t<>& pollerSend) {
+	static const size_t MAX_MSG_BYTES = 32 * 1024 * 1024;
+
+	static const size_t INTERACTIVE_SHARE = MAX_MSG_BYTES * INTERACTIVE_WEIGHT / (INTERACTIVE_WEIGHT + BULK_WEIGHT);
+	static const size_t BULK_SHARE        = MAX_MSG_BYTES - INTERACTIVE_SHARE;
+
+#ifdef WITH_MESSAGE_PROFILING
+	for (int i = 0; i < LANES_COUNT; ++i) {
+		const size_t depth = getQueueDepth(static_cast<SendLane>(i));
+		if (depth > MAX_BATCH) {
+			// Generally aim for this to never be printed during export or only printed very few times.
+			std::cout << "Messages left in queue " << i << ": " << depth - MAX_BATCH << std::endl;
+		}
+	}
+#endif
+
+	size_t messages = MAX_BATCH;
+
+	// Control messages are tiny, they do not count against the byte budget.
+	sendFromLane(SendLane::Control, pollerSend, MAX_MSG_BYTES, messages);
+
+	// The interactive lane may use the whole budget if there is no bulk data waiting. Bulk data
+	// is always given at least its share, so that it could not be starved by interactive messages.
+	const bool hasBulk = getQueueDepth(SendLane::Bulk) > 0;
+	const size_t interactiveBytes = sendFromLane(SendLane::Interactive, pollerSend, hasBulk ? INTERACTIVE_SHARE : MAX_MSG_BYTES, messages);
+	const size_t bulkBudget = std::max(BULK_SHARE, MAX_MSG_BYTES - std::min(interactiveBytes, MAX_MSG_BYTES));
+	[[maybe_unused]] const size_t bulkBytes = sendFromLane(SendLane::Bulk, pollerSend, bulkBudget, messages);
+
+#ifdef WITH_MESSAGE_PROFILING
+	const size_t SIZE_THRESHOLD = 1 * 1024 * 1024;
+	if (interactiveBytes + bulkBytes > SIZE_THRESHOLD) {
+		std::cout << "Message batch size: " << (interactiveBytes + bulkBytes) / 1024.0f / 1024.0f << "MB" << std::endl;
+	}
+#endif
+}
+
+
+/// Send messages from the front of a lane.
+/// @param lane - the lane to send from
+/// @param pollerSend - poller for the outgoing socket
+/// @param maxBytes - stop when this many bytes have been sent. The first message is always sent,
+///                   so that messages larger than the budget could not get stuck.
+/// @param maxMessages - [in/out] the number of messages which can still be sent in this cycle
+/// @return the number of bytes sent
+size_t ZmqAgent::sendFromLane(SendLane lane, zmq::poller_t<>& pollerSend, size_t maxBytes, size_t& maxMessages) {
 	static const auto DONT_BLOCK = 0ms;
 
-	static const size_t MAX_MSG_BYTES = 32 * 1024 * 1024;
+	auto& queue = msgQueues[static_cast<int>(lane)];
+	const bool isBulk = (lane == SendLane::Bulk);
+	const bool isInteractive = (lane == SendLane::Interactive);
 
 	std::vector<zmq::poller_event<>> events(1);
 
@@ -222,27 +418,43 @@ void ZmqAgent::sendPending(zmq::poller_t<>& pollerSend) {
 		// this may block senders from queueing messages in case of slow sends on the socket.
 		// Pushing into the deque is guaranteed to not invalidate references to items.
 		std::lock_guard<std::mutex> lock(queueMutex);
-#ifdef WITH_MESSAGE_PROFILING
-		if (msgQueue.size() > MAX_BATCH) {
-			// Generally aim for this to never be printed during export or only printed very few times.
-			std::cout << "Messages left in queue: " << msgQueue.size() - MAX_BATCH << std::endl;
-		}
-#endif
-		total = std::min(msgQueue.size(), MAX_BATCH);
+		total = std::min(queue.size(), maxMessages);
 		for (int i = 0; i < total; ++i) {
-			msgBufferItems[i] = &msgQueue[i];
+			if (isInteractive && (queue[i].fence > fencesSent)) {
+				// The fences queued before this message have not been sent yet
+				total = i;
+				break;
+			}
+			msgBufferItems[i] = &queue[i];
 		}
 	}
 
 	size_t sent = 0;
 	size_t sentBytes = 0;
-	while ((sent < total) && (1 == pollerSend.wait_all(events, DONT_BLOCK))) {
+	size_t sentFences = 0;
+	while ((sent < total) && (sentBytes < maxBytes) && (1 == pollerSend.wait_all(events, DONT_BLOCK))) {
 
 		vassert(zmq::event_flags::pollout == events[0].events);
 
-		zmq::multipart_t* multiMsg = msgBufferItems[sent];
-		for (const zmq::message_t& msg : *multiMsg) {
-			sentBytes += msg.size();
+		if (isBulk && (*bulkInFlight >= MAX_BULK_IN_FLIGHT)) {
+			// Wait for ZMQ to transfer some of the data it already has.
+			break;
+		}
+
+		zmq::multipart_t* multiMsg = &msgBufferItems[sent]->msg;
+		sentBytes += messageBytes(*multiMsg);
+
+		if (isBulk) {
+			// The first frame is the control message type.
+			for (size_t i = 1; i < multiMsg->size(); ++i) {
+				if ((*multiMsg)[i].size() >= MIN_TRACKED_BULK_BYTES) {
+					(*multiMsg)[i] = trackBulk(std::move((*multiMsg)[i]));
+				}
+			}
+
+			if (msgBufferItems[sent]->isFence) {
+				++sentFences;
+			}
 		}
 
 		zmq::socket_ref& sockOut = events[0].socket;
@@ -252,25 +464,37 @@ void ZmqAgent::sendPending(zmq::poller_t<>& pollerSend) {
 		vassert(res && "EAGAIN on a blocking socket");
 
 		++sent;
-
-		if (sentBytes > MAX_MSG_BYTES) {
-			break;
-		}
 	}
-#ifdef WITH_MESSAGE_PROFILING
-	const size_t SIZE_THRESHOLD = 1 * 1024 * 1024;
-	if (sentBytes > SIZE_THRESHOLD) {
-		std::cout << "Message batch size: " << sentBytes / 1024.0f / 1024.0f << "MB" << std::endl;
-	}
-#endif
 
 	{
 		std::lock_guard<std::mutex> lock(queueMutex);
 
 		for (int i = 0; i < sent; ++i) {
-			msgQueue.pop_front();
+			queue.pop_front();
 		}
+		queuedBytes -= sentBytes;
+		fencesSent += sentFences;
 	}
+
+	maxMessages -= sent;
+	return sentBytes;
+}
+
+
+/// Wrap a bulk frame which is about to be sent, so that its size is accounted for in
+/// bulkInFlight until ZMQ releases it. The data is not copied.
+/// @param frame - the frame to wrap
+/// @return a frame which references the data of the original one
+zmq::message_t ZmqAgent::trackBulk(zmq::message_t&& frame) {
+	const size_t size = frame.size();
+	*bulkInFlight += size;
+
+	auto* tracked = new TrackedFrame{std::move(frame), bulkInFlight};
+	return zmq::message_t(tracked->frame.data(), size, [](void*, void* trackedPtr) {
+		auto* tracked = reinterpret_cast<TrackedFrame*>(trackedPtr);
+		*tracked->inFlight -= tracked->frame.size();
+		delete tracked;
+	}, tracked);
 }
 
 
@@ -290,14 +514,19 @@ void ZmqAgent::recvPending(zmq::poller_t<>& pollerRecv) {
 	// available message
 	zmq::multipart_t msg(events[0].socket);
 
-	CHECK_ZMQ(msg.size() == 2, "Wrong message format: expecting 2 frames");
+	CHECK_ZMQ(msg.size() >= 2, "Wrong message format: expecting at least 2 frames");
 
-	const auto& msgType = *msg[0].data<ControlMessage>();
+	const auto msgType = *msg[0].data<ControlMessage>();
 	auto& payload = msg[1];
 
 	switch (msgType) {
 	case ControlMessage::DATA:
-		if (msgCallback) {
+		if (msg.size() > 2) {
+			CHECK_ZMQ(framesCallback, "Multi-frame message received without a frames callback");
+			msg.pop();
+			framesCallback(std::move(msg));
+		}
+		else if (msgCallback) {
 			msgCallback(std::move(payload));
 		}
 		break;
@@ -382,13 +611,19 @@ void ZmqAgent::handshake(zmq::socket_ref sock) {
 		CHECK_ZMQ(msgType != ControlMessage::ERR, "Peer encountered an error");
 		CHECK_ZMQ(msgType == ControlMessage::CONNECTED, "Wrong handshake message type");
 
+		// Workers which do not advertise any features reply with the version only
+		if (response[1].size() >= sizeof(HandshakeReply)) {
+			peerFeatures = response[1].data<HandshakeReply>()->features;
+		}
+
 		trace("Handshake complete");
 	}
 	else {
 		trace("Handshake reply");
 
-		// Reply to the handshake
-		auto msgOut = createMsg(ControlMessage::CONNECTED, toZmqMsg(ZMQ_PROTOCOL_VERSION));
+		// Reply to the handshake. Multi-frame messages can only be accepted if there is someone to pass them to.
+		const int features = framesCallback ? PEER_ACCEPTS_FRAMES : PEER_NO_FEATURES;
+		auto msgOut = createMsg(ControlMessage::CONNECTED, toZmqMsg(HandshakeReply{ZMQ_PROTOCOL_VERSION, features}));
 
 		msgOut.send(sock);
 	}
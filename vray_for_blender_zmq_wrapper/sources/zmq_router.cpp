@@ -130,7 +130,8 @@ void ZmqRouter::pollerLoop(std::string clientEndpoint, std::string workerEndopin
 
 				zmq::multipart_t msg(sock);
 
-				if(msg.size() != 3){
+				// Routing ID, message type and payload. Multi-frame DATA messages carry further payload frames.
+				if(msg.size() < 3){
 					trace("Wrong message format");
 					continue;
 				}
@@ -140,6 +141,10 @@ void ZmqRouter::pollerLoop(std::string clientEndpoint, std::string workerEndopin
 				switch(msgType) {
 					case ControlMessage::CONNECT:
 					{
+						if (msg.size() != 3) {
+							trace("Wrong CONNECT message format");
+							break;
+						}
 						processHandshake(sock, msg);
 						break;
 					}
@@ -180,6 +180,136 @@ TEST_CASE("Basic communication") {
 	}
 
 
+	SECTION("Message batch sent from client and received by worker in order") {
+		/*
+		* Client sends a batch of one-way messages to the worker
+		*/
+		const int batchSize = 100;
+		int msgReceived = 0;
+		ZmqAgentPtr worker;
+
+		router->setNewWorkerCallback([&worker, &msgReceived, &msg, &notifier](auto agent) {
+			worker = std::move(agent);
+
+			worker->setMsgCallback([&msgReceived, &msg, &notifier](zmq::message_t&& payload) {
+				REQUIRE(payload.to_string() == msg + std::to_string(msgReceived));
+				if (++msgReceived == batchSize) {
+					notifier.notify();
+				}
+			});
+
+			worker->setErrorCallback([](std::string errMsg) {
+				FAIL(std::string("Worker error callback: ") + errMsg);
+			});
+
+			worker->run(workerEndpoint, timeouts);
+
+		});
+
+		client->setErrorCallback([](std::string errMsg) {
+			FAIL(std::string("Client error callback: " + errMsg));
+		});
+
+		router->run(clientEndpoint, workerEndpoint, timeouts);
+		std::this_thread::sleep_for(500ms);
+
+		client->run(clientEndpoint, timeouts);
+
+		std::vector<zmq::message_t> payloads;
+		for (int i = 0; i < batchSize; ++i) {
+			payloads.emplace_back(msg + std::to_string(i));
+		}
+		client->send(std::move(payloads));
+
+		notifier.wait(5s);
+		REQUIRE(msgReceived == batchSize);
+	}
+
+
+	SECTION("Multi-frame message relayed from client to worker") {
+		/*
+		* The worker advertises multi-frame support in the handshake, the client sends a message
+		* consisting of several frames and the worker receives all of them in order
+		*/
+		const std::vector<std::string> frames = {msg, "frame1", "frame2"};
+		std::vector<std::string> received;
+		ZmqAgentPtr worker;
+
+		router->setNewWorkerCallback([&worker, &received, &notifier](auto agent) {
+			worker = std::move(agent);
+
+			worker->setMsgCallback([](zmq::message_t&& /*payload*/) {
+				FAIL("A multi-frame message was delivered to the message callback");
+			});
+
+			worker->setFramesCallback([&received, &notifier](zmq::multipart_t&& msgFrames) {
+				for (const auto& frame : msgFrames) {
+					received.push_back(frame.to_string());
+				}
+				notifier.notify();
+			});
+
+			worker->setErrorCallback([](std::string errMsg) {
+				FAIL(std::string("Worker error callback: ") + errMsg);
+			});
+
+			worker->run(workerEndpoint, timeouts);
+		});
+
+		client->setErrorCallback([](std::string errMsg) {
+			FAIL(std::string("Client error callback: " + errMsg));
+		});
+
+		router->run(clientEndpoint, workerEndpoint, timeouts);
+		std::this_thread::sleep_for(500ms);
+
+		client->run(clientEndpoint, timeouts);
+
+		const auto end = std::chrono::steady_clock::now() + 5s;
+		while (!client->peerAcceptsFrames() && (std::chrono::steady_clock::now() < end)) {
+			std::this_thread::sleep_for(10ms);
+		}
+		REQUIRE(client->peerAcceptsFrames());
+
+		zmq::multipart_t payload;
+		for (const auto& frame : frames) {
+			payload.addstr(frame);
+		}
+		client->send(std::move(payload));
+
+		notifier.wait(5s);
+		REQUIRE(received == frames);
+	}
+
+
+	SECTION("Worker without a frames callback does not accept multi-frame messages") {
+		bool msgReceived = false;
+		ZmqAgentPtr worker;
+
+		router->setNewWorkerCallback([&worker, &msgReceived, &notifier](auto agent) {
+			worker = std::move(agent);
+
+			worker->setMsgCallback([&msgReceived, &notifier](zmq::message_t&& /*payload*/) {
+				msgReceived = true;
+				notifier.notify();
+			});
+
+			worker->run(workerEndpoint, timeouts);
+		});
+
+		router->run(clientEndpoint, workerEndpoint, timeouts);
+		std::this_thread::sleep_for(500ms);
+
+		client->run(clientEndpoint, timeouts);
+		client->send(zmq::message_t(msg));
+
+		// The message is sent after the handshake is complete
+		notifier.wait(5s);
+		REQUIRE(msgReceived);
+		REQUIRE_FALSE(client->peerAcceptsFrames());
+	}
+
+
 	SECTION("Message roundtrip") {
 		/* 
 		* Client sends a message to the worker and receives back the same message
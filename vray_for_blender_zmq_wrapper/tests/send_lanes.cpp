@@ -0,0 +1,182 @@
+// SPDX-FileCopyrightText: Chaos Software EOOD
+//
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+#include <catch_amalgamated.hpp>
+
+#include <atomic>
+#include <chrono>
+#include <iostream>
+#include <thread>
+#include <mutex>
+
+
+#include "zmq_agent.h"
+#include "zmq_router.h"
+#include "tools.hpp"
+
+using namespace std::chrono_literals;
+using namespace VrayZmqWrapper;
+
+namespace {
+	zmq::context_t ctx;
+	auto timeouts      = ZmqTimeouts();
+	const RoutingId clientId = 3;
+	const int workerType = 1;
+	const std::string clientEndpoint = "tcp://127.0.0.1:5558";
+	const std::string workerEndpoint = "inproc://test_lanes_router";
+
+	using Clock = std::chrono::steady_clock;
+}
+
+
+TEST_CASE("Send lanes")
+{
+	auto router = std::make_unique<ZmqRouter>(ctx);
+	auto client = std::make_unique<ZmqAgent>(ctx, clientId, workerType, true);
+	ZmqAgentPtr worker;
+	ConditionalWait workerCreated;
+	ConditionalWait allReceived;
+	setUpTracing(client, router);
+
+	router->setNewWorkerCallback([&worker, &workerCreated](auto agent) {
+		worker = std::move(agent);
+		workerCreated.notify();
+	});
+
+	client->setErrorCallback([](std::string errMsg) {
+		FAIL(std::string("Client error callback: " + errMsg));
+	});
+
+	router->run(clientEndpoint, workerEndpoint, timeouts);
+	std::this_thread::sleep_for(500ms);
+
+	SECTION("Interactive messages overtake queued bulk messages") {
+		std::vector<std::string> received;
+		std::mutex receivedMutex;
+
+		// The handshake will not complete until the worker is run, so all messages stay queued.
+		client->run(clientEndpoint, timeouts);
+		REQUIRE(workerCreated.wait(5s));
+
+		client->send(zmq::message_t(std::string("bulk1")));
+		client->send(zmq::message_t(std::string("interactive1")), ControlMessage::DATA, SendLane::Interactive);
+		client->send(zmq::message_t(std::string("bulk2")));
+		client->send(zmq::message_t(std::string("interactive2")), ControlMessage::DATA, SendLane::Interactive);
+		client->send(zmq::message_t(std::string("bulk3")));
+
+		REQUIRE(client->getQueueDepth(SendLane::Control) == 0);
+		REQUIRE(client->getQueueDepth(SendLane::Interactive) == 2);
+		REQUIRE(client->getQueueDepth(SendLane::Bulk) == 3);
+
+		// The payloads plus a control message type frame per message
+		const size_t payloadBytes = 3 * 5 + 2 * 12;
+		REQUIRE(client->getQueuedBytes() > payloadBytes);
+
+		worker->setMsgCallback([&](zmq::message_t&& payload) {
+			std::scoped_lock lock(receivedMutex);
+			received.push_back(payload.to_string());
+			if (received.size() == 5) {
+				allReceived.notify();
+			}
+		});
+		worker->run(workerEndpoint, timeouts);
+
+		REQUIRE(allReceived.wait(5s));
+
+		const std::vector<std::string> expected = {"interactive1", "interactive2", "bulk1", "bulk2", "bulk3"};
+		REQUIRE(received == expected);
+		REQUIRE(client->getQueueDepth(SendLane::Interactive) == 0);
+		REQUIRE(client->getQueueDepth(SendLane::Bulk) == 0);
+
+		// Bulk frames are accounted for until ZMQ releases them, which may happen after delivery.
+		for (int i = 0; (i < 100) && (client->getQueuedBytes() > 0); ++i) {
+			std::this_thread::sleep_for(10ms);
+		}
+		REQUIRE(client->getQueuedBytes() == 0);
+	}
+
+	SECTION("Interactive messages do not overtake fences") {
+		std::vector<std::string> received;
+		std::mutex receivedMutex;
+
+		client->run(clientEndpoint, timeouts);
+		REQUIRE(workerCreated.wait(5s));
+
+		client->send(zmq::message_t(std::string("bulk1")));
+		client->send(zmq::message_t(std::string("interactive1")), ControlMessage::DATA, SendLane::Interactive);
+		client->sendFence(zmq::message_t(std::string("fence")));
+		client->send(zmq::message_t(std::string("interactive2")), ControlMessage::DATA, SendLane::Interactive);
+		client->send(zmq::message_t(std::string("bulk2")));
+
+		REQUIRE(client->getQueueDepth(SendLane::Interactive) == 2);
+		REQUIRE(client->getQueueDepth(SendLane::Bulk) == 3);
+
+		worker->setMsgCallback([&](zmq::message_t&& payload) {
+			std::scoped_lock lock(receivedMutex);
+			received.push_back(payload.to_string());
+			if (received.size() == 5) {
+				allReceived.notify();
+			}
+		});
+		worker->run(workerEndpoint, timeouts);
+
+		REQUIRE(allReceived.wait(5s));
+
+		// The second interactive message is held back until the fence has been sent. The whole bulk
+		// lane goes out in the same send cycle as the fence, so it arrives after bulk2.
+		const std::vector<std::string> expected = {"interactive1", "bulk1", "fence", "bulk2", "interactive2"};
+		REQUIRE(received == expected);
+	}
+
+	SECTION("Latency of an interactive message behind a 1 GB backlog") {
+		const size_t bulkSize  = 8 * 1024 * 1024;
+		const int    bulkCount = 128;
+
+		// All bulk messages reference the same buffer to keep the memory usage of the test low.
+		const std::vector<char> buffer(bulkSize, 'b');
+		const std::string marker = "interactive";
+
+		std::atomic<int> bulkReceived = 0;
+		std::atomic<int> bulkBeforeMarker = -1;
+		Clock::time_point markerReceived;
+		ConditionalWait markerWait;
+
+		client->run(clientEndpoint, timeouts);
+		REQUIRE(workerCreated.wait(5s));
+
+		worker->setMsgCallback([&](zmq::message_t&& payload) {
+			if (payload.size() == bulkSize) {
+				if (++bulkReceived == bulkCount) {
+					allReceived.notify();
+				}
+			}
+			else {
+				REQUIRE(payload.to_string() == marker);
+				markerReceived = Clock::now();
+				bulkBeforeMarker = bulkReceived.load();
+				markerWait.notify();
+			}
+		});
+		worker->run(workerEndpoint, timeouts);
+
+		std::vector<zmq::message_t> backlog;
+		for (int i = 0; i < bulkCount; ++i) {
+			backlog.emplace_back(const_cast<char*>(buffer.data()), bulkSize, [](void*, void*) {});
+		}
+		client->send(std::move(backlog));
+
+		const auto markerSent = Clock::now();
+		client->send(zmq::message_t(marker), ControlMessage::DATA, SendLane::Interactive);
+
+		REQUIRE(markerWait.wait(60s));
+		REQUIRE(allReceived.wait(60s));
+
+		const auto latency = std::chrono::duration_cast<std::chrono::milliseconds>(markerReceived - markerSent);
+		std::cout << "Interactive message latency behind a 1 GB backlog: " << latency.count() << " ms, "
+				  << bulkBeforeMarker << " of " << bulkCount << " bulk messages received before it" << std::endl;
+
+		// Only the bulk data already handed over to ZMQ may arrive before the interactive message.
+		REQUIRE(bulkBeforeMarker < bulkCount / 4);
+	}
+}
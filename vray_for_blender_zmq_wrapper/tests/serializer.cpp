@@ -0,0 +1,186 @@
+// SPDX-FileCopyrightText: Chaos Software EOOD
+//
+// SPDX-License-Identifier: GPL-3.0-or-later
+
+#include <catch_amalgamated.hpp>
+
+#include <chrono>
+#include <cstring>
+#include <iomanip>
+#include <iostream>
+
+
+#include "zmq_message.hpp"
+
+using namespace VrayZmqWrapper;
+using namespace VRayBaseTypes;
+
+namespace {
+	using Clock = std::chrono::steady_clock;
+
+	AttrListVector makeVectors(int count) {
+		AttrListVector list(count);
+		for (int i = 0; i < count; ++i) {
+			(*list)[i] = AttrVector(static_cast<float>(i), 1.0f, -1.0f);
+		}
+		return list;
+	}
+
+	AttrListInt makeInts(int count) {
+		AttrListInt list(count);
+		for (int i = 0; i < count; ++i) {
+			(*list)[i] = i;
+		}
+		return list;
+	}
+
+	AttrMapChannels makeMapChannels(int count) {
+		AttrMapChannels channels;
+		channels.data.push_back({makeVectors(count), makeInts(count), "uv"});
+		return channels;
+	}
+
+	template <typename Q>
+	bool sameList(const AttrList<Q>& a, const AttrList<Q>& b) {
+		return (a.getCount() == b.getCount()) &&
+			(0 == ::memcmp(a.getData()->data(), b.getData()->data(), a.getCount() * sizeof(Q)));
+	}
+
+	MsgPluginUpdate readUpdate(DeserializerStream& stream) {
+		MsgType type;
+		stream && type;
+		REQUIRE(type == MsgType::PluginUpdate);
+		return deserializeMessage<MsgPluginUpdate>(stream);
+	}
+
+	MsgPluginUpdate readUpdate(const zmq::message_t& payload) {
+		DeserializerStream stream(payload.data<char>(), payload.size());
+		return readUpdate(stream);
+	}
+}
+
+
+TEST_CASE("Serializer size precomputation")
+{
+	const std::vector<AttrValue> values = {
+		AttrValue(5),
+		AttrValue("a string value"),
+		AttrValue(makeVectors(1000)),
+		AttrValue(makeMapChannels(100)),
+		AttrValue(AttrListPlugin({AttrPlugin("first"), AttrPlugin("second", "out")})),
+		AttrValue(AttrListString({"a", "bc", "def"}))
+	};
+
+	for (const auto& value : values) {
+		const MsgPluginUpdate msg{"plugin", "property", value};
+
+		REQUIRE(measureMessage(msg) == serializeMessage(msg).size());
+		REQUIRE(measureMessage(msg, FRAME_THRESHOLD) == serializeMessageFrames(msg)[0].size());
+	}
+}
+
+
+TEST_CASE("Serializer round trip")
+{
+	SECTION("Single frame") {
+		const auto vertices = makeVectors(100000);
+		const auto payload  = serializeMessage(MsgPluginUpdate{"mesh", "vertices", vertices});
+
+		const auto update = readUpdate(payload);
+
+		REQUIRE(update.pluginName == "mesh");
+		REQUIRE(update.propertyName == "vertices");
+		REQUIRE(sameList(update.propertyValue.as<AttrListVector>(), vertices));
+	}
+
+	SECTION("Large lists are sent as separate frames without copying") {
+		const auto channels = makeMapChannels(100000);
+		const auto frames   = serializeMessageFrames(MsgPluginUpdate{"mesh", "map_channels", channels});
+
+		REQUIRE(frames.size() == 3);
+		REQUIRE(frames[1].data() == channels.data[0].vertices.getData()->data());
+		REQUIRE(frames[2].data() == channels.data[0].faces.getData()->data());
+
+		auto stream = frameDeserializer(frames);
+		const auto update = readUpdate(stream);
+		const auto& result = update.propertyValue.as<AttrMapChannels>();
+
+		REQUIRE(result.data.size() == 1);
+		REQUIRE(result.data[0].name == "uv");
+		REQUIRE(sameList(result.data[0].vertices, channels.data[0].vertices));
+		REQUIRE(sameList(result.data[0].faces, channels.data[0].faces));
+	}
+
+	SECTION("Small lists are written inline") {
+		const auto vertices = makeVectors(10);
+		const auto frames   = serializeMessageFrames(MsgPluginUpdate{"mesh", "vertices", vertices});
+
+		REQUIRE(frames.size() == 1);
+
+		auto stream = frameDeserializer(frames);
+		REQUIRE(sameList(readUpdate(stream).propertyValue.as<AttrListVector>(), vertices));
+	}
+
+	SECTION("Frames keep the list data alive") {
+		zmq::multipart_t frames;
+		{
+			const auto vertices = makeVectors(100000);
+			frames = serializeMessageFrames(MsgPluginUpdate{"mesh", "vertices", vertices});
+		}
+
+		auto stream = frameDeserializer(frames);
+		REQUIRE(sameList(readUpdate(stream).propertyValue.as<AttrListVector>(), makeVectors(100000)));
+	}
+
+	SECTION("Missing or invalid list data frames are rejected") {
+		const auto vertices = makeVectors(100000);
+		const auto frames   = serializeMessageFrames(MsgPluginUpdate{"mesh", "vertices", vertices});
+
+		DeserializerStream missing(frames[0].data<char>(), frames[0].size());
+		REQUIRE_THROWS_AS(readUpdate(missing), ZmqException);
+
+		DeserializerStream truncated(frames[0].data<char>(), frames[0].size());
+		truncated.setFrames({{frames[1].data<char>(), frames[1].size() - sizeof(AttrVector)}});
+		REQUIRE_THROWS_AS(readUpdate(truncated), ZmqException);
+	}
+}
+
+
+/// Compare the serialization speed of a mesh-like message with a growing buffer,
+/// with a precomputed buffer size and with the lists referenced as separate frames.
+/// The test is hidden by default, run it explicitly with the [benchmark] tag.
+TEST_CASE("Serializer throughput", "[.][benchmark]")
+{
+	const int count      = 4 * 1024 * 1024;
+	const int iterations = 20;
+
+	const MsgPluginUpdate msg{"mesh", "map_channels", makeMapChannels(count)};
+	const size_t bytes = measureMessage(msg);
+
+	auto measure = [&](const char* name, auto serialize) {
+		const auto start = Clock::now();
+		size_t total = 0;
+		for (int i = 0; i < iterations; ++i) {
+			total += serialize();
+		}
+		const double seconds = std::chrono::duration<double>(Clock::now() - start).count();
+
+		REQUIRE(total > 0);
+		std::cout << std::setw(20) << name << ": " << std::fixed << std::setprecision(1)
+				  << static_cast<double>(bytes) * iterations / (1 << 20) / seconds << " MB/s" << std::endl;
+	};
+
+	measure("growing buffer", [&]() {
+		SerializerStream stream;
+		stream && msg.getType() && msg;
+		return stream.getSize();
+	});
+
+	measure("precomputed size", [&]() {
+		return serializeMessage(msg).size();
+	});
+
+	measure("separate frames", [&]() {
+		return serializeMessageFrames(msg).size();
+	});
+}